@@ -36,6 +36,7 @@ import rmg.data as data
 import rmg.structure as structure
 import rmg.reaction as reaction
 import rmg.thermo as thermo
+import rmg.species as species
 
 import rmg.log as logging
 
@@ -649,6 +650,31 @@ def printAtomTypeCounts():
 	for atomType, count in totalAtomTypeCount.iteritems():
 		print '\t%i instances of %s' % (count, atomType)
 
+def compareSymmetryNumbers():
+	"""
+	Iterates through the structures in the primary thermo library and compares
+	the symmetry number of each calculated from its automorphisms with that
+	estimated by the heuristic of atom, bond, and axis contributions. The
+	structures for which the two differ are listed, followed by the number of
+	structures compared and the number that differ.
+	"""
+
+	count = 0; differences = 0
+	labels = species.thermoDatabase.primaryDatabase.dictionary.keys()
+	labels.sort()
+	for label in labels:
+		struct = species.thermoDatabase.primaryDatabase.dictionary[label]
+		if not isinstance(struct, structure.Structure): continue
+		struct.calculateSymmetryNumber()
+		estimate = struct.estimateSymmetryNumber()
+		count += 1
+		if struct.symmetryNumber != estimate:
+			differences += 1
+			print '%s: automorphisms %i, heuristic %i' % (label, struct.symmetryNumber, estimate)
+
+	print ''
+	print '%i of %i structures have different symmetry numbers' % (differences, count)
+
 ################################################################################
 
 if __name__ == '__main__':
@@ -63,10 +63,6 @@ def process_stats(stats_file, log_file):
 
 if __name__ == '__main__':
 
-	from guppy import hpy
-	hp = hpy()
-	hp.heap()
-
 	# Command-line options
 	description = 'RMG is an automatic chemical reaction mechanism ' + \
 				  'generator that constructs kinetic models composed of ' + \
@@ -110,6 +106,15 @@ if __name__ == '__main__':
 	parser.add_option('-t', '--walltime',
 					action="store", type="string", dest="wallTime", default="0",
 					help="set the maximum execution time (HH:MM:SS)")
+	parser.add_option('-n', '--processes',
+					action="store", type="int", dest="numberOfProcesses", default=1,
+					help="use up to N worker processes for independent calculations; since the reaction systems are then simulated against separate copies of the model, the results can differ slightly from a serial run", metavar='N')
+	parser.add_option('-c', '--network-cache', default='',
+					action="store", type="string", dest="networkCacheDirectory",
+					help="store the rate coefficients of unimolecular reaction networks in DIR for reuse in later jobs", metavar='DIR')
+	parser.add_option('-m', '--memory-profile',
+					action="store_true", dest="memoryProfile", default=False,
+					help="log a full heap profile (requires guppy) after each iteration; this is slow for large models")
 
 	# Parse the command-line arguments
 	options, args = parser.parse_args()
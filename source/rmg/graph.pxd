@@ -49,6 +49,12 @@ cdef class Edge:
 
 cdef class Graph(dict):
 
+	cdef list _sssr
+
+	cdef set _ringVertices
+
+	cdef set _ringEdges
+
 	cpdef resetCachedStructureInfo(Graph self)
 
 	cpdef list vertices(Graph self)
@@ -83,14 +89,32 @@ cdef class Graph(dict):
 
 	cpdef list getSmallestSetOfSmallestRings(Graph self)
 
+	cpdef list __findSmallestSetOfSmallestRings(Graph self)
+
 	cpdef bint isVertexInCycle(Graph self, chem.Atom vertex)
 
-	cpdef bint __isChainInCycle(Graph self, list chain)
+	cpdef bint isEdgeInCycle(Graph self, chem.Bond edge)
+
+	cpdef bint isCyclic(Graph self)
+
+	cpdef __findRingMembership(Graph self)
 
 	cpdef list getAllCycles(Graph self, chem.Atom startingVertex)
 
 	cpdef list __exploreCyclesRecursively(Graph self, list chain, list cycleList)
 
+	cpdef bint extendsToAutomorphism(Graph self, dict mapping)
+
+	cpdef dict __findAutomorphism(Graph self, dict vertexClasses1, dict vertexClasses2, dict edgeClasses)
+
+	cpdef dict getVertexClasses(Graph self)
+
+	cpdef countAutomorphisms(Graph self)
+
+	cpdef tuple __getEquivalenceClasses(Graph self)
+
+	cpdef dict __refineVertexClasses(Graph self, dict vertexClasses, dict edgeClasses)
+
 	cpdef setConnectivityValues(Graph self)
 
 	cpdef sortAndLabelVertices(Graph self)
@@ -72,6 +72,9 @@ class Graph(dict):
 	"""
 	
 	def __init__(self, vertices=None, edges=None):
+		self._sssr = None
+		self._ringVertices = None
+		self._ringEdges = None
 		self.clear()
 		if vertices is not None:
 			for v in vertices: self.addVertex(v)
@@ -89,6 +92,9 @@ class Graph(dict):
 		so that any information (eg. connectivity values, ring locations) that
 		we are cacheing, is reset."""
 		vert = cython.declare(chem.Atom)
+		self._sssr = None
+		self._ringVertices = None
+		self._ringEdges = None
 		for vert in self:
 			vert.connectivity1 = -1
 			vert.connectivity2 = -1
@@ -123,6 +129,9 @@ class Graph(dict):
 		Add a `vertex` to the graph. The vertex is initialized with no edges.
 		"""
 		self[vertex] = dict()
+		self._sssr = None
+		self._ringVertices = None
+		self._ringEdges = None
 		return vertex
 
 	def addEdge(self, vertices, edge):
@@ -133,6 +142,9 @@ class Graph(dict):
 		v1, v2 = vertices
 		self[v1][v2] = edge
 		self[v2][v1] = edge
+		self._sssr = None
+		self._ringVertices = None
+		self._ringEdges = None
 		return edge
 
 	def getEdges(self, vertex):
@@ -170,6 +182,9 @@ class Graph(dict):
 				if vertex1 in self[vertex2]:
 					del self[vertex2][vertex1]
 		del self[vertex1]
+		self._sssr = None
+		self._ringVertices = None
+		self._ringEdges = None
 
 	def removeEdge(self, vertices):
 		"""
@@ -180,6 +195,9 @@ class Graph(dict):
 		v1, v2 = vertices
 		del self[v1][v2]
 		del self[v2][v1]
+		self._sssr = None
+		self._ringVertices = None
+		self._ringEdges = None
 
 	def isIsomorphic(self, other, map12_0, map21_0):
 		"""
@@ -300,139 +318,190 @@ class Graph(dict):
 
 	def getSmallestSetOfSmallestRings(self):
 		"""
-		Return a list of the smallest set of smallest rings in the graph. The
-		algorithm implements was adapted from a description by Fan, Panaye,
-		Doucet, and Barbu (doi: 10.1021/ci00015a002)
-
-		B. T. Fan, A. Panaye, J. P. Doucet, and A. Barbu. "Ring Perception: A
-		New Algorithm for Directly Finding the Smallest Set of Smallest Rings
-		from a Connection Table." *J. Chem. Inf. Comput. Sci.* **33**, 
-		p. 657-662 (1993).
+		Return a list of the smallest set of smallest rings in the graph, with
+		the vertices of each ring listed in order around the ring. The result
+		is cached until :meth:`resetCachedStructureInfo` is called or the graph
+		is modified.
 		"""
+		if self._sssr is None:
+			self._sssr = self.__findSmallestSetOfSmallestRings()
+		return [ring[:] for ring in self._sssr]
 
-		graph = cython.declare(Graph)
-		done = cython.declare(cython.bint)
-		verticesToRemove = cython.declare(list)
-		cycleList = cython.declare(list)
-		cycles = cython.declare(list)
-		vertex = cython.declare(chem.Atom)
-		rootVertex = cython.declare(chem.Atom)
-		found = cython.declare(cython.bint)
-		cycle = cython.declare(list)
-		graphs = cython.declare(list)
+	def __findSmallestSetOfSmallestRings(self):
+		"""
+		Find the smallest set of smallest rings in the graph, which is a
+		minimum cycle basis of the graph, using the polynomial-time algorithm
+		of Horton. The candidate rings are formed from each edge and the
+		shortest paths from each vertex to its ends, and the smallest candidates
+		that are linearly independent of those already chosen are kept.
+
+		J. D. Horton. "A Polynomial-Time Algorithm to Find the Shortest Cycle
+		Basis of a Graph." *SIAM J. Comput.* **16**, p. 358-366 (1987).
+		"""
 
-		# Make a copy of the graph so we don't modify the original
-		graph = self.copy()
-		
-		# Step 1: Remove all terminal vertices
-		done = False
-		while not done:
-			verticesToRemove = []
-			for vertex1, value in graph.iteritems():
-				if len(value) == 1: verticesToRemove.append(vertex1)
-			done = len(verticesToRemove) == 0
-			# Remove identified vertices from graph
-			for vertex in verticesToRemove:
-				graph.removeVertex(vertex)
-		
-		# Step 2: Remove all other vertices that are not part of cycles
-		verticesToRemove = []
-		for vertex in graph:
-			found = graph.isVertexInCycle(vertex)
-			if not found:
-				verticesToRemove.append(vertex)
-		# Remove identified vertices from graph
-		for vertex in verticesToRemove:
-			graph.removeVertex(vertex)
-			
-		### also need to remove EDGES that are not in ring
-		
-		# Step 3: Split graph into remaining subgraphs
-		graphs = graph.split()
-		
-		# Step 4: Find ring sets in each subgraph
-		cycleList = []
-		for graph in graphs:
-			
-			while len(graph) > 0:
-				
-				# Choose root vertex as vertex with smallest number of edges
-				rootVertex = None
-				for vertex in graph:
-					if rootVertex is None:
-						rootVertex = vertex
-					elif len(graph[vertex]) < len(graph[rootVertex]):
-						rootVertex = vertex
-
-				# Get all cycles involving the root vertex
-				cycles = graph.getAllCycles(rootVertex)
-				if len(cycles) == 0:
-					# this vertex is no longer in a ring.
-					# remove all its edges
-					neighbours = graph[rootVertex].keys()[:]
-					for vertex2 in neighbours:
-						graph.removeEdge((rootVertex, vertex2))
-					# then remove it
-					graph.removeVertex(rootVertex)
-					#print("Removed vertex that's no longer in ring")
-					continue # (pick a new root Vertex)
-#					raise Exception('Did not find expected cycle!')
-
-				# Keep the smallest of the cycles found above
-				cycle = cycles[0]
-				for c in cycles[1:]:
-					if len(c) < len(cycle):
-						cycle = c
-				cycleList.append(cycle)
-
-				# Remove from the graph all vertices in the cycle that have only two edges
-				verticesToRemove = []
-				for vertex in cycle:
-					if len(graph[vertex]) <= 2:
-						verticesToRemove.append(vertex)
-				if len(verticesToRemove) == 0:
-					# there are no vertices in this cycle that with only two edges
-					
-					# Remove edge between root vertex and any one vertex it is connected to
-					graph.removeEdge((rootVertex, graph[rootVertex].keys()[0]))
-				else:
-					for vertex in verticesToRemove:
-						graph.removeVertex(vertex)
-						
-		return cycleList
+		vertices = cython.declare(list)
+		queue = cython.declare(list)
+		candidates = cython.declare(list)
+		rings = cython.declare(list)
+		ring = cython.declare(list)
+
+		# Remove all terminal vertices, as they cannot be in rings; the
+		# neighbors of each removed vertex may in turn become terminal
+		degree = {}; queue = []
+		for vertex1 in self:
+			degree[vertex1] = len(self[vertex1])
+			if degree[vertex1] <= 1: queue.append(vertex1)
+		for vertex1 in queue:
+			for vertex2 in self[vertex1]:
+				degree[vertex2] -= 1
+				if degree[vertex2] == 1: queue.append(vertex2)
+		if len(queue) == len(self): return []
+		removed = set(queue)
+		graph = {}
+		for vertex1 in self:
+			if vertex1 not in removed:
+				graph[vertex1] = [vertex2 for vertex2 in self[vertex1] if vertex2 not in removed]
+
+		# Number the remaining vertices and edges, so that sets of them can be
+		# stored as the bits of an integer
+		vertices = graph.keys()
+		vertexIndex = {}
+		for index, vertex in enumerate(vertices):
+			vertexIndex[vertex] = index
+		edgeIndex = {}
+		for vertex1 in vertices:
+			for vertex2 in graph[vertex1]:
+				if vertexIndex[vertex1] < vertexIndex[vertex2]:
+					edgeIndex[vertex1, vertex2] = len(edgeIndex)
+					edgeIndex[vertex2, vertex1] = edgeIndex[vertex1, vertex2]
+		numEdges = len(edgeIndex) / 2
+
+		# Find the candidate rings from a breadth-first search from each vertex
+		candidates = []; found = set(); numComponents = 0
+		for root in vertices:
+			distance = {root: 0}; parent = {root: None}
+			vertexMask = {root: 1 << vertexIndex[root]}; edgeMask = {root: 0}
+			queue = [root]
+			for vertex1 in queue:
+				for vertex2 in graph[vertex1]:
+					if vertex2 not in distance:
+						distance[vertex2] = distance[vertex1] + 1
+						parent[vertex2] = vertex1
+						vertexMask[vertex2] = vertexMask[vertex1] | 1 << vertexIndex[vertex2]
+						edgeMask[vertex2] = edgeMask[vertex1] | 1 << edgeIndex[vertex1, vertex2]
+						queue.append(vertex2)
+			if min([vertexIndex[vertex] for vertex in queue]) == vertexIndex[root]:
+				numComponents += 1
+			# Each edge not in the search tree forms a ring with the paths in
+			# the tree from its ends to the root, if these only meet at the root
+			for vertex1 in queue:
+				for vertex2 in graph[vertex1]:
+					if vertexIndex[vertex1] > vertexIndex[vertex2]: continue
+					if parent[vertex1] is vertex2 or parent[vertex2] is vertex1: continue
+					if vertexMask[vertex1] & vertexMask[vertex2] != vertexMask[root]: continue
+					mask = edgeMask[vertex1] | edgeMask[vertex2] | 1 << edgeIndex[vertex1, vertex2]
+					if mask in found: continue
+					found.add(mask)
+					ring = [vertex1]
+					while ring[-1] is not root: ring.append(parent[ring[-1]])
+					ring.reverse()
+					ring.append(vertex2)
+					while parent[ring[-1]] is not root: ring.append(parent[ring[-1]])
+					candidates.append((len(ring), mask, ring))
+
+		# Keep the smallest rings whose sets of edges are linearly independent
+		# (modulo 2); the number of rings is the cyclomatic number of the graph
+		candidates.sort(key=lambda candidate: candidate[0])
+		numRings = numEdges - len(vertices) + numComponents
+		basis = {}; rings = []
+		for length, mask, ring in candidates:
+			if len(rings) == numRings: break
+			while mask:
+				bit = mask.bit_length() - 1
+				if bit not in basis:
+					basis[bit] = mask
+					rings.append(ring)
+					break
+				mask ^= basis[bit]
+
+		return rings
 
 	def isVertexInCycle(self, vertex):
-		""" 
+		"""
 		Is `vertex` in a cycle?
 		Returns :data:`True` if it is in a cycle, else :data:`False`.
 		"""
-		chain = cython.declare(list)
-		chain = [vertex]
-		return self.__isChainInCycle(chain)
+		if self._ringVertices is None: self.__findRingMembership()
+		return vertex in self._ringVertices
 
-	def __isChainInCycle(self, chain):
-		""" 
-		Is the `chain` in a cycle? 
-		Returns True/False.
-		Recursively calls itself
+	def isEdgeInCycle(self, edge):
 		"""
-		# Note that this function no longer returns the cycle; just True/False
-		vertex2 = cython.declare(chem.Atom)
-		edge = cython.declare(chem.Bond)
-		found = cython.declare(cython.bint)
-		
-		for vertex2, edge in self[chain[-1]].iteritems():
-			if vertex2 is chain[0] and len(chain) > 2:
-				return True
-			elif vertex2 not in chain:
-				# make the chain a little longer and explore again
-				chain.append(vertex2)
-				found = self.__isChainInCycle(chain)
-				if found: return True
-				# didn't find a cycle down this path (-vertex2),
-				# so remove the vertex from the chain
-				chain.remove(vertex2)
-		return False
+		Is `edge` in a cycle?
+		Returns :data:`True` if it is in a cycle, else :data:`False`.
+		"""
+		if self._ringEdges is None: self.__findRingMembership()
+		return edge in self._ringEdges
+
+	def isCyclic(self):
+		"""
+		Return :data:`True` if one or more cycles are present in the graph
+		and :data:`False` otherwise.
+		"""
+		if self._ringEdges is None: self.__findRingMembership()
+		return len(self._ringEdges) > 0
+
+	def __findRingMembership(self):
+		"""
+		Determine the vertices and edges of the graph that are in cycles using
+		a single depth-first search, as described by Tarjan. An edge is in a
+		cycle unless it is a bridge, i.e. unless no vertex reached through it
+		in the search has an edge back to a vertex reached before it. The
+		results are cached until :meth:`resetCachedStructureInfo` is called or
+		the graph is modified.
+
+		R. Tarjan. "A Note on Finding the Bridges of a Graph." *Inf. Process.
+		Lett.* **2**, p. 160-161 (1974).
+		"""
+
+		order = cython.declare(dict)
+		lowpoint = cython.declare(dict)
+		stack = cython.declare(list)
+		ringVertices = cython.declare(set)
+		ringEdges = cython.declare(set)
+
+		order = {}; lowpoint = {}
+		ringVertices = set(); ringEdges = set()
+		for root in self:
+			if root in order: continue
+			order[root] = lowpoint[root] = len(order)
+			# Each entry holds a vertex, the edge by which it was reached, and
+			# an iterator over the edges that remain to be explored from it
+			stack = [(root, None, self[root].iteritems())]
+			while len(stack) > 0:
+				vertex1, parentEdge, neighbors = stack[-1]
+				for vertex2, edge in neighbors:
+					if edge is parentEdge: continue
+					if vertex2 not in order:
+						order[vertex2] = lowpoint[vertex2] = len(order)
+						stack.append((vertex2, edge, self[vertex2].iteritems()))
+						break
+					# Any edge to a vertex already reached closes a cycle
+					ringVertices.add(vertex1); ringVertices.add(vertex2)
+					ringEdges.add(edge)
+					if order[vertex2] < lowpoint[vertex1]:
+						lowpoint[vertex1] = order[vertex2]
+				else:
+					stack.pop()
+					if len(stack) == 0: continue
+					vertex2 = stack[-1][0]
+					if lowpoint[vertex1] < lowpoint[vertex2]:
+						lowpoint[vertex2] = lowpoint[vertex1]
+					if lowpoint[vertex1] <= order[vertex2]:
+						ringVertices.add(vertex1); ringVertices.add(vertex2)
+						ringEdges.add(parentEdge)
+
+		self._ringVertices = ringVertices
+		self._ringEdges = ringEdges
 
 	def getAllCycles(self, startingVertex):
 		"""
@@ -483,6 +552,267 @@ class Graph(dict):
 				chain.pop(-1)
 		return cycleList
 
+	def extendsToAutomorphism(self, mapping):
+		"""
+		Return :data:`True` if the partial `mapping` of vertices of the graph
+		to vertices of the graph, a dictionary, can be extended to an
+		automorphism of the graph, and :data:`False` otherwise.
+		"""
+
+		vertexClasses = cython.declare(dict)
+		edgeClasses = cython.declare(dict)
+		vertexClasses1 = cython.declare(dict)
+		vertexClasses2 = cython.declare(dict)
+
+		if len(set(mapping.values())) != len(mapping): return False
+
+		vertexClasses, edgeClasses = self.__getEquivalenceClasses()
+		vertexClasses = self.__refineVertexClasses(vertexClasses, edgeClasses)
+
+		# Place each mapped vertex and its image in a class of their own
+		vertexClasses1 = dict(vertexClasses); vertexClasses2 = dict(vertexClasses)
+		for i, (vertex1, vertex2) in enumerate(mapping.iteritems()):
+			if vertexClasses[vertex1] != vertexClasses[vertex2]: return False
+			vertexClasses1[vertex1] = len(self) + i
+			vertexClasses2[vertex2] = len(self) + i
+		vertexClasses1 = self.__refineVertexClasses(vertexClasses1, edgeClasses)
+		vertexClasses2 = self.__refineVertexClasses(vertexClasses2, edgeClasses)
+
+		return self.__findAutomorphism(vertexClasses1, vertexClasses2, edgeClasses) is not None
+
+	def __findAutomorphism(self, vertexClasses1, vertexClasses2, edgeClasses):
+		"""
+		Return an automorphism of the graph, as a dictionary mapping each
+		vertex to its image, that maps the vertices in each class given by
+		`vertexClasses1` to those in the same class given by `vertexClasses2`,
+		or :data:`None` if there is none. Both partitions must have been
+		refined by :meth:`__refineVertexClasses` using the edge classes given
+		by `edgeClasses`. A vertex of a class with more than one vertex is
+		placed in a class of its own, as is each vertex it could be mapped to
+		in turn, and the partitions are refined and searched again, until
+		every vertex is in a class of its own and the mapping is determined.
+		Vertices with only one edge to the same vertex in a class of its own,
+		such as the hydrogen atoms of a methyl group, are interchangeable, so
+		these are mapped to each other directly.
+		"""
+
+		cells1 = cython.declare(dict)
+		cells2 = cython.declare(dict)
+		cell = cython.declare(list)
+		automorphism = cython.declare(dict)
+
+		cells1 = {}; cells2 = {}
+		for vertex, index in vertexClasses1.iteritems():
+			if index in cells1: cells1[index].append(vertex)
+			else: cells1[index] = [vertex]
+		for vertex, index in vertexClasses2.iteritems():
+			if index in cells2: cells2[index].append(vertex)
+			else: cells2[index] = [vertex]
+		if len(cells1) != len(cells2): return None
+		for index in cells1:
+			if index not in cells2 or len(cells1[index]) != len(cells2[index]):
+				return None
+
+		cell = None; cellIndex = None
+		for index in sorted(cells1):
+			if len(cells1[index]) == 1: continue
+			vertex = cells1[index][0]
+			if len(self[vertex]) == 1 and len(cells1[vertexClasses1[self[vertex].keys()[0]]]) == 1:
+				continue
+			if cell is None or len(cells1[index]) < len(cell):
+				cell = cells1[index]; cellIndex = index
+
+		if cell is None:
+			# The mapping is determined, so check that it preserves the edges
+			automorphism = {}
+			for index in cells1:
+				for vertex1, vertex2 in zip(cells1[index], cells2[index]):
+					automorphism[vertex1] = vertex2
+			for vertex1 in self:
+				vertex2 = automorphism[vertex1]
+				for vertex3, edge in self[vertex1].iteritems():
+					vertex4 = automorphism[vertex3]
+					if vertex4 not in self[vertex2]: return None
+					if edgeClasses[edge] != edgeClasses[self[vertex2][vertex4]]: return None
+			return automorphism
+
+		vertex = cell[0]
+		vertexClasses3 = dict(vertexClasses1)
+		vertexClasses3[vertex] = len(self)
+		vertexClasses3 = self.__refineVertexClasses(vertexClasses3, edgeClasses)
+		for other in cells2[cellIndex]:
+			vertexClasses4 = dict(vertexClasses2)
+			vertexClasses4[other] = len(self)
+			vertexClasses4 = self.__refineVertexClasses(vertexClasses4, edgeClasses)
+			automorphism = self.__findAutomorphism(vertexClasses3, vertexClasses4, edgeClasses)
+			if automorphism is not None: return automorphism
+
+		return None
+
+	def getVertexClasses(self):
+		"""
+		Return a dictionary mapping each vertex to an integer class, such that
+		no automorphism of the graph maps a vertex to one in another class.
+		The vertices are first divided into classes of equivalent vertices,
+		and these are then refined by the classes of their neighbors and the
+		edges to them until no further division occurs, as in the first step
+		of canonical labeling algorithms.
+		"""
+		vertexClasses, edgeClasses = self.__getEquivalenceClasses()
+		return self.__refineVertexClasses(vertexClasses, edgeClasses)
+
+	def countAutomorphisms(self):
+		"""
+		Return the number of automorphisms of the graph, i.e. the number of
+		permutations of its vertices that preserve its vertices and edges.
+
+		The count is the product of the sizes of the orbits of a sequence of
+		vertices, each under the automorphisms that fix the vertices before
+		it. Each vertex is chosen from a class of the refined partition given
+		by :meth:`getVertexClasses` containing more than one vertex; only the
+		vertices in that class can be in its orbit. The automorphisms found
+		while determining the orbit are reused, so that an automorphism only
+		has to be searched for each vertex of the class that they do not
+		already map the chosen vertex to. The chosen vertex is then placed in
+		a class of its own and the partition is refined again, until every
+		vertex is in a class of its own or is one of several vertices with a
+		single edge to the same such vertex, which can be permuted freely.
+		"""
+
+		vertexClasses = cython.declare(dict)
+		edgeClasses = cython.declare(dict)
+		cells = cython.declare(dict)
+		cell = cython.declare(list)
+		vertexClasses1 = cython.declare(dict)
+		vertexClasses2 = cython.declare(dict)
+
+		vertexClasses, edgeClasses = self.__getEquivalenceClasses()
+		vertexClasses = self.__refineVertexClasses(vertexClasses, edgeClasses)
+
+		count = 1
+		while True:
+			cells = {}
+			for vertex, index in vertexClasses.iteritems():
+				if index in cells: cells[index].append(vertex)
+				else: cells[index] = [vertex]
+			cell = None; leaves = []
+			for index in sorted(cells):
+				if len(cells[index]) == 1: continue
+				# Vertices with only one edge to the same vertex in a class of
+				# its own (e.g. the hydrogen atoms of a methyl group) can be
+				# permuted in any way without moving any other vertex
+				vertex = cells[index][0]
+				if len(self[vertex]) == 1 and len(cells[vertexClasses[self[vertex].keys()[0]]]) == 1:
+					leaves.append(cells[index])
+				elif cell is None or len(cells[index]) < len(cell):
+					cell = cells[index]
+			if cell is None:
+				for cell in leaves:
+					for i in range(2, len(cell) + 1): count *= i
+				break
+
+			vertex = cell[0]
+			vertexClasses1 = dict(vertexClasses)
+			vertexClasses1[vertex] = len(self)
+			vertexClasses1 = self.__refineVertexClasses(vertexClasses1, edgeClasses)
+			orbit = set([vertex]); automorphisms = []
+			for other in cell[1:]:
+				if other in orbit: continue
+				# Two vertices with the same neighbors via equivalent edges
+				# (e.g. the hydrogen atoms of a methyl group) can be exchanged
+				# without moving any other vertex
+				twins = len(self[vertex]) == len(self[other])
+				for vertex2, edge in self[vertex].iteritems():
+					if not twins: break
+					twins = vertex2 in self[other] and edgeClasses[edge] == edgeClasses[self[other][vertex2]]
+				if twins:
+					automorphism = {vertex: other, other: vertex}
+				else:
+					# The vertices fixed so far are in classes of their own in
+					# both partitions, so are also fixed by the automorphism
+					vertexClasses2 = dict(vertexClasses)
+					vertexClasses2[other] = len(self)
+					vertexClasses2 = self.__refineVertexClasses(vertexClasses2, edgeClasses)
+					automorphism = self.__findAutomorphism(vertexClasses1, vertexClasses2, edgeClasses)
+					if automorphism is None: continue
+				# Add the images of the orbit under the new automorphism, and
+				# under all of the automorphisms found so far
+				automorphisms.append(automorphism)
+				vertices = list(orbit)
+				for vertex2 in vertices:
+					for automorphism in automorphisms:
+						vertex3 = automorphism.get(vertex2, vertex2)
+						if vertex3 not in orbit:
+							orbit.add(vertex3)
+							vertices.append(vertex3)
+			count *= len(orbit)
+
+			vertexClasses = vertexClasses1
+
+		return count
+
+	def __getEquivalenceClasses(self):
+		"""
+		Return dictionaries mapping each vertex and each edge of the graph to
+		an integer class, such that vertices (or edges) are in the same class
+		if and only if they are equivalent.
+		"""
+
+		vertexClasses = cython.declare(dict)
+		edgeClasses = cython.declare(dict)
+		representatives = cython.declare(list)
+
+		vertexClasses = {}; representatives = []
+		for vertex in self:
+			for index, other in enumerate(representatives):
+				if vertex.equivalent(other):
+					vertexClasses[vertex] = index
+					break
+			else:
+				vertexClasses[vertex] = len(representatives)
+				representatives.append(vertex)
+
+		edgeClasses = {}; representatives = []
+		for vertex1 in self:
+			for edge in self[vertex1].itervalues():
+				if edge in edgeClasses: continue
+				for index, other in enumerate(representatives):
+					if edge.equivalent(other):
+						edgeClasses[edge] = index
+						break
+				else:
+					edgeClasses[edge] = len(representatives)
+					representatives.append(edge)
+
+		return vertexClasses, edgeClasses
+
+	def __refineVertexClasses(self, vertexClasses, edgeClasses):
+		"""
+		Refine the partition of the vertices of the graph into the classes
+		given by `vertexClasses` until the vertices in each class have the
+		same numbers of edges of each class to vertices of each class. The
+		edge classes are given by `edgeClasses`. Returns the refined classes,
+		numbered from zero.
+		"""
+
+		signatures = cython.declare(dict)
+		labels = cython.declare(list)
+
+		count = len(set(vertexClasses.values()))
+		while True:
+			signatures = {}
+			for vertex in self:
+				neighbors = [(vertexClasses[vertex2], edgeClasses[edge]) for vertex2, edge in self[vertex].iteritems()]
+				neighbors.sort()
+				signatures[vertex] = (vertexClasses[vertex], tuple(neighbors))
+			labels = sorted(set(signatures.values()))
+			index = dict([(label, i) for i, label in enumerate(labels)])
+			vertexClasses = dict([(vertex, index[signatures[vertex]]) for vertex in self])
+			if len(labels) == count: break
+			count = len(labels)
+
+		return vertexClasses
+
 	def setConnectivityValues(self):
 		"""
 		Sets the Extended Connectivity values as introduced by Morgan (1965)
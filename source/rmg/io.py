@@ -41,6 +41,7 @@ import data
 import species
 import reaction
 import thermo
+import timing
 import spectral.data
 
 """
@@ -381,6 +382,9 @@ def readInputFile(fstr):
 			allowed = ['modifiedstrongcollision', 'reservoirstate']
 			if method.lower() not in allowed:
 				raise InvalidInputFileException('Invalid unimolecular reaction networks method "%s"; allowed values are %s.' % (method, allowed))
+			# Read banded collision matrix option
+			bandedCollisionMatrix = xml0.getChildElement(unirxnNetworks, 'bandedCollisionMatrix', required=False)
+			settings.bandedCollisionMatrix = (bandedCollisionMatrix is not None)
 			# Read temperatures
 			temperatures = xml0.getChildQuantity(unirxnNetworks, 'temperatures', required=False,
 				default=pq.Quantity([300.0, 400.0, 500.0, 600.0, 800.0, 1000.0, 1500.0, 2000.0], 'K'))
@@ -422,9 +426,11 @@ def readInputFile(fstr):
 			if database[1] == 'general':
 				logging.verbose('General database: ' + database[2])
 				# Load all databases
+				timing.start('database')
 				loadThermoDatabase(database[2] + os.sep)
 				loadKineticsDatabase(database[2] + os.sep)
 				loadFrequencyDatabase(database[2] + os.sep)
+				timing.stop()
 			elif database[1] == 'seedmechanism':
 				logging.verbose('Seed mechanism: ' + database[2])
 				reactionModel.loadSeedMechanism(database[2])
@@ -475,11 +481,15 @@ def readInputFile(fstr):
 		reactionModel.fluxToleranceKeepInEdge = float(xml0.getChildElementText(fluxTolerance, 'keepInEdge'))
 		reactionModel.fluxToleranceMoveToCore = float(xml0.getChildElementText(fluxTolerance, 'moveToCore'))
 		reactionModel.fluxToleranceInterrupt = float(xml0.getChildElementText(fluxTolerance, 'interruptSimulation'))
+		reactionModel.maximumObjectsToEnlarge = int(xml0.getChildElementText(fluxTolerance, 'maximumObjectsToEnlarge', required=False, default='1'))
+		if reactionModel.maximumObjectsToEnlarge < 1:
+			raise InvalidInputFileException('Invalid maximum number of objects to enlarge %s; must be at least 1.' % (reactionModel.maximumObjectsToEnlarge))
 		
 		logging.debug('Model flux tolerances set to:')
 		logging.debug('\tKeep in edge:         %s' % (reactionModel.fluxToleranceKeepInEdge) )
 		logging.debug('\tMove to core:         %s' % (reactionModel.fluxToleranceMoveToCore) )
 		logging.debug('\tInterrupt simulation: %s' % (reactionModel.fluxToleranceInterrupt) )
+		logging.debug('\tObjects to enlarge:   %s' % (reactionModel.maximumObjectsToEnlarge) )
 		logging.debug('')
 		
 		# Read maximum model size
@@ -41,9 +41,12 @@ Provides classes for working with the kinetics of chemical reactions:
 
 * :class:`PDepArrheniusKinetics` - Pressure-dependent kinetics modeled with Arrhenius expressions at multiple pressures
 
+* :class:`PDepKineticsSet` - Evaluation of the pressure-dependent kinetics of many reactions at once
+
 """
 
 import math
+import numpy
 import quantities as pq
 
 import constants
@@ -455,9 +458,9 @@ class PDepArrheniusKinetics(Kinetics):
 			ilow = 0; ihigh = None; Plow = self.pressures[0]; Phigh = None
 			for i in range(1, len(self.pressures)):
 				if self.pressures[i] <= P:
-					ilow = i; Plow = P
+					ilow = i; Plow = self.pressures[i]
 				if self.pressures[i] > P and ihigh is None:
-					ihigh = i; Phigh = P
+					ihigh = i; Phigh = self.pressures[i]
 
 			return Plow, Phigh, self.arrhenius[ilow], self.arrhenius[ihigh]
 
@@ -471,7 +474,8 @@ class PDepArrheniusKinetics(Kinetics):
 		
 		klow = alow.getRateConstant(T)
 		khigh = ahigh.getRateConstant(T)
-		return 10**(math.log10(P/Plow)/math.log10(Phigh/Plow)*math.log(khigh/klow))
+		logPRatio = math.log(P/Plow) / math.log(Phigh/Plow)
+		return klow * (khigh/klow)**logPRatio
 
 	def fitToData(self, Tlist, Plist, K):
 		"""
@@ -499,7 +503,7 @@ class PDepArrheniusKinetics(Kinetics):
 		if Plow == Phigh: return alow
 		
 		logPRatio = math.log10(P/Plow) / math.log10(Phigh/Plow)
-		A = 10**(logPRatio*math.log(ahigh.A/alow.A))
+		A = alow.A * (ahigh.A/alow.A)**logPRatio
 		n = alow.n + (ahigh.n - alow.n) * logPRatio
 		Ea = alow.Ea + (ahigh.Ea - alow.Ea) * logPRatio
 
@@ -564,8 +568,6 @@ class ChebyshevKinetics(Kinetics):
 		self.degreeT = 0
 		self.degreeP = 0
 
-	def __chebyshev(self, n, x):
-		return math.cos(n * math.acos(x))
 
 	def __getReducedTemperature(self, T):
 		return (2.0/T - 1.0/self.Tmin - 1.0/self.Tmax) / (1.0/self.Tmax - 1.0/self.Tmin)
@@ -582,10 +584,9 @@ class ChebyshevKinetics(Kinetics):
 		Tred = self.__getReducedTemperature(T)
 		Pred = self.__getReducedPressure(P)
 
-		k = 0.0
-		for t in range(self.degreeT):
-			for p in range(self.degreeP):
-				k += self.coeffs[t,p] * self.__chebyshev(t, Tred) * self.__chebyshev(p, Pred)
+		phiT = getChebyshevPolynomials(self.degreeT, Tred)
+		phiP = getChebyshevPolynomials(self.degreeP, Pred)
+		k = numpy.dot(phiT, numpy.dot(self.coeffs[0:self.degreeT,0:self.degreeP], phiP))
 		return 10.0**k
 
 
@@ -597,8 +598,6 @@ class ChebyshevKinetics(Kinetics):
 		in temperature and pressure.
 		"""
 
-		import numpy
-
 		nT = len(Tlist); nP = len(Plist)
 
 		self.degreeT = degreeT; self.degreeP = degreeP
@@ -607,18 +606,18 @@ class ChebyshevKinetics(Kinetics):
 		self.Tmin = min(Tlist); self.Tmax = max(Tlist)
 		self.Pmin = min(Plist); self.Pmax = max(Plist)
 
-		# Calculate reduced temperatures and pressures
-		Tred = [self.__getReducedTemperature(T) for T in Tlist]
-		Pred = [self.__getReducedPressure(P) for P in Plist]
+		# Calculate Chebyshev polynomials of reduced temperatures and pressures
+		phiT = getChebyshevPolynomials(degreeT, numpy.array([self.__getReducedTemperature(T) for T in Tlist]))
+		phiP = getChebyshevPolynomials(degreeP, numpy.array([self.__getReducedPressure(P) for P in Plist]))
 
 		# Create matrix and vector for coefficient fit (linear least-squares)
 		A = numpy.zeros((nT*nP, degreeT*degreeP), numpy.float64)
 		b = numpy.zeros((nT*nP), numpy.float64)
-		for t1, T in enumerate(Tred):
-			for p1, P in enumerate(Pred):
+		for t1 in range(nT):
+			for p1 in range(nP):
 				for t2 in range(degreeT):
 					for p2 in range(degreeP):
-						A[p1*nT+t1, p2*degreeT+t2] = self.__chebyshev(t2, T) * self.__chebyshev(p2, P)
+						A[p1*nT+t1, p2*degreeT+t2] = phiT[t2,t1] * phiP[p2,p1]
 				b[p1*nT+t1] = math.log10(K[t1,p1])
 
 		# Do linear least-squares fit to get coefficients
@@ -651,5 +650,147 @@ class ChebyshevKinetics(Kinetics):
 
 ################################################################################
 
+def getChebyshevPolynomials(degree, x):
+	"""
+	Return the Chebyshev polynomials of the first kind of degree zero up to
+	(but not including) `degree` evaluated at `x`, which may be a number or an
+	array, using the recurrence relation
+	:math:`\\phi_{n+1}(x) = 2 x \\phi_n(x) - \\phi_{n-1}(x)`. The first
+	dimension of the returned array corresponds to the degree.
+	"""
+	x = numpy.asarray(x, numpy.float64)
+	phi = numpy.ones((degree,) + x.shape, numpy.float64)
+	if degree > 1: phi[1] = x
+	for n in range(2, degree):
+		phi[n] = 2 * x * phi[n-1] - phi[n-2]
+	return phi
+
+class PDepKineticsSet:
+	"""
+	A set of pressure-dependent kinetic models, such as those of all of the
+	pressure-dependent reactions in a reaction model, stored as stacked arrays
+	so that their rate coefficients can be evaluated at once. The attributes
+	are:
+
+	=================== ========================================================
+	Attribute           Description
+	=================== ========================================================
+	`kinetics`          The list of kinetics objects in the set
+	------------------- --------------------------------------------------------
+	`chebyshevIndices`  The indices of the :class:`ChebyshevKinetics` objects
+	`chebyshevCoeffs`   The Chebyshev coefficients of these, padded with zeros
+	                    to a common degree in temperature and pressure
+	`chebyshevRange`    The inverse temperatures and log pressures that bound
+	                    the range of each of these
+	------------------- --------------------------------------------------------
+	`arrheniusIndices`  The indices of the :class:`PDepArrheniusKinetics`
+	                    objects
+	`arrheniusLogP`     The log pressures of each of these, padded with
+	                    infinity to a common number of pressures
+	`arrheniusParams`   The Arrhenius parameters A, n, and Ea at each of these
+	                    pressures
+	`arrheniusCount`    The number of pressures of each of these
+	------------------- --------------------------------------------------------
+	`otherIndices`      The indices of any other kinetics objects, which are
+	                    evaluated individually
+	=================== ========================================================
+
+	The interpolation indices and weights of the pressure-dependent Arrhenius
+	models are stored for the most recent pressure, so they are not found
+	again if the pressure is unchanged.
+	"""
+
+	def __init__(self, kinetics):
+		self.kinetics = kinetics
+
+		self.chebyshevIndices = numpy.array([i for i, k in enumerate(kinetics) if isinstance(k, ChebyshevKinetics)], numpy.int32)
+		chebyshev = [kinetics[i] for i in self.chebyshevIndices]
+		degreeT = max([k.degreeT for k in chebyshev] or [0])
+		degreeP = max([k.degreeP for k in chebyshev] or [0])
+		self.chebyshevCoeffs = numpy.zeros((len(chebyshev), degreeT, degreeP), numpy.float64)
+		self.chebyshevRange = numpy.zeros((len(chebyshev), 4), numpy.float64)
+		for i, k in enumerate(chebyshev):
+			self.chebyshevCoeffs[i,0:k.degreeT,0:k.degreeP] = k.coeffs[0:k.degreeT,0:k.degreeP]
+			self.chebyshevRange[i,:] = [1.0/k.Tmin, 1.0/k.Tmax, math.log(k.Pmin), math.log(k.Pmax)]
+
+		self.arrheniusIndices = numpy.array([i for i, k in enumerate(kinetics) if isinstance(k, PDepArrheniusKinetics)], numpy.int32)
+		arrhenius = [kinetics[i] for i in self.arrheniusIndices]
+		numPressures = max([len(k.pressures) for k in arrhenius] or [0])
+		self.arrheniusLogP = numpy.inf * numpy.ones((len(arrhenius), numPressures), numpy.float64)
+		self.arrheniusParams = numpy.zeros((3, len(arrhenius), numPressures), numpy.float64)
+		self.arrheniusCount = numpy.array([len(k.pressures) for k in arrhenius], numpy.int32)
+		for i, k in enumerate(arrhenius):
+			order = numpy.argsort(k.pressures)
+			self.arrheniusLogP[i,0:len(k.pressures)] = numpy.log(numpy.array(k.pressures)[order])
+			for j, p in enumerate(order):
+				self.arrheniusParams[:,i,j] = [k.arrhenius[p].A, k.arrhenius[p].n, k.arrhenius[p].Ea]
+		self.__pressure = None
+		self.__interpolation = None
+
+		self.otherIndices = [i for i, k in enumerate(kinetics)
+			if not isinstance(k, ChebyshevKinetics) and not isinstance(k, PDepArrheniusKinetics)]
+
+	def __getInterpolation(self, P):
+		"""
+		Return the indices of the pressures that bound the pressure `P` in Pa
+		for each of the pressure-dependent Arrhenius models, along with the
+		interpolation weights of the higher of these pressures.
+		"""
+		if P == self.__pressure:
+			return self.__interpolation
+
+		logP = math.log(P)
+		numPressures = self.arrheniusLogP.shape[1]
+		if (logP < self.arrheniusLogP[:,0]).any() or \
+			(logP > self.arrheniusLogP[numpy.arange(len(self.arrheniusCount)),self.arrheniusCount-1]).any():
+			raise Exception('Attempted to evaluate PDepArrhenius expression at invalid pressure %s Pa.' % (P))
+
+		# Index of the highest pressure not above P, limited so that there is
+		# always a higher pressure to interpolate to
+		ilow = numpy.sum(self.arrheniusLogP <= logP, axis=1) - 1
+		ilow = numpy.maximum(numpy.minimum(ilow, self.arrheniusCount - 2), 0)
+		ihigh = numpy.minimum(ilow + 1, self.arrheniusCount - 1)
+		rows = numpy.arange(len(ilow))
+		logPlow = self.arrheniusLogP[rows,ilow]; logPhigh = self.arrheniusLogP[rows,ihigh]
+		weight = numpy.zeros(len(ilow), numpy.float64)
+		indices = logPhigh > logPlow
+		weight[indices] = (logP - logPlow[indices]) / (logPhigh[indices] - logPlow[indices])
+
+		self.__pressure = P
+		self.__interpolation = (ilow, ihigh, weight)
+		return self.__interpolation
+
+	def getRateConstants(self, T, P):
+		"""
+		Return an array of the rate coefficients k(T, P) in SI units of each
+		of the kinetic models in the set at temperature `T` in K and pressure
+		`P` in Pa.
+		"""
+		k = numpy.zeros(len(self.kinetics), numpy.float64)
+
+		if len(self.chebyshevIndices) > 0:
+			Tinv0, Tinv1, logP0, logP1 = self.chebyshevRange.T
+			Tred = (2.0/T - Tinv0 - Tinv1) / (Tinv1 - Tinv0)
+			Pred = (2.0*math.log(P) - logP0 - logP1) / (logP1 - logP0)
+			phiT = getChebyshevPolynomials(self.chebyshevCoeffs.shape[1], Tred)
+			phiP = getChebyshevPolynomials(self.chebyshevCoeffs.shape[2], Pred)
+			logk = numpy.sum(numpy.sum(self.chebyshevCoeffs * phiP.T[:,numpy.newaxis,:], axis=2) * phiT.T, axis=1)
+			k[self.chebyshevIndices] = 10.0**logk
+
+		if len(self.arrheniusIndices) > 0:
+			ilow, ihigh, weight = self.__getInterpolation(P)
+			A, n, Ea = self.arrheniusParams
+			karr = A * T**n * numpy.exp(-Ea / constants.R / T)
+			rows = numpy.arange(len(ilow))
+			klow = karr[rows,ilow]; khigh = karr[rows,ihigh]
+			k[self.arrheniusIndices] = klow**(1 - weight) * khigh**weight
+
+		for i in self.otherIndices:
+			k[i] = self.kinetics[i].getRateConstant(T, P)
+
+		return k
+
+################################################################################
+
 if __name__ == '__main__':
 	pass
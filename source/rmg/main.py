@@ -39,11 +39,15 @@ import os.path
 import time
 import rmg.log as logging
 import io
+import signal
 import sys
 
 import constants
+import memory
+import parallel
 import settings
 import species
+import timing
 import reaction
 import unirxn.network
 
@@ -66,6 +70,12 @@ def execute(inputFile, options):
 	settings.scratchDirectory = options.scratchDirectory
 	settings.libraryDirectory = options.libraryDirectory
 
+	# Set number of worker processes
+	settings.numberOfProcesses = options.numberOfProcesses
+
+	# Set directory of cached unimolecular reaction network results
+	settings.networkCacheDirectory = options.networkCacheDirectory
+
 	# Set wall time
 	if options.wallTime == '0': settings.wallTime = 0
 	else:
@@ -112,6 +122,7 @@ def execute(inputFile, options):
 	os.mkdir(specDir)
 
 	# Read input file
+	timing.reset()
 	reactionModel, coreSpecies, reactionSystems = io.readInputFile(inputFile)
 	
 	# Initialize reaction model
@@ -137,7 +148,9 @@ def execute(inputFile, options):
 		#print "enter 'c' to continue"; import pdb; pdb.set_trace()
 		options.restart = False # have already restarted
 	else:
+		timing.start('enlarge')
 		reactionModel.initialize(coreSpecies)
+		timing.stop()
 
 	# RMG execution statistics
 	coreSpeciesCount = []
@@ -147,97 +160,144 @@ def execute(inputFile, options):
 	execTime = []
 	restartSize = []
 	memoryUse = []
+	structureCount = []
+	speciesMemory = []
+	reactionMemory = []
+	structureMemory = []
+	edgeArrayMemory = []
+	memoryStatistics = memory.ModelMemoryStatistics()
+
+	# Writer for the restart file
+	restartWriter = RestartWriter(os.path.join(settings.outputDirectory,'restart.pkl'))
 
 	# Handle unimolecular (pressure dependent) reaction networks
 	if settings.unimolecularReactionNetworks:
+		timing.start('networkUpdate')
 		reactionModel.updateUnimolecularReactionNetworks()
+		timing.stop()
 		logging.info('')
 
+	# Save the timing of the initialization as iteration zero
+	iteration = 0
+	timingPath = os.path.join(settings.outputDirectory, 'timing.csv')
+	timing.save(timingPath, iteration)
+
 	# Main RMG loop
 	done = False
-	while not done:
+	try:
+		while not done:
 
-		done = True
-		objectsToEnlarge = []
-		for index, reactionSystem in enumerate(reactionSystems):
-			
-			# Conduct simulation
-			logging.info('Conducting simulation of reaction system %s...' % (index+1))
-			t, y, dydt, valid, obj = reactionSystem.simulate(reactionModel)
-			
-			# Postprocess results
-			logging.info('')
-			logging.info('Saving simulation results for reaction system %s...' % (index+1))
-			reactionSystem.postprocess(reactionModel, t, y, dydt, str(index+1))
-
-			# If simulation is invalid, note which species should be added to
-			# the core
-			if not valid:
-				objectsToEnlarge.append(obj)
-				done = False
-
-		if not done:
-			# Enlarge objects identified by the simulation for enlarging
-			# These should be Species or Network objects
-			logging.info('')
-			objectsToEnlarge = list(set(objectsToEnlarge))
-			for object in objectsToEnlarge:
-				reactionModel.enlarge(object)
+			iteration += 1
 
-			# Handle unimolecular (pressure dependent) reaction networks
-			if settings.unimolecularReactionNetworks:
-				reactionModel.updateUnimolecularReactionNetworks()
-				logging.info('')
+			done = True
+			objectsToEnlarge = []
 
-			# Save the restart file
-			# In order to get all the references preserved, you must pickle all of
-			# the objects in one concerted dump; this also has the added benefits
-			# of using less space and running faster
-			import cPickle
-			logging.info('Saving restart file...')
-			f = open(os.path.join(settings.outputDirectory,'restart.pkl'), 'wb')
-			cPickle.dump((
-				species.speciesList,
-				species.speciesCounter,
-				reaction.reactionList,
-				reactionModel,
-				reactionSystems),
-				f)
-			f.close()
-
-			# Update RMG execution statistics
-			logging.info('Updating RMG execution statistics...')
-			coreSpeciesCount.append(len(reactionModel.core.species))
-			coreReactionCount.append(len(reactionModel.core.reactions))
-			edgeSpeciesCount.append(len(reactionModel.edge.species))
-			edgeReactionCount.append(len(reactionModel.edge.reactions))
-			execTime.append(time.time() - settings.initializationTime)
-			from guppy import hpy
-			hp = hpy()
-			memoryUse.append(hp.heap().size / 1.0e6)
-			logging.debug('Execution time: %s s' % (execTime[-1]))
-			logging.debug('Memory used: %s MB' % (memoryUse[-1]))
-			restartSize.append(os.path.getsize(os.path.join(settings.outputDirectory,'restart.pkl')) / 1.0e6)
-			saveExecutionStatistics(execTime, coreSpeciesCount, coreReactionCount, edgeSpeciesCount, edgeReactionCount, memoryUse, restartSize)
-			generateExecutionPlots(execTime, coreSpeciesCount, coreReactionCount, edgeSpeciesCount, edgeReactionCount, memoryUse, restartSize)
+			# Conduct simulations
+			results = simulateReactionSystems(reactionModel, reactionSystems)
 
-		logging.info('')
-		
-		# Consider stopping gracefully if the next iteration might take us
-		# past the wall time
-		if settings.wallTime > 0 and len(execTime) > 1:
-			t = execTime[-1]
-			dt = execTime[-1] - execTime[-2]
-			if t + 2 * dt > settings.wallTime:
-				logging.info('MODEL GENERATION TERMINATED')
+			for index, reactionSystem in enumerate(reactionSystems):
+			
+				t, y, dydt, valid, obj = results[index]
+			
+				# Postprocess results
 				logging.info('')
-				logging.info('There is not enough time to complete the next iteration before the wall time is reached.')
-				logging.info('The output model may be incomplete.')
+				logging.info('Saving simulation results for reaction system %s...' % (index+1))
+				reactionSystem.postprocess(reactionModel, t, y, dydt, str(index+1))
+
+				# If simulation is invalid, note which species should be added to
+				# the core (the simulation may identify several at once)
+				if not valid:
+					if isinstance(obj, list): objectsToEnlarge.extend(obj)
+					else: objectsToEnlarge.append(obj)
+					done = False
+
+			if not done:
+				# Enlarge objects identified by the simulation for enlarging
+				# These should be Species or Network objects
 				logging.info('')
-				logging.info('The current model core has %s species and %s reactions' % (len(reactionModel.core.species), len(reactionModel.core.reactions)))
-				logging.info('The current model edge has %s species and %s reactions' % (len(reactionModel.edge.species), len(reactionModel.edge.reactions)))
-				io.writeOutputFile(os.path.join(settings.outputDirectory,'output.xml'), reactionModel, reactionSystems)
-				return
+				# Remove duplicates, keeping the flux ranking of each system
+				# (species and networks are compared by identity since their
+				# ids can coincide)
+				objectIDs = [id(obj) for obj in objectsToEnlarge]
+				objectsToEnlarge = [obj for index, obj in enumerate(objectsToEnlarge) if id(obj) not in objectIDs[:index]]
+				for object in objectsToEnlarge:
+					timing.start('enlarge')
+					reactionModel.enlarge(object)
+					timing.stop()
+
+				# Handle unimolecular (pressure dependent) reaction networks
+				if settings.unimolecularReactionNetworks:
+					timing.start('networkUpdate')
+					reactionModel.updateUnimolecularReactionNetworks()
+					timing.stop()
+					logging.info('')
+
+				# Save the restart file
+				# In order to get all the references preserved, you must pickle all of
+				# the objects in one concerted dump; this also has the added benefits
+				# of using less space and running faster
+				# The dump is done in the background so that the next simulation
+				# can proceed while the file is being written
+				logging.info('Saving restart file...')
+				timing.start('restartSave')
+				restartWriter.save((
+					species.speciesList,
+					species.speciesCounter,
+					reaction.reactionList,
+					reactionModel,
+					reactionSystems))
+				timing.stop()
+
+				# Update RMG execution statistics
+				logging.info('Updating RMG execution statistics...')
+				coreSpeciesCount.append(len(reactionModel.core.species))
+				coreReactionCount.append(len(reactionModel.core.reactions))
+				edgeSpeciesCount.append(len(reactionModel.edge.species))
+				edgeReactionCount.append(len(reactionModel.edge.reactions))
+				execTime.append(time.time() - settings.initializationTime)
+				memoryUse.append(memory.getResidentSetSize() / 1.0e6)
+				memoryStatistics.update(reactionModel)
+				structureCount.append(memoryStatistics.structureCount)
+				speciesMemory.append(memoryStatistics.speciesMemory / 1.0e6)
+				reactionMemory.append(memoryStatistics.reactionMemory / 1.0e6)
+				structureMemory.append(memoryStatistics.structureMemory / 1.0e6)
+				edgeArrayMemory.append(memoryStatistics.edgeArrayMemory / 1.0e6)
+				logging.debug('Execution time: %s s' % (execTime[-1]))
+				logging.debug('Memory used: %s MB' % (memoryUse[-1]))
+				if options.memoryProfile:
+					memory.logHeapProfile(logging.VERBOSE)
+				# The restart file size is that of the most recently completed
+				# restart file, which may lag the current iteration by one
+				restartSize.append(restartWriter.size / 1.0e6)
+				saveExecutionStatistics(execTime, coreSpeciesCount, coreReactionCount, edgeSpeciesCount, edgeReactionCount, memoryUse, restartSize,
+					structureCount, speciesMemory, reactionMemory, structureMemory, edgeArrayMemory)
+				generateExecutionPlots(execTime, coreSpeciesCount, coreReactionCount, edgeSpeciesCount, edgeReactionCount, memoryUse, restartSize)
+
+			# Save the timing of each phase of this iteration
+			timing.save(timingPath, iteration)
+
+			logging.info('')
+		
+			# Consider stopping gracefully if the next iteration might take us
+			# past the wall time
+			if settings.wallTime > 0 and len(execTime) > 1:
+				t = execTime[-1]
+				dt = execTime[-1] - execTime[-2]
+				if t + 2 * dt > settings.wallTime:
+					logging.info('MODEL GENERATION TERMINATED')
+					logging.info('')
+					logging.info('There is not enough time to complete the next iteration before the wall time is reached.')
+					logging.info('The output model may be incomplete.')
+					logging.info('')
+					logging.info('The current model core has %s species and %s reactions' % (len(reactionModel.core.species), len(reactionModel.core.reactions)))
+					logging.info('The current model edge has %s species and %s reactions' % (len(reactionModel.edge.species), len(reactionModel.edge.reactions)))
+					io.writeOutputFile(os.path.join(settings.outputDirectory,'output.xml'), reactionModel, reactionSystems)
+					restartWriter.wait()
+					return
+	except:
+		# Do not leave a child process writing the restart file behind
+		restartWriter.terminate()
+		raise
 
 	# Write output file
 	logging.info('MODEL GENERATION COMPLETED')
@@ -246,20 +306,286 @@ def execute(inputFile, options):
 	logging.info('The final model edge has %s species and %s reactions' % (len(reactionModel.edge.species), len(reactionModel.edge.reactions)))
 	io.writeOutputFile(os.path.join(settings.outputDirectory,'output.xml'), reactionModel, reactionSystems)
 
+	# Make sure the last restart file has been completely written
+	restartWriter.wait()
+
 	# Log end timestamp
 	logging.info('')
 	logging.info('RMG execution terminated at ' + time.asctime())
 	
 ################################################################################
 
+def simulateReactionSystems(reactionModel, reactionSystems):
+	"""
+	Simulate each of the `reactionSystems` using the current core-edge
+	`reactionModel`, returning a list containing the simulation results
+	``(t, y, dydt, valid, obj)`` of each system in order. If more than one
+	worker process is allowed and there are multiple reaction systems, the
+	simulations are dispatched to a pool of forked worker processes, each of
+	which sees a copy-on-write snapshot of the model. Since each worker
+	simulates against its own copy of the model, the species each worker would
+	have removed from the edge are then removed from the edge of the real model
+	(unless they are to be enlarged), and the objects to enlarge are mapped
+	back onto the corresponding objects of the real model.
+	"""
+
+	numProcesses = parallel.getNumberOfProcesses(len(reactionSystems))
+
+	if numProcesses == 1:
+		results = []
+		for index, reactionSystem in enumerate(reactionSystems):
+			logging.info('Conducting simulation of reaction system %s...' % (index+1))
+			timing.start('simulate %i' % (index+1))
+			results.append(reactionSystem.simulate(reactionModel))
+			timing.stop()
+		return results
+
+	logging.info('Conducting simulations of %i reaction systems using %i processes...' % (len(reactionSystems), numProcesses))
+	timing.start('simulate')
+
+	# The worker processes inherit the snapshot when they are forked
+	global workerSnapshot
+	workerSnapshot = (reactionModel, reactionSystems)
+	try:
+		workerResults = parallel.map(simulateReactionSystemWorker, range(len(reactionSystems)))
+	finally:
+		workerSnapshot = None
+
+	# Map species and network ids back onto the objects of the real model
+	speciesList, reactionList = reactionModel.getLists()
+	speciesDict = dict([(spec.id, spec) for spec in speciesList])
+	networkDict = dict([(network.id, network) for network in reactionModel.unirxnNetworks])
+
+	results = []; removedSpecies = set(); enlargeSpecies = set(); networks = set()
+	for t, y, dydt, valid, objects, removed in workerResults:
+		objectsToEnlarge = []
+		for objType, objID, leakFluxes in objects:
+			if objType == 'species':
+				obj = speciesDict[objID]
+				enlargeSpecies.add(objID)
+			else:
+				# If several reaction systems return the same network, keep
+				# the maximum leak flux of each isomer over all of them
+				obj = networkDict[objID]
+				if objID not in networks:
+					obj.leakFluxes = {}
+					networks.add(objID)
+				for specID, flux in leakFluxes.iteritems():
+					if specID in speciesDict:
+						spec = speciesDict[specID]
+						obj.leakFluxes[spec] = max(flux, obj.leakFluxes.get(spec, flux))
+			objectsToEnlarge.append(obj)
+		if len(objectsToEnlarge) == 0: obj = None
+		elif reactionModel.maximumObjectsToEnlarge > 1: obj = objectsToEnlarge
+		else: obj = objectsToEnlarge[0]
+		removedSpecies.update(removed)
+		results.append((t, y, dydt, valid, obj))
+
+	# Trim the edge of the real model
+	edgeSpecies = [spec for spec in reactionModel.edge.species if spec.id in removedSpecies and spec.id not in enlargeSpecies]
+	if len(edgeSpecies) > 0:
+		logging.info('Removing from edge %d/%d species identified during simulation' % (len(edgeSpecies), len(reactionModel.edge.species)))
+		for spec in edgeSpecies:
+			reactionModel.removeSpeciesFromEdge(spec)
+
+	timing.stop()
+
+	return results
+
+# The model and reaction systems to be simulated by the worker processes
+workerSnapshot = None
+
+def simulateReactionSystemWorker(index):
+	"""
+	Simulate the reaction system with the given `index` in a worker process
+	using the model snapshot inherited from the parent process. Since objects
+	returned from the worker are copies, the objects to enlarge are returned
+	as a list of ``(type, id, leakFluxes)`` tuples, and the ids of the species
+	removed from the edge during the simulation are also returned.
+	"""
+	reactionModel, reactionSystems = workerSnapshot
+	edgeSpecies = [spec.id for spec in reactionModel.edge.species]
+
+	logging.info('Conducting simulation of reaction system %s...' % (index+1))
+	t, y, dydt, valid, obj = reactionSystems[index].simulate(reactionModel, '_%i' % (index+1))
+
+	remaining = set([spec.id for spec in reactionModel.edge.species])
+	removed = [specID for specID in edgeSpecies if specID not in remaining]
+
+	if obj is None: obj = []
+	elif not isinstance(obj, list): obj = [obj]
+	objects = []
+	for o in obj:
+		if isinstance(o, species.Species):
+			objects.append(('species', o.id, None))
+		else:
+			leakFluxes = dict([(spec.id, flux) for spec, flux in o.leakFluxes.iteritems()])
+			objects.append(('network', o.id, leakFluxes))
+
+	return t, y, dydt, valid, objects, removed
+
+################################################################################
+
+class RestartWriter:
+	"""
+	Save the RMG restart file without stalling the main model generation loop.
+	Where :func:`os.fork` is available, the objects to save are serialized by
+	a forked child process, which works on a copy-on-write snapshot of the
+	parent's memory; the parent is therefore free to continue with the next
+	simulation while the file is written. On other platforms the restart file
+	is written synchronously. In either case the file is first written to a
+	temporary file and then renamed into place, so that an interrupted save
+	never leaves a truncated restart file behind. The attributes are:
+
+	=============== ============================================================
+	Attribute       Description
+	=============== ============================================================
+	`path`          The path of the restart file
+	`pid`           The process id of the child writing the restart file, or
+	                :data:`None` if no write is in progress
+	`pipe`          The file descriptor used to receive the write time from
+	                the child process
+	`startTime`     The time at which the current write was started
+	`size`          The size in bytes of the most recent complete restart file
+	=============== ============================================================
+
+	"""
+
+	def __init__(self, path):
+		self.path = path
+		self.pid = None
+		self.pipe = None
+		self.startTime = 0.0
+		self.size = 0
+
+	def save(self, objects):
+		"""
+		Save the tuple of `objects` to the restart file. Any previous write
+		still in progress is finished first.
+		"""
+
+		self.wait()
+
+		self.startTime = time.time()
+		if not hasattr(os, 'fork'):
+			self.__write(objects)
+			self.size = os.path.getsize(self.path)
+			logging.debug('Restart file saved in %.2f s.' % (time.time() - self.startTime))
+			return
+
+		readFD, writeFD = os.pipe()
+		# Flush the log streams so their buffers are not duplicated in the child
+		sys.stdout.flush(); sys.stderr.flush()
+		pid = os.fork()
+		if pid == 0:
+			# Child process: write the file, report the time taken, and exit
+			# without running any of the parent's cleanup code
+			status = 0
+			try:
+				os.close(readFD)
+				self.__write(objects)
+				os.write(writeFD, '%.6f' % (time.time() - self.startTime))
+				os.close(writeFD)
+			except Exception:
+				status = 1
+			os._exit(status)
+
+		# Parent process
+		os.close(writeFD)
+		self.pid = pid
+		self.pipe = readFD
+
+	def wait(self):
+		"""
+		Block until the restart file write in progress (if any) is complete,
+		and log the time spent writing it along with the time saved by doing
+		so in the background.
+		"""
+
+		if self.pid is None:
+			return
+
+		waitStart = time.time()
+		f = os.fdopen(self.pipe, 'r')
+		writeTime = f.read()
+		f.close()
+		pid, status = os.waitpid(self.pid, 0)
+		waitTime = time.time() - waitStart
+		self.pid = None; self.pipe = None
+
+		if status != 0 or writeTime == '':
+			self.__removeTemporaryFile()
+			logging.warning('Background write of restart file %s failed; the previous restart file has been preserved.' % (self.path))
+			return
+
+		writeTime = float(writeTime)
+		self.size = os.path.getsize(self.path)
+		logging.verbose('Restart file saved in %.2f s in background; main loop waited %.2f s (%.2f s saved).' % (writeTime, waitTime, max(writeTime - waitTime, 0.0)))
+
+	def terminate(self):
+		"""
+		Abandon the restart file write in progress (if any), killing and reaping
+		the child process and removing its temporary file. This is used when the
+		main loop is exiting because of an error, so that the child does not
+		outlive the parent; the previous restart file is preserved.
+		"""
+
+		if self.pid is None:
+			return
+
+		try:
+			os.kill(self.pid, signal.SIGTERM)
+		except OSError:
+			# The child has already exited
+			pass
+		os.waitpid(self.pid, 0)
+		os.close(self.pipe)
+		self.pid = None; self.pipe = None
+		self.__removeTemporaryFile()
+
+	def __write(self, objects):
+		"""
+		Pickle the tuple of `objects` to a temporary file and atomically rename
+		it to the restart file path. The temporary file is removed if the write
+		fails.
+		"""
+		import cPickle
+		tempPath = self.path + '.tmp'
+		try:
+			f = open(tempPath, 'wb')
+			try:
+				cPickle.dump(objects, f)
+				f.flush()
+				os.fsync(f.fileno())
+			finally:
+				f.close()
+			os.rename(tempPath, self.path)
+		except:
+			self.__removeTemporaryFile()
+			raise
+
+	def __removeTemporaryFile(self):
+		"""
+		Remove the temporary file left behind by a failed or abandoned write.
+		"""
+		try:
+			os.remove(self.path + '.tmp')
+		except OSError:
+			pass
+
+################################################################################
+
 def saveExecutionStatistics(execTime, coreSpeciesCount, coreReactionCount, \
-	edgeSpeciesCount, edgeReactionCount, memoryUse, restartSize):
+	edgeSpeciesCount, edgeReactionCount, memoryUse, restartSize, \
+	structureCount, speciesMemory, reactionMemory, structureMemory, edgeArrayMemory):
 	"""
 	Save the statistics of the RMG job to an Excel spreadsheet for easy viewing
 	after the run is complete. The statistics are saved to the file
 	`statistics.xls` in the output directory. The ``xlwt`` package is used to
 	create the spreadsheet file; if this package is not installed, no file is
-	saved.
+	saved. The memory used is the resident set size of the RMG process; the
+	approximate memory used by the species, reactions, structures, and
+	simulation arrays of the model are also saved.
 	"""
 
 	# Attempt to import the xlwt package; return if not installed
@@ -308,6 +634,31 @@ def saveExecutionStatistics(execTime, coreSpeciesCount, coreReactionCount, \
 	for i, memory in enumerate(restartSize):
 		sheet.write(i+1,6,memory)
 
+	# Eighth column is number of structures (resonance isomers)
+	sheet.write(0,7,'Structures')
+	for i, count in enumerate(structureCount):
+		sheet.write(i+1,7,count)
+
+	# Ninth column is approximate memory used by species
+	sheet.write(0,8,'Species memory (MB)')
+	for i, memory in enumerate(speciesMemory):
+		sheet.write(i+1,8,memory)
+
+	# Tenth column is approximate memory used by reactions
+	sheet.write(0,9,'Reaction memory (MB)')
+	for i, memory in enumerate(reactionMemory):
+		sheet.write(i+1,9,memory)
+
+	# Eleventh column is approximate memory used by structures
+	sheet.write(0,10,'Structure memory (MB)')
+	for i, memory in enumerate(structureMemory):
+		sheet.write(i+1,10,memory)
+
+	# Twelfth column is approximate memory used by simulation arrays
+	sheet.write(0,11,'Simulation array memory (MB)')
+	for i, memory in enumerate(edgeArrayMemory):
+		sheet.write(i+1,11,memory)
+
 	# Save workbook to file
 	fstr = os.path.join(settings.outputDirectory, 'statistics.xls')
 	workbook.save(fstr)
@@ -0,0 +1,196 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#	RMG - Reaction Mechanism Generator
+#
+#	Copyright (c) 2002-2009 Prof. William H. Green (whgreen@mit.edu) and the
+#	RMG Team (rmg_dev@mit.edu)
+#
+#	Permission is hereby granted, free of charge, to any person obtaining a
+#	copy of this software and associated documentation files (the 'Software'),
+#	to deal in the Software without restriction, including without limitation
+#	the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#	and/or sell copies of the Software, and to permit persons to whom the
+#	Software is furnished to do so, subject to the following conditions:
+#
+#	The above copyright notice and this permission notice shall be included in
+#	all copies or substantial portions of the Software.
+#
+#	THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#	IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#	FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#	AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#	LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#	FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#	DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+"""
+Contains functions and classes for inexpensive accounting of the memory used
+during RMG execution. The total memory use of the process is read from the
+operating system, while the approximate memory used by the various parts of
+the reaction model is tracked incrementally, so that only the objects added
+since the last update need to be examined. A full (and expensive) heap profile
+can be obtained on demand using the ``guppy`` package.
+"""
+
+import os
+import sys
+
+import log as logging
+
+################################################################################
+
+def getResidentSetSize():
+	"""
+	Return the resident set size (the amount of physical memory used) of the
+	current process in bytes. On Linux this is read from ``/proc``; elsewhere
+	the peak resident set size reported by the :mod:`resource` module is used
+	instead. If neither is available, zero is returned.
+	"""
+	try:
+		f = open('/proc/self/statm', 'r')
+		pages = int(f.read().split()[1])
+		f.close()
+		return pages * os.sysconf('SC_PAGE_SIZE')
+	except (IOError, OSError, ValueError, IndexError, AttributeError):
+		pass
+
+	try:
+		import resource
+		maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+		# Mac OS X reports bytes, while everyone else reports kilobytes
+		if sys.platform == 'darwin': return maxrss
+		else: return maxrss * 1024
+	except ImportError:
+		return 0
+
+def getObjectSize(obj):
+	"""
+	Return the approximate size in bytes of the object `obj` itself and its
+	attribute dictionary (if any). Objects referenced by the attributes are not
+	included.
+	"""
+	size = sys.getsizeof(obj)
+	if hasattr(obj, '__dict__'):
+		size += sys.getsizeof(obj.__dict__)
+	return size
+
+def getStructureSize(struct):
+	"""
+	Return the approximate size in bytes of a :class:`structure.Structure`
+	object `struct`, including its graph, atoms, and bonds.
+	"""
+	graph = struct.graph
+	size = getObjectSize(struct) + sys.getsizeof(graph)
+	for atom, bonds in graph.iteritems():
+		size += getObjectSize(atom) + sys.getsizeof(bonds)
+		for bond in bonds.itervalues():
+			# Each bond appears twice in the graph
+			size += getObjectSize(bond) / 2
+	return size
+
+def logHeapProfile(level=logging.INFO):
+	"""
+	Walk the entire Python heap using the ``guppy`` package and log the
+	resulting profile, which breaks down the memory use by object type. This is
+	very expensive for large models, so it should only be used on demand. The
+	total heap size in bytes is returned, or zero if ``guppy`` is not
+	installed.
+	"""
+	try:
+		from guppy import hpy
+	except ImportError:
+		logging.warning('Package guppy not found. Unable to generate heap profile.')
+		return 0
+	heap = hpy().heap()
+	logging.log(level, 'Heap profile:')
+	for line in str(heap).splitlines():
+		logging.log(level, line)
+	return heap.size
+
+################################################################################
+
+class ModelMemoryStatistics:
+	"""
+	Incrementally-maintained counts and approximate memory use of the parts of
+	a reaction model. The approximate size of each species and reaction is
+	determined only once, when it first appears in the model, and is forgotten
+	when it leaves the model. The attributes are:
+
+	=================== ========================================================
+	Attribute           Description
+	=================== ========================================================
+	`speciesCount`      The number of core and edge species
+	`speciesMemory`     The approximate memory used by the species (excluding
+	                    their structures) in bytes
+	`reactionCount`     The number of core and edge reactions
+	`reactionMemory`    The approximate memory used by the reactions in bytes
+	`structureCount`    The number of structures (resonance isomers) of all
+	                    core and edge species
+	`structureMemory`   The approximate memory used by the structures in bytes
+	`edgeArrayMemory`   The approximate memory used by the arrays (stoichiometry
+	                    matrix, fluxes, and rates) built for the core and edge
+	                    during each simulation in bytes
+	=================== ========================================================
+
+	"""
+
+	def __init__(self):
+		self.speciesCount = 0
+		self.speciesMemory = 0
+		self.reactionCount = 0
+		self.reactionMemory = 0
+		self.structureCount = 0
+		self.structureMemory = 0
+		self.edgeArrayMemory = 0
+		# Cached (size, structure count, structure size) for each species
+		self.__speciesSizes = {}
+		# Cached (size, number of stoichiometry matrix entries) for each reaction
+		self.__reactionSizes = {}
+
+	def update(self, reactionModel):
+		"""
+		Update the statistics to reflect the current state of the core-edge
+		`reactionModel`. Only species and reactions added since the last
+		update are measured.
+		"""
+
+		speciesList, reactionList = reactionModel.getLists()
+
+		speciesSizes = {}
+		for spec in speciesList:
+			sizes = self.__speciesSizes.get(spec)
+			if sizes is None:
+				sizes = (getObjectSize(spec), len(spec.structure),
+					sum([getStructureSize(struct) for struct in spec.structure]))
+			speciesSizes[spec] = sizes
+		self.__speciesSizes = speciesSizes
+
+		reactionSizes = {}
+		for rxn in reactionList:
+			sizes = self.__reactionSizes.get(rxn)
+			if sizes is None:
+				sizes = (getObjectSize(rxn), len(rxn.reactants) + len(rxn.products))
+			reactionSizes[rxn] = sizes
+		self.__reactionSizes = reactionSizes
+
+		self.speciesCount = len(speciesSizes)
+		self.speciesMemory = sum([sizes[0] for sizes in speciesSizes.itervalues()])
+		self.structureCount = sum([sizes[1] for sizes in speciesSizes.itervalues()])
+		self.structureMemory = sum([sizes[2] for sizes in speciesSizes.itervalues()])
+		self.reactionCount = len(reactionSizes)
+		self.reactionMemory = sum([sizes[0] for sizes in reactionSizes.itervalues()])
+
+		# The compressed sparse row stoichiometry matrix stores a float value
+		# and an integer column index for each nonzero entry plus one integer
+		# row pointer per species; the simulation also holds two float arrays
+		# over species (fluxes and maximum fluxes) and one over reactions (rates)
+		numEntries = sum([sizes[1] for sizes in reactionSizes.itervalues()])
+		self.edgeArrayMemory = 12 * numEntries + 4 * (self.speciesCount + 1) + \
+			8 * (2 * self.speciesCount + self.reactionCount)
+
+################################################################################
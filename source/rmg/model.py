@@ -37,9 +37,11 @@ import numpy
 import os
 
 import constants
+import parallel
 import settings
 import reaction
 import species
+import thermo
 import unirxn.network
 
 ################################################################################
@@ -74,9 +76,13 @@ class CoreEdgeReactionModel:
 	`fluxToleranceMoveToCore`  The relative species flux above which species are moved from the edge to the core
 	`fluxToleranceInterrupt`   The relative species flux above which the simulation will halt
 	`maximumEdgeSpecies`       The maximum number of edge species allowed at any time
+	`maximumObjectsToEnlarge`  The maximum number of species or networks to enlarge per reaction system after each simulation
 	`termination`              A list of termination targets (i.e :class:`TerminationTime` and :class:`TerminationConversion` objects)
 	`unirxnNetworks`           A list of unimolecular reaction networks (:class:`unirxn.network.Network` objects)
 	`networkCount`             A counter for the number of unirxn networks created
+	`pdepKineticsSet`          The kinetics of the pressure-dependent reactions as a :class:`kinetics.PDepKineticsSet`, for evaluating their rate coefficients at once
+	`thermoDataSet`            The thermodynamic data of the core and edge species as a :class:`thermo.ThermoNASADataSet`, for evaluating their free energies at once
+	`stoichiometryMatrix`      The stoichiometry matrix of the core and edge species and reactions, or :data:`None` if it must be rebuilt
 	=========================  ==============================================================
 
 
@@ -100,9 +106,13 @@ class CoreEdgeReactionModel:
 		self.absoluteTolerance = 1.0e-8
 		self.relativeTolerance = 1.0e-4
 		self.maximumEdgeSpecies = 1000000
+		self.maximumObjectsToEnlarge = 1
 		self.termination = []
 		self.unirxnNetworks = []
 		self.networkCount = 0
+		self.pdepKineticsSet = None
+		self.thermoDataSet = None
+		self.stoichiometryMatrix = None
 
 	def initialize(self, coreSpecies):
 		"""
@@ -128,46 +138,54 @@ class CoreEdgeReactionModel:
 
 		rxnList = []
 
-		if isinstance(newObject, species.Species):
-
-			newSpecies = newObject
-			# Find reactions involving the new species as unimolecular reactant
-			# or product (e.g. A <---> products)
-			rxnList.extend(reaction.kineticsDatabase.getReactions([newSpecies]))
-			# Find reactions involving the new species as bimolecular reactants
-			# or products with itself (e.g. A + A <---> products)
-			rxnList.extend(reaction.kineticsDatabase.getReactions([newSpecies, newSpecies]))
-			# Find reactions involving the new species as bimolecular reactants
-			# or products with other core species (e.g. A + B <---> products)
-			for coreSpecies in self.core.species:
-				if coreSpecies.reactive:
-					rxnList.extend(reaction.kineticsDatabase.getReactions([newSpecies, coreSpecies]))
-
-			# Add new species
-			self.addSpeciesToCore(newSpecies)
-
-			logging.info('')
-			logging.info('After model enlargement:')
-
-		elif isinstance(newObject, unirxn.network.Network) and settings.unimolecularReactionNetworks:
-
-			network = newObject
-			# Determine the species with the maximum leak flux
-			maxSpecies, maxSpeciesFlux = network.getMaximumLeakSpecies()
-			network.explored.append(maxSpecies)
-			# Find reactions involving the found species as unimolecular
-			# reactant or product (e.g. A <---> products)
-			rxnList = reaction.kineticsDatabase.getReactions([maxSpecies])
-			# Don't find reactions involving the new species as bimolecular
-			# reactants or products with itself (e.g. A + A <---> products)
-			# Don't find reactions involving the new species as bimolecular
-			# reactants or products with other core species (e.g. A + B <---> products)
-
-			logging.info('')
-			logging.info('After network enlargement:')
+		# The species created while generating the reactions are processed
+		# together afterwards, so that their thermo data can be estimated at once
+		species.deferredSpecies = []
+		try:
+			if isinstance(newObject, species.Species):
+
+				newSpecies = newObject
+				# Find reactions involving the new species as unimolecular reactant
+				# or product (e.g. A <---> products)
+				rxnList.extend(reaction.kineticsDatabase.getReactions([newSpecies]))
+				# Find reactions involving the new species as bimolecular reactants
+				# or products with itself (e.g. A + A <---> products)
+				rxnList.extend(reaction.kineticsDatabase.getReactions([newSpecies, newSpecies]))
+				# Find reactions involving the new species as bimolecular reactants
+				# or products with other core species (e.g. A + B <---> products)
+				for coreSpecies in self.core.species:
+					if coreSpecies.reactive:
+						rxnList.extend(reaction.kineticsDatabase.getReactions([newSpecies, coreSpecies]))
+
+				# Add new species
+				self.addSpeciesToCore(newSpecies)
+
+				logging.info('')
+				logging.info('After model enlargement:')
+
+			elif isinstance(newObject, unirxn.network.Network) and settings.unimolecularReactionNetworks:
+
+				network = newObject
+				# Determine the species with the maximum leak flux
+				maxSpecies, maxSpeciesFlux = network.getMaximumLeakSpecies()
+				network.explored.append(maxSpecies)
+				# Find reactions involving the found species as unimolecular
+				# reactant or product (e.g. A <---> products)
+				rxnList = reaction.kineticsDatabase.getReactions([maxSpecies])
+				# Don't find reactions involving the new species as bimolecular
+				# reactants or products with itself (e.g. A + A <---> products)
+				# Don't find reactions involving the new species as bimolecular
+				# reactants or products with other core species (e.g. A + B <---> products)
+
+				logging.info('')
+				logging.info('After network enlargement:')
 
-		else:
-			raise TypeError('Unable to use object %s to enlarge reaction model; expecting an object of class rmg.species.Species or rmg.unirxn.network.Network.' % newObject)
+			else:
+				raise TypeError('Unable to use object %s to enlarge reaction model; expecting an object of class rmg.species.Species or rmg.unirxn.network.Network.' % newObject)
+		finally:
+			createdSpecies = species.deferredSpecies
+			species.deferredSpecies = None
+		species.processNewSpeciesBatch(createdSpecies)
 
 		# Add new reactions generated in above
 		for rxn in rxnList:
@@ -209,6 +227,7 @@ class CoreEdgeReactionModel:
 
 		# Add the species to the core
 		self.core.species.append(spec)
+		self.resetCachedModelInfo()
 
 		# Add it to the cantera list
 		spec.toCantera()
@@ -238,6 +257,7 @@ class CoreEdgeReactionModel:
 		Add a species `spec` to the reaction model edge.
 		"""
 		self.edge.species.append(spec)
+		self.resetCachedModelInfo()
 
 	def removeSpeciesFromEdge(self, spec):
 		"""
@@ -245,6 +265,7 @@ class CoreEdgeReactionModel:
 		"""
 		# remove the species
 		self.edge.species.remove(spec)
+		self.resetCachedModelInfo()
 		# identify any reactions it's involved in
 		rxnList = []
 		for rxn in self.edge.reactions:
@@ -306,6 +327,7 @@ class CoreEdgeReactionModel:
 		self.core.reactions.append(rxn)
 		if rxn in self.edge.reactions:
 			self.edge.reactions.remove(rxn)
+		self.resetCachedModelInfo()
 
 		# add it to the Cantera list
 		rxn.toCantera()
@@ -319,6 +341,17 @@ class CoreEdgeReactionModel:
 		edge).
 		"""
 		self.edge.reactions.append(rxn)
+		self.resetCachedModelInfo()
+
+	def resetCachedModelInfo(self):
+		"""
+		Clear the stoichiometry matrix and the thermodynamic data of the core
+		and edge species that are cached for evaluating the reaction rates.
+		This must be called whenever species or reactions are added to or
+		removed from the core or edge.
+		"""
+		self.stoichiometryMatrix = None
+		self.thermoDataSet = None
 
 	def getLists(self):
 		"""
@@ -337,18 +370,27 @@ class CoreEdgeReactionModel:
 		"""
 		Return the stoichiometry matrix for all core and edge species. The
 		rows represent the species in the core and edge in order, while the
-		columns represent the reactions in the core and edge in order.
+		columns represent the reactions in the core and edge in order. The
+		matrix is cached until the species or reactions change, and so must not
+		be modified.
 		"""
+		if self.stoichiometryMatrix is not None:
+			return self.stoichiometryMatrix
 		speciesList, reactionList = self.getLists()
 		from scipy import sparse
-		stoichiometry = sparse.dok_matrix((len(speciesList), len(reactionList)), float)
+		indices = dict([(spec, i) for i, spec in enumerate(speciesList)])
+		rows = []; cols = []; values = []
 		for j, rxn in enumerate(reactionList):
-			specList = rxn.reactants[:]; specList.extend(rxn.products)
-			for spec in specList:
-				i = speciesList.index(spec)
-				nu = rxn.getStoichiometricCoefficient(spec)
-				if nu != 0: stoichiometry[i,j] = nu
-		return stoichiometry.tocsr()
+			for spec in rxn.reactants:
+				rows.append(indices[spec]); cols.append(j); values.append(-1.0)
+			for spec in rxn.products:
+				rows.append(indices[spec]); cols.append(j); values.append(1.0)
+		# Duplicate entries are summed, giving the net stoichiometric
+		# coefficient of species that appear more than once in a reaction
+		stoichiometry = sparse.coo_matrix((values, (rows, cols)), shape=(len(speciesList), len(reactionList))).tocsr()
+		stoichiometry.eliminate_zeros()
+		self.stoichiometryMatrix = stoichiometry
+		return stoichiometry
 
 	def getReactionRates(self, T, P, Ci):
 		"""
@@ -359,8 +401,32 @@ class CoreEdgeReactionModel:
 		speciesList, reactionList = self.getLists()
 		rxnRate = numpy.zeros(len(reactionList), float)
 		totalConc = sum( Ci.values() )
+
+		# Evaluate the rate coefficients of the pressure-dependent reactions
+		# all at once
+		pdepReactions = [(j, rxn) for j, rxn in enumerate(reactionList)
+			if isinstance(rxn, reaction.PDepReaction) and rxn.kinetics is not None]
+		kineticsList = [rxn.kinetics for j, rxn in pdepReactions]
+		if self.pdepKineticsSet is None or len(self.pdepKineticsSet.kinetics) != len(kineticsList) or \
+			any([k1 is not k2 for k1, k2 in zip(self.pdepKineticsSet.kinetics, kineticsList)]):
+			from kinetics import PDepKineticsSet
+			self.pdepKineticsSet = PDepKineticsSet(kineticsList)
+		rateConstants = [None for rxn in reactionList]
+		for (j, rxn), k in zip(pdepReactions, self.pdepKineticsSet.getRateConstants(T, P)):
+			rateConstants[j] = k
+
+		# Evaluate the equilibrium constants of all reactions at once from the
+		# free energies of the species
+		if self.thermoDataSet is None:
+			self.thermoDataSet = thermo.ThermoNASADataSet([spec.thermoData for spec in speciesList])
+		dGrxn = self.thermoDataSet.getFreeEnergiesOfReaction(T, self.getStoichiometryMatrix())
+		equilibriumConstants = numpy.exp(-dGrxn / constants.R / T)
 		for j, rxn in enumerate(reactionList):
-			rxnRate[j] = rxn.getRate(T, P, Ci, totalConc)
+			# Convert from Ka to Kc
+			equilibriumConstants[j] *= totalConc ** (len(rxn.products) - len(rxn.reactants))
+
+		for j, rxn in enumerate(reactionList):
+			rxnRate[j] = rxn.getRate(T, P, Ci, totalConc, rateConstants[j], equilibriumConstants[j])
 		return rxnRate
 
 	def addReactionToUnimolecularNetworks(self, newReaction):
@@ -440,144 +506,180 @@ class CoreEdgeReactionModel:
 
 		from unirxn.network import Isomer, UnirxnNetworkException
 		from reaction import PDepReaction
-		from kinetics import ChebyshevKinetics, PDepArrheniusKinetics
 
-		count = sum([1 for network in self.unirxnNetworks if not network.valid])
-		logging.info('Updating %i modified unimolecular reaction networks...' % count)
+		networks = [network for network in self.unirxnNetworks if not network.valid]
+		logging.info('Updating %i modified unimolecular reaction networks...' % len(networks))
 
-		for network in self.unirxnNetworks:
-			if not network.valid:
+		# Prepare each network for the calculation of its rate coefficients
+		for network in networks:
 
-				logging.verbose('Updating unimolecular reaction network %s' % network.id)
+			logging.verbose('Updating unimolecular reaction network %s' % network.id)
 
-				# Other inputs
-				method, Tlist, Plist, grainSize, numGrains, model = settings.unimolecularReactionNetworks
+			network.bathGas = [spec for spec in self.core.species if not spec.reactive][0]
+			network.bathGas.expDownParam = 4.86 * 4184
 
-				network.bathGas = [spec for spec in self.core.species if not spec.reactive][0]
-				network.bathGas.expDownParam = 4.86 * 4184
+			# Generate isomers
+			for reaction in network.pathReactions:
 
-				# Generate isomers
-				for reaction in network.pathReactions:
-
-					# Create isomer for the reactant
-					isomer = None
-					for isom in network.isomers:
-						if all([spec in isom.species for spec in reaction.reactants]):
-							isomer = isom
-					if isomer is None:
-						isomer = Isomer(reaction.reactants)
-						network.isomers.append(isomer)
-					reaction.reactant = isomer
-
-					# Create isomer for the product
-					isomer = None
-					for isom in network.isomers:
-						if all([spec in isom.species for spec in reaction.products]):
-							isomer = isom
-					if isomer is None:
-						isomer = Isomer(reaction.products)
-						network.isomers.append(isomer)
-					reaction.product = isomer
-
-				# Update list of explored isomers to include all species in core
+				# Create isomer for the reactant
+				isomer = None
 				for isom in network.isomers:
-					if isom.isUnimolecular():
-						spec = isom.species[0]
-						if spec not in network.explored:
-							if spec in self.core.species:
-								network.explored.append(spec)
-
-				# Remove any isomers that aren't found in any path reactions
-				# Ideally this block of code wouldn't be needed, but it's here
-				# just in case
-				isomerList = []
-				for isomer in network.isomers:
-					found = False
-					for reaction in network.pathReactions:
-						if reaction.reactant is isomer or reaction.product is isomer:
-							found = True
-							break
-					if not found:
-						isomerList.append(isomer)
-				if len(isomerList) > 0:
-					logging.debug('Removed %i isomer(s) from network %i.' % (len(isomerList), network.id))
-					for isomer in isomerList: network.isomers.remove(isomer)
-
-				# Sort isomers so that all unimolecular isomers come first
-				isomers = [isom for isom in network.isomers if isom.isUnimolecular()]
-				isomers.extend([isom for isom in network.isomers if isom.isMultimolecular()])
-				network.isomers = isomers
-
-				# Get list of species in network
-				speciesList = network.getSpeciesList()
-
-				# Calculate ground-state energy of all species in network
-				# For now we assume that this is equal to the enthalpy of formation
-				# of the species
-				for spec in speciesList:
-					spec.E0 = spec.getEnthalpy(T=298)
-
-				# Determine isomer ground-state energies
-				for isomer in network.isomers:
-					isomer.E0 = sum([spec.E0 for spec in isomer.species])
-				# Determine transition state ground-state energies of the reactions
-				for reaction in network.pathReactions:
-					E0 = sum([spec.E0 for spec in reaction.reactants])
-					reaction.E0 = E0 + reaction.kinetics[0].getActivationEnergy(reaction.getEnthalpyOfReaction(T=298))
-
-				# Shift network such that lowest-energy isomer has a ground state of 0.0
-				network.shiftToZeroEnergy()
-
-				# Determine energy grains
-				Elist = network.determineEnergyGrains(grainSize, numGrains, max(Tlist))
-
-				# Calculate density of states for all isomers in network
-				network.calculateDensitiesOfStates(Elist)
-
-				# Determine phenomenological rate coefficients
-				K = network.calculateRateCoefficients(Tlist, Plist, Elist, method)
-
-				# Generate PDepReaction objects
-				for i, product in enumerate(network.isomers):
-					for j, reactant in enumerate(network.isomers[0:i]):
-						if numpy.any(K[:,:,i,j]):
-							if not numpy.all(K[:,:,i,j]):
-								raise UnirxnNetworkException('Zero rate coefficient encountered while updating network %s.' % network)
-							# Find the path reaction
-							netReaction = None
-							for r in network.netReactions:
-								if r.hasTemplate(reactant.species, product.species):
-									netReaction = r
-							# If path reaction does not already exist, make a new one
-							if netReaction is None:
-								netReaction = PDepReaction(reactant.species, product.species, network, None)
-								network.netReactions.append(netReaction)
-								self.addReactionToEdge(netReaction)
-							# Set its kinetics using interpolation model
-							if model[0].lower() == 'chebyshev':
-								modelType, degreeT, degreeP = model
-								chebyshev = ChebyshevKinetics()
-								chebyshev.fitToData(Tlist, Plist, K[:,:,i,j], degreeT, degreeP)
-								netReaction.kinetics = chebyshev
-							elif model.lower() == 'pdeparrhenius':
-								pDepArrhenius = PDepArrheniusKinetics()
-								pDepArrhenius.fitToData(Tlist, Plist, K[:,:,i,j])
-								netReaction.kinetics = pDepArrhenius
-							else:
-								pass
-
-							# Update cantera if this is a core reaction
-							if netReaction in self.core.reactions:
-								netReaction.toCantera()
-
-				for spec in speciesList:
-					del spec.E0
+					if all([spec in isom.species for spec in reaction.reactants]):
+						isomer = isom
+				if isomer is None:
+					isomer = Isomer(reaction.reactants)
+					network.isomers.append(isomer)
+				reaction.reactant = isomer
+
+				# Create isomer for the product
+				isomer = None
+				for isom in network.isomers:
+					if all([spec in isom.species for spec in reaction.products]):
+						isomer = isom
+				if isomer is None:
+					isomer = Isomer(reaction.products)
+					network.isomers.append(isomer)
+				reaction.product = isomer
+
+			# Update list of explored isomers to include all species in core
+			for isom in network.isomers:
+				if isom.isUnimolecular():
+					spec = isom.species[0]
+					if spec not in network.explored:
+						if spec in self.core.species:
+							network.explored.append(spec)
+
+			# Remove any isomers that aren't found in any path reactions
+			# Ideally this block of code wouldn't be needed, but it's here
+			# just in case
+			isomerList = []
+			for isomer in network.isomers:
+				found = False
 				for reaction in network.pathReactions:
-					del reaction.reactant
-					del reaction.product
-					del reaction.E0
+					if reaction.reactant is isomer or reaction.product is isomer:
+						found = True
+						break
+				if not found:
+					isomerList.append(isomer)
+			if len(isomerList) > 0:
+				logging.debug('Removed %i isomer(s) from network %i.' % (len(isomerList), network.id))
+				for isomer in isomerList: network.isomers.remove(isomer)
+
+			# Sort isomers so that all unimolecular isomers come first
+			isomers = [isom for isom in network.isomers if isom.isUnimolecular()]
+			isomers.extend([isom for isom in network.isomers if isom.isMultimolecular()])
+			network.isomers = isomers
+
+		# Calculate ground-state energy of all species in the networks at once
+		# For now we assume that this is equal to the enthalpy of formation
+		# of the species
+		speciesList = []
+		for network in networks:
+			for spec in network.getSpeciesList():
+				if spec not in speciesList:
+					speciesList.append(spec)
+		if len(speciesList) > 0:
+			thermoDataSet = thermo.ThermoNASADataSet([spec.thermoData for spec in speciesList])
+			for spec, E0 in zip(speciesList, thermoDataSet.getEnthalpies(298.0)):
+				spec.E0 = float(E0)
+
+		for network in networks:
+
+			# Determine isomer ground-state energies
+			for isomer in network.isomers:
+				isomer.E0 = sum([spec.E0 for spec in isomer.species])
+			# Determine transition state ground-state energies of the reactions
+			# The enthalpy of reaction at 298 K is the difference of the
+			# ground-state energies of the products and reactants
+			for reaction in network.pathReactions:
+				E0 = sum([spec.E0 for spec in reaction.reactants])
+				dHrxn = sum([spec.E0 for spec in reaction.products]) - E0
+				reaction.E0 = E0 + reaction.kinetics[0].getActivationEnergy(dHrxn)
+
+			# Shift network such that lowest-energy isomer has a ground state of 0.0
+			network.shiftToZeroEnergy()
+
+		# Reuse the rate coefficients of any networks that were calculated in
+		# this or a previous job, if the network cache is enabled
+		method, Tlist, Plist, grainSize, numGrains, model = settings.unimolecularReactionNetworks
+		results = [None for network in networks]
+		cache = None
+		if settings.networkCacheDirectory != '':
+			from unirxn.cache import NetworkCache
+			cache = NetworkCache(settings.networkCacheDirectory)
+			for index, network in enumerate(networks):
+				K = cache.load(network, Tlist, Plist, grainSize, numGrains, method, model)
+				if K is not None:
+					# The net reactions are fitted in the order of the isomers
+					# in this network, which may differ from when they were cached
+					kinetics = fitNetworkKinetics(K, Tlist, Plist, model)
+					if kinetics is not None:
+						results[index] = (K, kinetics, None)
+			logging.info('Found %i of %i modified unimolecular reaction networks in cache.' % (len([result for result in results if result is not None]), len(networks)))
+
+		# Determine the phenomenological rate coefficients of each remaining
+		# network, using multiple processes if allowed
+		indices = [index for index, result in enumerate(results) if result is None]
+		global networkSnapshot
+		networkSnapshot = networks
+		try:
+			for index, result in zip(indices, parallel.map(calculateNetworkKinetics, indices)):
+				results[index] = result
+		finally:
+			networkSnapshot = None
+
+		# Generate PDepReaction objects
+		for network, (K, kinetics, caches) in zip(networks, results):
+			if K is None:
+				raise UnirxnNetworkException(kinetics)
+			# Results from the network cache have no caches of their own
+			if caches is not None:
+				if cache is not None:
+					cache.save(network, Tlist, Plist, grainSize, numGrains, method, model, K)
+				# Keep the energy grains, densities of states and microcanonical
+				# rates so the next update of the network can reuse them
+				networkCaches, speciesCaches = caches
+				network.setCaches(networkCaches)
+				# The spectral data may be a copy made by a worker process, in
+				# which case it is equivalent to that of the species (or was
+				# generated by the worker, if the species had none)
+				for spec in network.getSpeciesList():
+					if spec.id in speciesCaches:
+						spectralData, densStatesCache = speciesCaches[spec.id]
+						if spec.spectralData is None:
+							spec.spectralData = spectralData
+						spec.densStatesCache = [(Emin, dE, spec.spectralData, densStates)
+							for Emin, dE, data, densStates in densStatesCache if data is spectralData]
+			for i, product in enumerate(network.isomers):
+				for j, reactant in enumerate(network.isomers[0:i]):
+					if (i, j) in kinetics:
+						# Find the path reaction
+						netReaction = None
+						for r in network.netReactions:
+							if r.hasTemplate(reactant.species, product.species):
+								netReaction = r
+						# If path reaction does not already exist, make a new one
+						if netReaction is None:
+							netReaction = PDepReaction(reactant.species, product.species, network, None)
+							network.netReactions.append(netReaction)
+							self.addReactionToEdge(netReaction)
+						# Set its kinetics using interpolation model
+						if kinetics[i,j] is not None:
+							netReaction.kinetics = kinetics[i,j]
+
+						# Update cantera if this is a core reaction
+						if netReaction in self.core.reactions:
+							netReaction.toCantera()
+
+			for reaction in network.pathReactions:
+				del reaction.reactant
+				del reaction.product
+				del reaction.E0
+
+			network.valid = True
 
-				network.valid = True
+		for spec in speciesList:
+			del spec.E0
 
 	def loadSeedMechanism(self, path):
 		"""
@@ -1075,6 +1177,80 @@ class TerminationConversion:
 
 ################################################################################
 
+# The unimolecular reaction networks being updated, which the worker processes
+# inherit when they are forked
+networkSnapshot = None
+
+def calculateNetworkKinetics(index):
+	"""
+	Calculate the phenomenological rate coefficients :math:`k(T,P)` of the
+	unimolecular reaction network at position `index` in the list of networks
+	being updated, and fit them to the interpolation model specified in the
+	settings. Returns the array of rate coefficients, a dictionary of the
+	fitted kinetics keyed by the indices of the product and reactant isomers
+	(the value is ``None`` if no interpolation model is used), and the
+	network's caches of energy grains, densities of states and microcanonical
+	rates, along with the density of states cache of each species. If the
+	network has a zero rate coefficient, ``None``, an error message and
+	``None`` are returned instead, as the result is passed back from a worker
+	process.
+	"""
+
+	network = networkSnapshot[index]
+	method, Tlist, Plist, grainSize, numGrains, model = settings.unimolecularReactionNetworks
+
+	# Determine energy grains
+	Elist = network.determineEnergyGrains(grainSize, numGrains, max(Tlist))
+
+	# Calculate density of states for all isomers in network
+	network.calculateDensitiesOfStates(Elist)
+
+	# Determine phenomenological rate coefficients
+	K = network.calculateRateCoefficients(Tlist, Plist, Elist, method)
+
+	# Fit the rate coefficients of each net reaction
+	kinetics = fitNetworkKinetics(K, Tlist, Plist, model)
+	if kinetics is None:
+		return None, 'Zero rate coefficient encountered while updating network %s.' % network, None
+
+	speciesCaches = dict([(spec.id, (spec.spectralData, spec.densStatesCache)) for spec in network.getSpeciesList()])
+	return K, kinetics, (network.getCaches(), speciesCaches)
+
+def fitNetworkKinetics(K, Tlist, Plist, model):
+	"""
+	Fit the phenomenological rate coefficients `K` of a unimolecular reaction
+	network, evaluated at the temperatures `Tlist` in K and pressures `Plist`
+	in Pa, to the interpolation model `model`. Only the net reactions from
+	each isomer to those before it in the network are fitted. Returns a
+	dictionary of the fitted kinetics keyed by the indices of the product and
+	reactant isomers (the value is ``None`` if no interpolation model is
+	used), or ``None`` if a net reaction has a zero rate coefficient.
+	"""
+
+	from kinetics import ChebyshevKinetics, PDepArrheniusKinetics
+
+	kinetics = {}
+	for i in range(K.shape[2]):
+		for j in range(i):
+			if numpy.any(K[:,:,i,j]):
+				if not numpy.all(K[:,:,i,j]):
+					return None
+				if model[0].lower() == 'chebyshev':
+					modelType, degreeT, degreeP = model
+					chebyshev = ChebyshevKinetics()
+					chebyshev.fitToData(Tlist, Plist, K[:,:,i,j], degreeT, degreeP)
+					kinetics[i,j] = chebyshev
+				elif model.lower() == 'pdeparrhenius':
+					pDepArrhenius = PDepArrheniusKinetics()
+					pDepArrhenius.fitToData(Tlist, Plist, K[:,:,i,j])
+					kinetics[i,j] = pDepArrhenius
+				else:
+					kinetics[i,j] = None
+
+	return kinetics
+
+################################################################################
+
 if __name__ == '__main__':
 
 	import chem
@@ -1129,4 +1305,3 @@ if __name__ == '__main__':
 
 	reactionSystem.solve(0.0, 1.0e0, speciesList, reactionList)
 
-	
\ No newline at end of file
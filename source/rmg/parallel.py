@@ -0,0 +1,106 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#	RMG - Reaction Mechanism Generator
+#
+#	Copyright (c) 2002-2009 Prof. William H. Green (whgreen@mit.edu) and the
+#	RMG Team (rmg_dev@mit.edu)
+#
+#	Permission is hereby granted, free of charge, to any person obtaining a
+#	copy of this software and associated documentation files (the 'Software'),
+#	to deal in the Software without restriction, including without limitation
+#	the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#	and/or sell copies of the Software, and to permit persons to whom the
+#	Software is furnished to do so, subject to the following conditions:
+#
+#	The above copyright notice and this permission notice shall be included in
+#	all copies or substantial portions of the Software.
+#
+#	THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#	IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#	FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#	AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#	LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#	FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#	DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+"""
+Contains functions for distributing independent calculations across multiple
+worker processes. The worker processes are forked from the main RMG process,
+so they see a copy-on-write snapshot of its memory at the time the work is
+dispatched; this avoids the need to pickle large objects such as the reaction
+model to send them to the workers. Only the arguments and return values of the
+worker function are pickled. As a consequence, any changes the worker function
+makes to objects in memory are not seen by the main process, and must instead
+be returned.
+
+Parallel execution requires :func:`os.fork` and the :mod:`multiprocessing`
+package; if either is unavailable, or if only one worker process is allowed by
+:data:`settings.numberOfProcesses`, the calculations are performed serially in
+the main process.
+"""
+
+import os
+
+import settings
+
+################################################################################
+
+def getNumberOfProcesses(numTasks):
+	"""
+	Return the number of worker processes to use to complete `numTasks`
+	independent tasks. A value of one indicates that the tasks should be
+	completed serially in the current process.
+	"""
+	numProcesses = min(settings.numberOfProcesses, numTasks)
+	if numProcesses <= 1 or not hasattr(os, 'fork'):
+		return 1
+	try:
+		import multiprocessing
+	except ImportError:
+		return 1
+	# Worker processes cannot fork workers of their own, so nested parallel
+	# calculations (e.g. the temperatures of a network being updated in a
+	# worker) are completed serially
+	if isWorkerProcess():
+		return 1
+	return numProcesses
+
+def isWorkerProcess():
+	"""
+	Return ``True`` if this is called in a worker process, in which case any
+	changes made to objects in memory are not seen by the main process.
+	"""
+	try:
+		import multiprocessing
+	except ImportError:
+		return False
+	return multiprocessing.current_process().daemon
+
+def map(function, items, minItemsPerProcess=1):
+	"""
+	Return a list of the results of applying `function` to each of the
+	`items`, in order. The function must be defined at the top level of a
+	module, and the items and results must be picklable. If multiple worker
+	processes are allowed, the items are distributed among a pool of forked
+	workers, each of which is given at least `minItemsPerProcess` items;
+	otherwise the function is simply applied serially.
+	"""
+	numProcesses = getNumberOfProcesses(len(items) // minItemsPerProcess)
+	if numProcesses == 1:
+		return [function(item) for item in items]
+
+	import multiprocessing
+	pool = multiprocessing.Pool(numProcesses)
+	try:
+		results = pool.map(function, items)
+	finally:
+		pool.close()
+		pool.join()
+	return results
+
+################################################################################
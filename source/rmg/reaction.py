@@ -52,6 +52,7 @@ import chem
 import data
 import structure
 import species
+import timing
 from kinetics import *
 
 import ctml_writer
@@ -476,14 +477,17 @@ class Reaction:
 			if product is spec: stoich += 1
 		return stoich
 
-	def getRate(self, T, P, conc, totalConc=None):
+	def getRate(self, T, P, conc, totalConc=None, rateConstant=None, equilibriumConstant=None):
 		"""
 		Return the net rate of reaction at temperature `T` and pressure `P`. The
 		parameter `conc` is a map with species as keys and concentrations as
 		values. A reactant not found in the `conc` map is treated as having zero
 		concentration.
 		
-		If passed a `totalConc`, it won't bother recalculating it.
+		If passed a `totalConc`, it won't bother recalculating it. Similarly, if
+		passed a `rateConstant` or `equilibriumConstant` (e.g. one of several
+		evaluated at once), it is used instead of evaluating the kinetics or
+		thermodynamics of the reaction.
 		"""
 
 		# Calculate total concentration
@@ -494,11 +498,13 @@ class Reaction:
 			totalConc=sum( conc.values() )
 
 		# Evaluate rate constant
-		rateConstant = self.getRateConstant(T, P)
+		if rateConstant is None:
+			rateConstant = self.getRateConstant(T, P)
 		if self.thirdBody: rateConstant *= totalConc
 
 		# Evaluate equilibrium constant
-		equilibriumConstant = self.getEquilibriumConstant(T, totalConc)
+		if equilibriumConstant is None:
+			equilibriumConstant = self.getEquilibriumConstant(T, totalConc)
 
 		# Evaluate forward concentration product
 		forward = 1.0
@@ -545,7 +551,7 @@ class Reaction:
 		"""
 		return len(self.reactants) > 1 and len(self.products) == 1
 
-	def calculateMicrocanonicalRate(self, Elist, T, reacDensStates, prodDensStates=None):
+	def calculateMicrocanonicalRate(self, Elist, T, reacDensStates, prodDensStates=None, k=None):
 		"""
 		Calculate and return the microcanonical rate coefficients k(E) for the
 		forward and reverse reactions from the high-pressure limit canonical
@@ -554,50 +560,47 @@ class Reaction:
 		equilibrium constant to ensure that the thermodynamics is correct, even
 		when there are small errors in the density of states. For dissociation
 		reactions the reverse rate coefficient is actually the product of the
-		reverse rate and the product equilibrium distribution.
+		reverse rate and the product equilibrium distribution. If the inverse
+		Laplace transform has already been evaluated, e.g. for many reactions
+		at once using :func:`kineticsInverseLaplaceTransformBatch`, it can be
+		passed as `k`.
 		"""
 
-		dE = Elist[1] - Elist[0]
-
 		import numpy
-		kf = numpy.zeros(len(Elist), numpy.float64)
+
 		kb = numpy.zeros(len(Elist), numpy.float64)
 
-		kinetics = self.getBestKinetics(T)
+		if k is None:
+			kinetics = self.getBestKinetics(T)
+			k = kineticsInverseLaplaceTransform(kinetics, self.E0, reacDensStates, Elist, T)
+		kf = numpy.array(k, numpy.float64)
 
-		reacQ = numpy.sum(reacDensStates * numpy.exp(-Elist / constants.R / T))
+		boltzmann = numpy.exp(-Elist / constants.R / T)
+		reacQ = numpy.sum(reacDensStates * boltzmann)
 		if prodDensStates is not None:
-			prodQ = numpy.sum(prodDensStates * numpy.exp(-Elist / constants.R / T))
+			prodQ = numpy.sum(prodDensStates * boltzmann)
 
 		Keq = self.getEquilibriumConstant(T, conc=1.0)
 
 		if self.isIsomerization():
 
-			kf = kineticsInverseLaplaceTransform(kinetics, self.E0, reacDensStates, Elist, T)
-			for r in range(len(Elist)):
-				if prodDensStates[r] != 0:
-					kb[r] = kf[r] / Keq * (reacDensStates[r] / reacQ) / (prodDensStates[r] / prodQ)
+			nonzero = prodDensStates != 0
+			kb[nonzero] = kf[nonzero] / Keq * (reacDensStates[nonzero] / reacQ) / (prodDensStates[nonzero] / prodQ)
 		
 		elif self.isDissociation():
 
-			kf = kineticsInverseLaplaceTransform(kinetics, self.E0, reacDensStates, Elist, T)
-			
-			for r in range(len(Elist)):
-				kb[r] = kf[r] / Keq * reacDensStates[r] * math.exp(-Elist[r] / constants.R / T) / reacQ
+			kb = kf / Keq * reacDensStates * boltzmann / reacQ
 
 		elif self.isAssociation():
 
 			if self.reactant.densStates is None:
 				raise Exception('Unable to process association reaction; no density of states available for the reactant isomers.')
 
-			kf = kineticsInverseLaplaceTransform(kinetics, self.E0, reacDensStates, Elist, T)
-			for r in range(len(Elist)):
-				kf[r] *= reacDensStates[r] * math.exp(-Elist[r] / constants.R / T) / reacQ
+			kf *= reacDensStates * boltzmann / reacQ
 
-			for r in range(len(Elist)):
-				bn = prodDensStates[r] * math.exp(-Elist[r] / constants.R / T) / prodQ
-				if bn != 0:
-					kb[r] = kf[r] / Keq / bn
+			bn = prodDensStates * boltzmann / prodQ
+			nonzero = bn != 0
+			kb[nonzero] = kf[nonzero] / Keq / bn[nonzero]
 
 		return kf, kb
 
@@ -1664,9 +1667,9 @@ class ReactionFamily(data.Database):
 				reactantAtom.label = templateAtom.label
 		
 		# Generate the product structures by applying the forward reaction recipe
+		timing.start('recipeApplication')
 		try:
 			productStructures = self.applyRecipe(reactantStructures)
-			if not productStructures: return None
 		except chem.InvalidChemicalActionException, e:
 			print 'Unable to apply reaction recipe!'
 			print 'Reaction family is %s' % self
@@ -1674,6 +1677,8 @@ class ReactionFamily(data.Database):
 			for struct in reactantStructures:
 				print struct.toAdjacencyList()
 			raise e
+		timing.stop()
+		if not productStructures: return None
 
 		# Check that reactant and product structures are allowed in this family
 		# If not, then stop
@@ -1687,7 +1692,9 @@ class ReactionFamily(data.Database):
 		# Convert structure(s) to products
 		products = []
 		for product in productStructures:
+			timing.start('speciesDedup')
 			spec = species.makeNewSpecies(product)
+			timing.stop()
 			# Don't make a new reaction if no species was returned from
 			# makeNewSpecies() (e.g. due to forbidden structure)
 			if spec is None: return None
@@ -1711,7 +1718,9 @@ class ReactionFamily(data.Database):
 			# Iterate over all resonance isomers of the reactant
 			for structure in reactants[0].structure:
 
+				timing.start('templateMatching')
 				ismatch, map21, map12 = self.reactantMatch(structure, self.template.reactants[0])
+				timing.stop()
 				if ismatch:
 					for map in map12:
 						rxn = self.makeReaction(reactants, [structure], [map])
@@ -1737,8 +1746,10 @@ class ReactionFamily(data.Database):
 				for structureB in structuresB:
 				
 					# Reactants stored as A + B
+					timing.start('templateMatching')
 					ismatch_A, map21_A, map12_A = self.reactantMatch(structureA, self.template.reactants[0])
 					ismatch_B, map21_B, map12_B = self.reactantMatch(structureB, self.template.reactants[1])
+					timing.stop()
 					
 					# Iterate over each pair of matches (A, B)
 					if ismatch_A and ismatch_B:
@@ -1752,8 +1763,10 @@ class ReactionFamily(data.Database):
 					if reactants[0].id != reactants[1].id:
 						
 						# Reactants stored as B + A
+						timing.start('templateMatching')
 						ismatch_A, map21_A, map12_A = self.reactantMatch(structureA, self.template.reactants[1])
 						ismatch_B, map21_B, map12_B = self.reactantMatch(structureB, self.template.reactants[0])
+						timing.stop()
 						
 						# Iterate over each pair of matches (A, B)
 						if ismatch_A and ismatch_B:
@@ -1908,48 +1921,78 @@ def kineticsInverseLaplaceTransform(kinetics, E0, densStates, Elist, T):
 	"""
 
 	import numpy
-	import unirxn.states as states
 
-	if kinetics.Ea < 0.0:
-		logging.warning('Negative activation energy of %s kJ/mol encountered during unirxn calculation; setting to zero.' % (kinetics.Ea / 1000.0))
-		Ea = 0.0
-	else:
-		Ea = kinetics.Ea
+	densStates = numpy.array([densStates], numpy.float64)
+	return kineticsInverseLaplaceTransformBatch([kinetics], [E0], densStates, Elist, T)[0,:]
 
-	dE = Elist[1] - Elist[0]
-	k = numpy.zeros(len(Elist), numpy.float64)
+def kineticsInverseLaplaceTransformBatch(kineticsList, E0list, densStates, Elist, T):
+	"""
+	Apply the inverse Laplace transform to each of the modified Arrhenius
+	expressions in `kineticsList` for a set of reactions with transition state
+	ground-state energies `E0list` and reactant densities of states given by
+	the rows of the two-dimensional array `densStates`. Returns a
+	two-dimensional array of the microcanonical rate coefficients of the
+	reactions over the range of energies `Elist`, evaluated as described in
+	:func:`kineticsInverseLaplaceTransform`. All of the reactions are processed
+	together, except for the convolution required when :math:`n > 0`.
+	"""
 
-	if kinetics.n == 0.0:
-		# Determine the microcanonical rate directly
-		s = int(math.floor(Ea / dE))
-		for r in range(len(Elist)):
-			if Elist[r] > E0 and densStates[r] != 0:
-				k[r] = kinetics.A * densStates[r - s] / densStates[r]
-
-	elif kinetics.n > 0.0:
-		import scipy.special
-		# Evaluate the inverse Laplace transform of the T**n piece, which only
-		# exists for n >= 0
-		phi = numpy.zeros(len(Elist), numpy.float64)
-		for i, E in enumerate(Elist):
-			if E == 0.0:
-				phi[i] = 0.0
-			else:
-				phi[i] = E**(kinetics.n-1) / (constants.R**kinetics.n * scipy.special.gamma(kinetics.n))
-		# Evaluate the convolution
-		states.convolve(phi, densStates, Elist)
-		# Apply to determine the microcanonical rate
-		s = int(math.floor(Ea / dE))
-		for r in range(len(Elist)):
-			if Elist[r] > E0 and densStates[r] != 0:
-				k[r] = kinetics.A * phi[r - s] / densStates[r]
+	import numpy
+	import unirxn.states as states
 
-	else:
-		# Use the cheating method for n < 0
+	nReactions, nGrains = densStates.shape
+	dE = Elist[1] - Elist[0]
+	k = numpy.zeros([nReactions, nGrains], numpy.float64)
+	if nReactions == 0:
+		return k
+
+	# The numerator of the expression for k(E), which is the density of states
+	# except for reactions with n > 0
+	numerator = numpy.array(densStates, numpy.float64)
+
+	# The rate coefficient is only nonzero above the transition state energy
+	# and where the reactant has states; collect these grains for all of the
+	# reactions, along with the grains shifted down by the activation energy
+	rows = []; index = []; shift = []; prefactor = []
+	for i, kinetics in enumerate(kineticsList):
+
+		if kinetics.Ea < 0.0:
+			logging.warning('Negative activation energy of %s kJ/mol encountered during unirxn calculation; setting to zero.' % (kinetics.Ea / 1000.0))
+			Ea = 0.0
+		else:
+			Ea = kinetics.Ea
 		s = int(math.floor(Ea / dE))
-		for r in range(len(Elist)):
-			if Elist[r] > E0 and densStates[r] != 0:
-				k[r] = kinetics.A * T**kinetics.n * densStates[r - s] / densStates[r]
+
+		r = numpy.flatnonzero((Elist > E0list[i]) & (densStates[i,:] != 0))
+		rows.append(numpy.repeat(i, len(r)))
+		index.append(r)
+		shift.append(r - s)
+
+		if kinetics.n == 0.0:
+			# Determine the microcanonical rate directly
+			prefactor.append(numpy.repeat(kinetics.A, len(r)))
+		elif kinetics.n > 0.0:
+			# Evaluate the inverse Laplace transform of the T**n piece, which
+			# only exists for n >= 0, and convolve with the density of states;
+			# this replaces the density of states in the expression for k(E)
+			import scipy.special
+			phi = numpy.zeros(nGrains, numpy.float64)
+			nonzero = Elist != 0.0
+			phi[nonzero] = Elist[nonzero]**(kinetics.n-1) / (constants.R**kinetics.n * scipy.special.gamma(kinetics.n))
+			states.convolve(phi, densStates[i,:], Elist)
+			numerator[i,:] = phi
+			prefactor.append(numpy.repeat(kinetics.A, len(r)))
+		else:
+			# Use the cheating method for n < 0
+			prefactor.append(numpy.repeat(kinetics.A * T**kinetics.n, len(r)))
+
+	rows = numpy.concatenate(rows)
+	index = numpy.concatenate(index)
+	shift = numpy.concatenate(shift)
+	prefactor = numpy.concatenate(prefactor)
+
+	# Evaluate all of the rate coefficients at once
+	k[rows, index] = prefactor * numerator[rows, shift] / densStates[rows, index]
 
 	return k
 
@@ -2169,8 +2212,10 @@ def makeNewReaction(reactants, products, reactantStructures, productStructures,
 		return forward, True
 	
 	# Attempt to get the kinetics of the forward and reverse reactions
+	timing.start('kineticsLookup')
 	forwardKinetics = forward.family.getKinetics(forward, reactantStructures)
 	reverseKinetics = reverse.family.getKinetics(reverse, productStructures)
+	timing.stop()
 	
 	# By convention, we only work with the reaction in the direction for which
 	# we have assigned kinetics from the kinetics database; the kinetics of the
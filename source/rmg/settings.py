@@ -60,6 +60,20 @@ spectralDataEstimation = False
 #: Whether to process unimolecular (pressure-dependent) reaction networks.
 unimolecularReactionNetworks = False
 
+#: Whether to store the collision matrices of unimolecular reaction networks in
+#: banded form when using the reservoir state method, which requires much less
+#: memory for large numbers of energy grains.
+bandedCollisionMatrix = False
+
+#: The directory in which the rate coefficients of unimolecular reaction
+#: networks are cached for reuse in later jobs; an empty string disables the
+#: cache.
+networkCacheDirectory = ''
+
+#: The maximum number of worker processes to use for independent calculations
+#: (e.g. simulations of multiple reaction systems).
+numberOfProcesses = 1
+
 # Global variables: RMG initialization time in seconds since the epoch
 # (generated by a call to time.time())
 #: Time at which the program execution was started (seconds since the epoch)
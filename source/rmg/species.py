@@ -41,6 +41,7 @@ import quantities as pq
 import numpy
 		
 import constants
+import parallel
 import settings
 import structure
 import thermo
@@ -48,6 +49,7 @@ import data
 import spectral.modes
 import spectral.data
 import ctml_writer
+import timing
 
 ################################################################################
 
@@ -176,6 +178,8 @@ class Species:
 	                  derived class of `thermo.ThermoData`
 	`thermoSnapshot`  The thermodynamic parameters at the current point in the
 	                  simulation
+	`densStatesCache` A list of recently calculated densities of states, each
+	                  stored with the energy grains and spectral data used
 	================  ==========================================================
 
 	"""
@@ -202,10 +206,29 @@ class Species:
 		self.lennardJones = None
 		self.spectralData = None
 		self.E0 = None
+		self.densStatesCache = []
 		
 		if SMILES is not None:
 			self.fromSMILES(SMILES)
 
+	def __getstate__(self):
+		"""
+		Return the state of the species to be pickled. The density of states
+		cache is left out, as it can be large and is simply recalculated when
+		needed.
+		"""
+		state = self.__dict__.copy()
+		state['densStatesCache'] = []
+		return state
+
+	def __setstate__(self, state):
+		"""
+		Restore the pickled `state` of the species. Species pickled before the
+		density of states cache was added are given an empty one.
+		"""
+		self.__dict__.update(state)
+		self.densStatesCache = []
+
 	def __cmp__(self, other):
 		"""
 		A comparison function that can be used to sort lists of Species objects.
@@ -430,24 +453,7 @@ class Species:
 
 		# Radicals
 		if structure.getRadicalCount() > 0:
-			# Iterate over resonance isomers
-			index = 0
-			while index < len(isomers):
-				isomer = isomers[index]
-
-				newIsomers = isomer.getAdjacentResonanceIsomers()
-				
-				for newIsomer in newIsomers:
-
-					# Append to isomer list if unique
-					found = False
-					for isom in isomers:
-						if isom.isIsomorphic(newIsomer): found = True
-					if not found:
-						isomers.append(newIsomer)
-
-				# Move to next resonance isomer
-				index += 1
+			isomers = structure.getResonanceIsomers()
 
 		for isomer in isomers:
 			isomer.updateAtomTypes()
@@ -474,11 +480,17 @@ class Species:
 		picks that with lowest H298 value, and saves it to `self.thermoData`.
 		"""
 		
-		thermoData = []
 		for structure in self.structure:
 			structure.updateAtomTypes()
-			thermoData.append(getThermoData(structure, thermoClass))
-		
+		return self.selectThermoData(getThermoDataBatch(self.structure, thermoClass))
+
+	def selectThermoData(self, thermoData):
+		"""
+		Set the thermodynamic data of the species from the list `thermoData`
+		of the thermo data of each of its structures (resonance isomers), in
+		the same order, as in :meth:`generateThermoData`.
+		"""
+
 		# If multiple resonance isomers are present, use the thermo data of
 		# the most stable isomer (i.e. one with lowest enthalpy of formation)
 		# as the thermo data of the species
@@ -512,7 +524,10 @@ class Species:
 	def calculateDensityOfStates(self, Elist):
 		"""
 		Calculate and return the density of states in mol/J of the species at
-		the specified list of energies `Elist` in J/mol.
+		the specified list of energies `Elist` in J/mol. The density of states
+		at each energy only depends on the lower energies, so a result
+		calculated previously with the same minimum energy and grain size but
+		at least as many grains is reused if the spectral data is unchanged.
 		"""
 
 		import unirxn.states as states
@@ -534,6 +549,14 @@ class Species:
 			# an exception
 			raise Exception('Unable to calculate density of states for species %s; no structure information or spectral data available.' % self)
 
+		# Check for a previously calculated density of states that covers the
+		# requested energy grains
+		Emin0 = Elist[0]; dE0 = Elist[1] - Elist[0]; nGrains = len(Elist)
+		for i, (Emin1, dE1, spectralData, densStates) in enumerate(self.densStatesCache):
+			if Emin1 == Emin0 and dE1 == dE0 and spectralData is self.spectralData and len(densStates) >= nGrains:
+				self.densStatesCache.insert(0, self.densStatesCache.pop(i))
+				return densStates[0:nGrains].copy()
+
 		# Initialize density of states
 		densStates = numpy.zeros(len(Elist), numpy.float64)
 
@@ -561,6 +584,12 @@ class Species:
 		# Convert density of states from (cm^-1)^-1 to mol/J
 		densStates /= conv
 
+		# Cache the density of states, replacing any calculated with fewer of
+		# the same energy grains; only the few most recently used are kept
+		self.densStatesCache = [entry for entry in self.densStatesCache if entry[0] != Emin0 or entry[1] != dE0]
+		self.densStatesCache.insert(0, (Emin0, dE0, self.spectralData, densStates.copy()))
+		del self.densStatesCache[4:]
+
 		return densStates
 
 	def getHeatCapacity(self, T):
@@ -675,6 +704,12 @@ global speciesCounter
 #: Used to label species uniquely. Incremented each time a new species is made.
 speciesCounter = 0 
 
+#: The new species whose thermo data has not yet been generated, if this is
+#: deferred so that the species can be processed together with
+#: :func:`processNewSpeciesBatch`; :data:`None` if new species are processed
+#: as they are created.
+deferredSpecies = None
+
 def makeNewSpecies(structure, label='', reactive=True):
 	"""
 	Attempt to make a new species based on a chemical `structure`, which is a
@@ -734,27 +769,54 @@ def processNewSpecies(spec):
 	spec.id = speciesCounter
 	
 	spec.getResonanceIsomers()
-	if thermoDatabase is not None:
-		spec.getThermoData()
-
-	# Generate spectral data
-	if settings.spectralDataEstimation and spec.thermoData and spec.reactive:
-		import spectral.data
-		spec.spectralData = spectral.data.generateSpectralData(spec.structure[0], spec.thermoData)
-		
-	# Generate Lennard-Jones parameters
-	spec.calculateLennardJonesParameters()
-
-	# Draw species
-	if settings.drawMolecules:
-		mol = pybel.Molecule(spec.toOBMol())
-		mol.draw(False, os.path.join(settings.outputDirectory, 'species/' + str(spec) + '.png'))
+	if deferredSpecies is not None:
+		deferredSpecies.append(spec)
+	else:
+		processNewSpeciesBatch([spec])
 
 	# Return the newly created species
 	speciesCache.insert(0, spec)
 	if len(speciesCache) > speciesCacheMaxSize: speciesCache.pop()
 	return spec
 
+def processNewSpeciesBatch(newSpecies):
+	"""
+	Generate the thermo data, spectral data and Lennard-Jones parameters of
+	each of the newly created species in the list `newSpecies`. The thermo
+	data of the resonance isomers of all of the species are estimated
+	together using :func:`getThermoDataBatch`.
+	"""
+
+	speciesToEstimate = [spec for spec in newSpecies if not spec.thermoData]
+	if thermoDatabase is not None and len(speciesToEstimate) > 0:
+		timing.start('thermoEstimation')
+		structures = []
+		for spec in speciesToEstimate:
+			for struct in spec.structure:
+				struct.updateAtomTypes()
+			structures.extend(spec.structure)
+		thermoData = getThermoDataBatch(structures)
+		index = 0
+		for spec in speciesToEstimate:
+			spec.selectThermoData(thermoData[index:index+len(spec.structure)])
+			index += len(spec.structure)
+		timing.stop()
+
+	for spec in newSpecies:
+
+		# Generate spectral data
+		if settings.spectralDataEstimation and spec.thermoData and spec.reactive:
+			import spectral.data
+			spec.spectralData = spectral.data.generateSpectralData(spec.structure[0], spec.thermoData)
+
+		# Generate Lennard-Jones parameters
+		spec.calculateLennardJonesParameters()
+
+		# Draw species
+		if settings.drawMolecules:
+			mol = pybel.Molecule(spec.toOBMol())
+			mol.draw(False, os.path.join(settings.outputDirectory, 'species/' + str(spec) + '.png'))
+
 ################################################################################
 
 class ThermoDatabase(data.Database):
@@ -845,6 +907,13 @@ class ThermoDatabase(data.Database):
 		"""
 
 		node = self.descendTree(structure, atom, None)
+		return self.getNodeThermoData(node)
+
+	def getNodeThermoData(self, node):
+		"""
+		Return the thermodynamic data for the node `node` in the tree, following
+		any links to the data of other nodes.
+		"""
 
 		if node not in self.library:
 			# No data present (e.g. bath gas)
@@ -884,7 +953,15 @@ class ThermoDatabaseSet:
 	database of functional groups and a number of secondary databases to provide
 	corrections for 1,5-interactions, gauche interactions, radicals, rings,
 	and other functionality. There is also a primary library containing data for
-	individual species.
+	individual species. The estimates for molecules (i.e. structures without
+	radicals) are cached in `saturatedThermoCache`, so that the radicals formed
+	from each molecule reuse its estimate, and the ring correction node for each
+	ring motif is indexed by ring fingerprint in `ringIndex`. The keys of the
+	cached estimates are listed in `saturatedThermoKeys` in the order they were
+	added, so that the oldest can be discarded once the cache holds
+	:data:`maximumSaturatedThermoCacheSize` estimates. In a worker process the
+	new cache entries are also recorded in `newCacheEntries`, so that they can
+	be returned to the main process and added to its caches.
 	"""
 
 
@@ -896,6 +973,10 @@ class ThermoDatabaseSet:
 		self.radicalDatabase = ThermoDatabase()
 		self.ringDatabase = ThermoDatabase()
 		self.primaryDatabase = ThermoDatabase()
+		self.saturatedThermoCache = {}
+		self.saturatedThermoKeys = []
+		self.ringIndex = {}
+		self.newCacheEntries = None
 
 	def load(self, datapath):
 		"""
@@ -905,6 +986,11 @@ class ThermoDatabaseSet:
 
 		datapath = os.path.abspath(datapath)
 
+		# Estimates made using any previously loaded databases are invalid
+		self.saturatedThermoCache = {}
+		self.saturatedThermoKeys = []
+		self.ringIndex = {}
+
 		logging.info('Loading thermodynamics databases from %s...' % datapath)
 
 		logging.verbose('Loading functional group thermo database from %s...' % datapath)
@@ -982,39 +1068,41 @@ class ThermoDatabaseSet:
 		"""
 
 		import chem
-		import structure
+
+		if struct.getRadicalCount() == 0:
+			thermoData = self.getSaturatedThermoData(struct)
+			# Return a copy so that the cached data is not modified
+			return thermo.ThermoGAData(thermoData.H298, thermoData.S298, list(thermoData.Cp), thermoData.comment, thermoData.index)
 
 		# First check to see if structure is in primary thermo library
 		label = self.primaryDatabase.contains(struct)
 		if label is not None:
-			return self.primaryDatabase.library[label]
-
-		thermoData = thermo.ThermoGAData()
+			thermoData = self.primaryDatabase.library[label]
+			# Return a copy so that the library data is not modified
+			return thermo.ThermoGAData(thermoData.H298, thermoData.S298, list(thermoData.Cp), thermoData.comment, thermoData.index)
+
+		# Saturate structure by replacing all radicals with bonds to
+		# hydrogen atoms; this is done in place rather than in a copy of the
+		# structure, which is restored afterward (saturating with H doesn't
+		# change the atom types of the other atoms, so these are not updated)
+		added = {}; electronStates = {}
+		for atom in struct.atoms():
+			if atom.hasFreeElectron():
+				electronStates[atom] = atom.electronState
+			for i in range(0, atom.getFreeElectronCount()):
+				H = chem.Atom('H', '0')
+				bond = chem.Bond([atom, H], 'S')
+				struct.addAtom(H)
+				struct.addBond(bond)
+				atom.decreaseFreeElectron()
+				if atom not in added:
+					added[atom] = []
+				added[atom].append(bond)
+		struct.resetCachedStructureInfo()
 
-		if struct.getRadicalCount() > 0:
-			# Make a copy of the structure so we don't change the original
-			saturatedStruct = struct.copy()
-			# Saturate structure by replacing all radicals with bonds to
-			# hydrogen atoms
-			added = {}
-			for atom in saturatedStruct.atoms():
-				for i in range(0, atom.getFreeElectronCount()):
-					H = chem.Atom('H', '0')
-					bond = chem.Bond([atom, H], 'S')
-					saturatedStruct.addAtom(H)
-					saturatedStruct.addBond(bond)
-					atom.decreaseFreeElectron()
-					if atom not in added:
-						added[atom] = []
-					added[atom].append(bond)
-			# Update the atom types of the saturated structure (not sure why
-			# this is necessary, because saturating with H shouldn't be
-			# changing atom types, but it doesn't hurt anything and is not
-			# very expensive, so will do it anyway)
-			saturatedStruct.simplifyAtomTypes()
-			saturatedStruct.updateAtomTypes()
+		try:
 			# Get thermo estimate for saturated form of structure
-			thermoData = self.getThermoData(saturatedStruct)
+			thermoData = self.getSaturatedThermoData(struct)
 			# For each radical site, get radical correction
 			# Only one radical site should be considered at a time; all others
 			# should be saturated with hydrogen atoms
@@ -1023,60 +1111,230 @@ class ThermoDatabaseSet:
 				# Remove the added hydrogen atoms and bond and restore the radical
 				for bond in added[atom]:
 					H = bond.atoms[1]
-					saturatedStruct.removeBond(bond)
-					saturatedStruct.removeAtom(H)
+					struct.removeBond(bond)
+					struct.removeAtom(H)
 					atom.increaseFreeElectron()
+				struct.resetCachedStructureInfo()
 
-				thermoData += self.radicalDatabase.getThermoData(saturatedStruct, {'*':atom})
+				thermoData += self.radicalDatabase.getThermoData(struct, {'*':atom})
 
 				# Re-saturate
 				for bond in added[atom]:
 					H = bond.atoms[1]
-					saturatedStruct.addAtom(H)
-					saturatedStruct.addBond(bond)
+					struct.addAtom(H)
+					struct.addBond(bond)
 					atom.decreaseFreeElectron()
+				struct.resetCachedStructureInfo()
 
-			# Subtract the enthalpy of the added hydrogens
-			thermoData_H = self.primaryDatabase.library['H']
+		finally:
+			# Restore the original structure (some radical sites may already
+			# have been restored if an error occurred above)
+			for atom in added:
+				for bond in added[atom]:
+					H = bond.atoms[1]
+					if not struct.hasBond(atom, H): continue
+					struct.removeBond(bond)
+					struct.removeAtom(H)
+				atom.electronState = electronStates[atom]
+			struct.resetCachedStructureInfo()
+
+		# Subtract the enthalpy of the hydrogens added at every radical site
+		thermoData_H = self.primaryDatabase.library['H']
+		for atom in added:
 			for bond in added[atom]:
 				thermoData.H298 -= thermoData_H.H298
 				#thermoData.S298 -= thermoData_H.S298
 
-			# Correct the entropy for the symmetry number
+		return thermoData
+
+	def getSaturatedThermoData(self, struct):
+		"""
+		Determine the group additivity thermodynamic data for the structure
+		`struct`, which must not contain any radicals. The data is cached, so
+		that radicals formed from the same saturated molecule (and the
+		molecule itself) reuse the same estimate; the returned object should
+		therefore not be modified. Once the cache is full, the oldest estimate
+		is discarded for each new one.
+		"""
+
+		# Check to see if the structure has already been estimated
+		key = getSaturatedStructureKey(struct)
+		for saturatedStruct, thermoData in self.saturatedThermoCache.get(key, []):
+			if struct.isIsomorphic(saturatedStruct):
+				return thermoData
 
+		# Check to see if structure is in primary thermo library
+		label = self.primaryDatabase.contains(struct)
+		if label is not None:
+			thermoData = self.primaryDatabase.library[label]
 		else:
-			# Generate estimate of thermodynamics
-			for atom in struct.atoms():
-				# Iterate over heavy (non-hydrogen) atoms
-				if atom.isNonHydrogen():
-					# Get initial thermo estimate from main group database
-					thermoData += self.groupDatabase.getThermoData(struct, {'*':atom})
-					# Correct for gauche and 1,5- interactions
-					thermoData += self.gaucheDatabase.getThermoData(struct, {'*':atom})
-					thermoData += self.int15Database.getThermoData(struct, {'*':atom})
-					thermoData += self.otherDatabase.getThermoData(struct, {'*':atom})
-
-			# Do ring corrections separately because we only want to match
-			# each ring one time; this doesn't work yet
-			rings = struct.getSmallestSetOfSmallestRings()
-			for ring in rings:
-
-				# Make a temporary structure containing only the atoms in the ring
-				ringStructure = structure.Structure()
-				for atom in ring: ringStructure.addAtom(atom)
-				for atom1 in ring:
-					for atom2 in ring:
-						if struct.hasBond(atom1, atom2):
-							ringStructure.addBond(struct.getBond(atom1, atom2))
-
-				# Get thermo correction for this ring
-				thermoData += self.ringDatabase.getThermoData(ringStructure, {})
+			thermoData = self.estimateSaturatedThermoData(struct)
+
+		# Cache the estimate with a copy of the structure, since radicals are
+		# saturated in place
+		struct = struct.copy()
+		self.__addSaturatedThermoData(key, struct, thermoData)
+		if self.newCacheEntries is not None:
+			self.newCacheEntries[0].append((key, struct, thermoData))
+		return thermoData
+
+	def __addSaturatedThermoData(self, key, struct, thermoData):
+		"""
+		Add the thermo data `thermoData` of the saturated structure `struct`
+		to the cache under `key`, discarding the oldest estimate if the cache
+		is full.
+		"""
+		if len(self.saturatedThermoKeys) >= maximumSaturatedThermoCacheSize:
+			oldKey = self.saturatedThermoKeys.pop(0)
+			del self.saturatedThermoCache[oldKey][0]
+			if len(self.saturatedThermoCache[oldKey]) == 0:
+				del self.saturatedThermoCache[oldKey]
+		self.saturatedThermoCache.setdefault(key, []).append((struct, thermoData))
+		self.saturatedThermoKeys.append(key)
+
+	def addCacheEntries(self, newCacheEntries):
+		"""
+		Add the saturated thermo estimates and ring correction nodes listed in
+		`newCacheEntries`, as recorded in a worker process, to the caches.
+		Estimates of structures that are already cached (e.g. because another
+		worker process also made them) are skipped.
+		"""
+		saturatedEntries, ringEntries = newCacheEntries
+		for key, struct, thermoData in saturatedEntries:
+			for saturatedStruct, data in self.saturatedThermoCache.get(key, []):
+				if struct.isIsomorphic(saturatedStruct): break
+			else:
+				self.__addSaturatedThermoData(key, struct, thermoData)
+		for fingerprint, node in ringEntries:
+			self.ringIndex.setdefault(fingerprint, node)
+
+	def estimateSaturatedThermoData(self, struct):
+		"""
+		Estimate the group additivity thermodynamic data for the structure
+		`struct`, which must not contain any radicals, from the functional
+		group and correction databases.
+		"""
+
+		thermoData = thermo.ThermoGAData()
+
+		# Generate estimate of thermodynamics
+		for atom in struct.atoms():
+			# Iterate over heavy (non-hydrogen) atoms
+			if atom.isNonHydrogen():
+				# Get initial thermo estimate from main group database
+				thermoData += self.groupDatabase.getThermoData(struct, {'*':atom})
+				# Correct for gauche and 1,5- interactions
+				thermoData += self.gaucheDatabase.getThermoData(struct, {'*':atom})
+				thermoData += self.int15Database.getThermoData(struct, {'*':atom})
+				thermoData += self.otherDatabase.getThermoData(struct, {'*':atom})
+
+		# Do ring corrections separately because we only want to match
+		# each ring one time; this doesn't work yet
+		rings = struct.getSmallestSetOfSmallestRings()
+		for ring in rings:
+			# Get thermo correction for this ring
+			thermoData += self.getRingThermoData(struct, ring)
 
 		return thermoData
 
+	def getRingThermoData(self, struct, ring):
+		"""
+		Return the ring correction to the thermodynamic data of the structure
+		`struct` for the ring containing the list of atoms `ring`. The ring
+		correction nodes are indexed by ring fingerprint (as returned by
+		:func:`getRingFingerprint`), so the ring correction tree is only
+		searched the first time each ring motif is encountered.
+		"""
+
+		import structure
+
+		fingerprint = getRingFingerprint(struct, ring)
+		if fingerprint is not None and fingerprint in self.ringIndex:
+			node = self.ringIndex[fingerprint]
+		else:
+			# Make a temporary structure containing only the atoms in the ring
+			ringStructure = structure.Structure()
+			for atom in ring: ringStructure.addAtom(atom)
+			for atom1 in ring:
+				for atom2 in ring:
+					if struct.hasBond(atom1, atom2):
+						ringStructure.addBond(struct.getBond(atom1, atom2))
+
+			node = self.ringDatabase.descendTree(ringStructure, {}, None)
+			if fingerprint is not None:
+				self.ringIndex[fingerprint] = node
+				if self.newCacheEntries is not None:
+					self.newCacheEntries[1].append((fingerprint, node))
+
+		return self.ringDatabase.getNodeThermoData(node)
+
+def getSaturatedStructureKey(struct):
+	"""
+	Return a hashable key for the structure `struct` in the cache of saturated
+	thermodynamic data. The key consists of the atom type of each atom and
+	those of its bonds and neighbours, so isomorphic structures always have
+	the same key; structures with the same key must still be checked for
+	isomorphism.
+	"""
+	key = []
+	for atom in struct.atoms():
+		neighbors = [(bond.bondType.label, atom2.atomType.label) for atom2, bond in struct.getBonds(atom).iteritems()]
+		neighbors.sort()
+		key.append((atom.atomType.label, tuple(neighbors)))
+	key.sort()
+	return tuple(key)
+
+def getRingFingerprint(struct, ring):
+	"""
+	Return a hashable fingerprint for the ring containing the list of atoms
+	`ring` in the structure `struct`. The fingerprint consists of the ring size
+	and the atom types and electron states of the atoms and the types of the
+	bonds around the ring, in whichever cyclic order and direction gives the
+	smallest fingerprint, so rings that are isomorphic always have the same
+	fingerprint. Returns :data:`None` if the ring atoms are also bonded across
+	the ring, as happens for some fused rings.
+	"""
+
+	# Order the atoms around the ring; each must have exactly two neighbors
+	# in the ring
+	ringAtoms = set(ring)
+	neighbors = {}
+	for atom in ring:
+		neighbors[atom] = [atom2 for atom2 in struct.getBonds(atom) if atom2 in ringAtoms]
+		if len(neighbors[atom]) != 2:
+			return None
+	size = len(ring)
+	order = [ring[0], neighbors[ring[0]][0]]
+	while len(order) < size:
+		atom1, atom2 = neighbors[order[-1]]
+		order.append(atom2 if atom1 is order[-2] else atom1)
+	if order[0] not in neighbors[order[-1]] or len(set(order)) < size:
+		return None
+
+	atoms = [(atom.atomType.label, atom.electronState.label) for atom in order]
+	bonds = [struct.getBond(order[i], order[(i+1) % size]).bondType.label for i in range(size)]
+
+	# Choose the smallest of the sequences starting from each atom in each
+	# direction around the ring (only the atoms with the smallest type can
+	# start the smallest sequence); the bond following atom i in the reverse
+	# direction is the one preceding it in the forward direction
+	first = min(atoms)
+	fingerprint = None
+	for i in range(size):
+		if atoms[i] != first: continue
+		forward = zip(atoms[i:] + atoms[:i], bonds[i:] + bonds[:i])
+		reverse = zip(atoms[i::-1] + atoms[:i:-1], bonds[i-1::-1] + bonds[:i-1:-1])
+		if fingerprint is None or forward < fingerprint: fingerprint = forward
+		if reverse < fingerprint: fingerprint = reverse
+
+	return (size, tuple(fingerprint))
+
 thermoDatabase = None
 forbiddenStructures = None
 
+# The maximum number of saturated structures whose thermo estimates are cached
+maximumSaturatedThermoCacheSize = 5000
+
 ################################################################################
 
 def getThermoData(struct, thermoClass=thermo.ThermoNASAData): # ThermoGAData
@@ -1087,48 +1345,104 @@ def getThermoData(struct, thermoClass=thermo.ThermoNASAData): # ThermoGAData
 	`thermoClass` is the class of thermo object you want returning; default
 	is :class:`ThermoNASAData`
 	"""
-	import constants
-	import math
+	return getThermoDataBatch([struct], thermoClass)[0]
 
-	GAthermoData = thermoDatabase.getThermoData(struct)
-
-	# Correct entropy for symmetry number
-	struct.calculateSymmetryNumber()
-	GAthermoData.S298 -= constants.R * math.log(struct.symmetryNumber)
+def getThermoDataBatch(structures, thermoClass=thermo.ThermoNASAData):
+	"""
+	Get the thermodynamic data associated with each of the `structures` by
+	looking in the loaded thermodynamic database, as in :func:`getThermoData`.
+	The group additivity estimates are distributed among multiple worker
+	processes if allowed by :data:`settings.numberOfProcesses` and there are
+	enough structures to make forking the workers worthwhile, and the
+	conversions to Wilhoit and NASA polynomial forms are fitted for all of the
+	structures at once. Returns a list of the thermo data objects of class
+	`thermoClass`, in the same order as the structures.
+	"""
 
-	logging.debug('Group-additivity thermo data: %s' % GAthermoData)
+	if thermoClass not in [thermo.ThermoGAData, thermo.ThermoWilhoitData, thermo.ThermoNASAData]:
+		raise Exception("Cannot convert thermo data into class %r"%(thermoClass))
+
+	# Determine the group additivity estimates
+	global structureSnapshot
+	structureSnapshot = structures
+	try:
+		results = parallel.map(getGroupAdditivityThermoData, range(len(structures)), minItemsPerProcess)
+	finally:
+		structureSnapshot = None
+
+	GAthermoList = []
+	for struct, (GAthermoData, symmetryNumber, atoms, rotors, linear, newCacheEntries) in zip(structures, results):
+		# The symmetry number and the new cache entries may have been made in
+		# a worker process
+		struct.symmetryNumber = symmetryNumber
+		if newCacheEntries is not None:
+			thermoDatabase.addCacheEntries(newCacheEntries)
+		logging.debug('Group-additivity thermo data: %s' % GAthermoData)
+		GAthermoList.append(GAthermoData)
 
 	if thermoClass == thermo.ThermoGAData:
-		return GAthermoData  # return here because Wilhoit conversion not wanted
+		return GAthermoList  # return here because Wilhoit conversion not wanted
 
 	# Convert to Wilhoit
-	rotors = struct.calculateNumberOfRotors()
-	atoms = len(struct.atoms())
-	linear = struct.isLinear()
-	WilhoitData = thermo.convertGAtoWilhoit(GAthermoData,atoms,rotors,linear)
+	WilhoitList = thermo.convertGAtoWilhoitBatch(GAthermoList,
+		[result[2] for result in results], [result[3] for result in results], [result[4] for result in results])
 
-	logging.debug('Wilhoit thermo data: %s' % WilhoitData)
+	for WilhoitData in WilhoitList:
+		logging.debug('Wilhoit thermo data: %s' % WilhoitData)
 
 	if thermoClass == thermo.ThermoWilhoitData:
-		return WilhoitData
+		return WilhoitList
 
 	# Convert to NASA
-	NASAthermoData = thermo.convertWilhoitToNASA(WilhoitData)
+	NASAthermoList = thermo.convertWilhoitToNASABatch(WilhoitList)
 
-	logging.debug('NASA thermo data: %s' % NASAthermoData)
+	for GAthermoData, NASAthermoData in zip(GAthermoList, NASAthermoList):
+		logging.debug('NASA thermo data: %s' % NASAthermoData)
 
-	# compute the error for the entire conversion, printing it as info or warning (if it is sufficiently high)
-	rmsErr = NASAthermoData.rmsErr(GAthermoData)
-	if(rmsErr > 0.35):
-	    logging.warning("Poor overall GA-to-NASA fit: Overall RMS error in heat capacity fit = %.3f*R." % (rmsErr))
-	else:
-	    logging.debug("Overall RMS error in heat capacity fit = %.3f*R" % (rmsErr))
+		# compute the error for the entire conversion, printing it as info or warning (if it is sufficiently high)
+		rmsErr = NASAthermoData.rmsErr(GAthermoData)
+		if(rmsErr > 0.35):
+		    logging.warning("Poor overall GA-to-NASA fit: Overall RMS error in heat capacity fit = %.3f*R." % (rmsErr))
+		else:
+		    logging.debug("Overall RMS error in heat capacity fit = %.3f*R" % (rmsErr))
+
+	return NASAthermoList
+
+# The structures whose thermo data is being estimated, which the worker
+# processes inherit when they are forked
+structureSnapshot = None
+
+# The minimum number of structures whose group additivity estimates are
+# assigned to each worker process, as each estimate takes far less time than
+# forking a worker
+minItemsPerProcess = 20
+
+def getGroupAdditivityThermoData(index):
+	"""
+	Return the group additivity thermo data of the structure at position
+	`index` in the list of structures whose thermo data is being estimated,
+	corrected for the symmetry number of the structure. The symmetry number,
+	number of atoms, number of rotors, and whether the structure is linear
+	are also returned, as the structure itself is not updated if this is
+	called in a worker process. For the same reason, the entries added to the
+	caches of the thermo database in a worker process are also returned (or
+	:data:`None` if not in a worker process).
+	"""
+	struct = structureSnapshot[index]
+
+	if parallel.isWorkerProcess():
+		thermoDatabase.newCacheEntries = ([], [])
+	try:
+		GAthermoData = thermoDatabase.getThermoData(struct)
+	finally:
+		newCacheEntries = thermoDatabase.newCacheEntries
+		thermoDatabase.newCacheEntries = None
 
-	if thermoClass == thermo.ThermoNASAData:
-		return NASAthermoData
+	# Correct entropy for symmetry number
+	struct.calculateSymmetryNumber()
+	GAthermoData.S298 -= constants.R * math.log(struct.symmetryNumber)
 
-	# Still not returned?
-	raise Exception("Cannot convert themo data into class %r"%(required_class))
+	return GAthermoData, struct.symmetryNumber, len(struct.atoms()), struct.calculateNumberOfRotors(), struct.isLinear(), newCacheEntries
 
 ################################################################################
 
@@ -73,6 +73,10 @@ class Structure:
 	                  structure
 	================  ==========================================================
 
+	Derived properties such as the molecular weight, linearity, and symmetry
+	number are cached once computed. The cache is cleared when atoms or bonds
+	are added or removed; call :meth:`resetCachedStructureInfo` after changing
+	bond orders or electron states in place.
 	"""
 	
 	def __init__(self, atoms=None, bonds=None, SMILES=None):
@@ -104,6 +108,7 @@ class Structure:
 		Add `atom` to the graph as a vertex. The atom is initialized with
 		no edges.
 		"""
+		self._cache = {}
 		return self.graph.addVertex(atom)
 
 	def addBond(self, bond):
@@ -112,6 +117,7 @@ class Structure:
 		`atom2`, which must already be present in the graph.
 		"""
 		atom1, atom2 = bond.atoms
+		self._cache = {}
 		return self.graph.addEdge((atom1, atom2), bond)
 
 	def getBonds(self, atom):
@@ -145,6 +151,7 @@ class Structure:
 		associated with `atom`. Does not remove atoms that no longer have any
 		bonds as a result of this removal.
 		"""
+		self._cache = {}
 		self.graph.removeVertex(atom)
 
 	def removeBond(self, bond):
@@ -153,6 +160,7 @@ class Structure:
 		any bonds as a result of this removal.
 		"""
 		atom1, atom2 = bond.atoms
+		self._cache = {}
 		return self.graph.removeEdge((atom1, atom2))
 
 	def isIsomorphic(self, other, map12=None, map21=None):
@@ -187,6 +195,7 @@ class Structure:
 		Rebuild the `graph` data member based on the lists of atoms and bonds
 		provided in `atoms` and `bonds`, respectively.
 		"""
+		self._cache = {}
 		self.graph = graph.Graph()
 		
 		if atoms is None or bonds is None:
@@ -240,6 +249,7 @@ class Structure:
 		Call this method when you have modified the graph or structure,
 		so that any information (eg. connectivity values, ring locations) that
 		we are cacheing, is reset."""
+		self._cache = {}
 		self.graph.resetCachedStructureInfo()
 
 	def getSmallestSetOfSmallestRings(self):
@@ -252,14 +262,18 @@ class Structure:
 		"""
 		Return the molecular formula for the structure.
 		"""
-		mol = pybel.Molecule(self.toOBMol())
-		return mol.formula
+		if 'formula' not in self._cache:
+			mol = pybel.Molecule(self.toOBMol())
+			self._cache['formula'] = mol.formula
+		return self._cache['formula']
 
 	def getMolecularWeight(self):
 		"""
 		Return the molecular weight of the structure in kg/mol.
 		"""
-		return sum([atom.atomType.element.mass for atom in self.atoms()])
+		if 'molecularWeight' not in self._cache:
+			self._cache['molecularWeight'] = sum([atom.atomType.element.mass for atom in self.atoms()])
+		return self._cache['molecularWeight']
 
 	def fromXML(self, document, rootElement):
 		"""
@@ -730,52 +744,138 @@ class Structure:
 			
 			# Set the new atom type
 			atom1.setAtomType(newAtomType)
+
+		self._cache = {}
 		
 	def getRadicalCount(self):
 		"""
 		Get the number of radicals in the structure.
 		"""
-		radical = 0
-		for atom in self.atoms():
-			radical += atom.electronState.order
-		return radical
+		if 'radicalCount' not in self._cache:
+			radical = 0
+			for atom in self.atoms():
+				radical += atom.electronState.order
+			self._cache['radicalCount'] = radical
+		return self._cache['radicalCount']
 
-	def getAdjacentResonanceIsomers(self):
+	def getResonanceIsomers(self):
 		"""
-		Generate all of the resonance isomers formed by one allyl radical shift.
-		"""
-
-		isomers = []
-
-		# Radicals
-		if self.getRadicalCount() > 0:
-			# Iterate over radicals in structure
-			for atom in self.atoms():
-				paths = self.findAllDelocalizationPaths(atom)
-				for path in paths:
+		Generate all of the unique resonance isomers formed by any number of
+		allyl radical shifts, and return them as a list beginning with the
+		structure itself.
 
-					atom1, atom2, atom3, bond12, bond23 = path
+		Since the shifts do not change the connectivity, each resonance isomer
+		is represented by a tuple of the electron states of the atoms and the
+		bond types of the bonds. The shifts of each isomer are found by
+		:meth:`findAllDelocalizationPaths` while the structure is temporarily
+		given its state, and are then applied to the tuples. Each new tuple is
+		given a key from the classes of its atoms after refinement by their
+		neighbors, which is the same for isomorphic resonance isomers. Only an
+		isomer whose key matches that of an isomer already found needs to be
+		checked for isomorphism, and only unique isomers are copied into new
+		:class:`Structure` objects.
+		"""
 
-					# Adjust to (potentially) new resonance isomer
-					atom1.decreaseFreeElectron()
-					atom3.increaseFreeElectron()
-					bond12.increaseOrder()
-					bond23.decreaseOrder()
+		atoms = self.atoms()
+		bonds = self.bonds()
+		atomIndices = dict([(atom, i) for i, atom in enumerate(atoms)])
+		bondIndices = dict([(bond, i) for i, bond in enumerate(bonds)])
+		neighbors = [[(atomIndices[atom2], bondIndices[bond]) for atom2, bond in self.getBonds(atom).iteritems()] for atom in atoms]
+		atomTypes = [atom.atomType.label for atom in atoms]
+
+		state = (tuple([atom.electronState for atom in atoms]), tuple([bond.bondType for bond in bonds]))
+		states = set([state])
+		isomers = [self]
+		keys = {self.__getResonanceKey(state, atomTypes, neighbors): [self]}
+
+		index = 0; queue = [state]
+		while index < len(queue):
+			electronStates, bondTypes = queue[index]
+			# The allyl radical shifts are found from the structure itself, so
+			# give it the resonance state being expanded while doing so
+			paths = []
+			self.__setResonanceState(queue[index], atoms, bonds)
+			try:
+				for atom in atoms:
+					paths.extend(self.findAllDelocalizationPaths(atom))
+			finally:
+				self.__setResonanceState(queue[0], atoms, bonds)
+			index += 1
+
+			for path in paths:
+				atom1, atom2, atom3 = [atomIndices[atom] for atom in path[0:3]]
+				bond12, bond23 = [bondIndices[bond] for bond in path[3:5]]
+				if electronStates[atom3].increment is None: continue
+
+				newElectronStates = list(electronStates)
+				newElectronStates[atom1] = electronStates[atom1].decrement
+				newElectronStates[atom3] = electronStates[atom3].increment
+				newBondTypes = list(bondTypes)
+				newBondTypes[bond12] = chem.bondTypes[bondTypes[bond12].order + 1]
+				newBondTypes[bond23] = chem.bondTypes[bondTypes[bond23].order - 1]
+				state = (tuple(newElectronStates), tuple(newBondTypes))
+				if state in states: continue
+				states.add(state)
+				queue.append(state)
+
+				key = self.__getResonanceKey(state, atomTypes, neighbors)
+				if key in keys:
+					found = False
+					self.__setResonanceState(state, atoms, bonds)
+					try:
+						for isomer in keys[key]:
+							if isomer.isIsomorphic(self):
+								found = True
+								break
+					finally:
+						self.__setResonanceState(queue[0], atoms, bonds)
+					if found: continue
+				else:
+					keys[key] = []
 
-					# Make a copy of isomer
+				self.__setResonanceState(state, atoms, bonds)
+				try:
 					isomer = self.copy()
-
-					# Restore current isomer
-					atom1.increaseFreeElectron()
-					atom3.decreaseFreeElectron()
-					bond12.decreaseOrder()
-					bond23.increaseOrder()
-
-					# Append to isomer list if unique
-					isomers.append(isomer)
+				finally:
+					self.__setResonanceState(queue[0], atoms, bonds)
+				keys[key].append(isomer)
+				isomers.append(isomer)
 
 		return isomers
 
+	def __getResonanceKey(self, state, atomTypes, neighbors):
+		"""
+		Return a key for the resonance isomer represented by `state`, a tuple
+		of the electron states of the atoms and the bond types of the bonds,
+		that is the same for all isomorphic resonance isomers. The atom types
+		of the atoms and the neighbors of each atom as (atom index, bond index)
+		tuples are given by `atomTypes` and `neighbors`, respectively.
+		"""
+		electronStates, bondTypes = state
+		classes = [(atomTypes[i], electronStates[i].label) for i in range(len(atomTypes))]
+		key = []
+		count = 0
+		while True:
+			signatures = [(classes[i], tuple(sorted([(classes[j], bondTypes[k].label) for j, k in neighbors[i]]))) for i in range(len(classes))]
+			labels = sorted(set(signatures))
+			key.append(tuple(sorted(signatures)))
+			if len(labels) == count: break
+			count = len(labels)
+			index = dict([(label, i) for i, label in enumerate(labels)])
+			classes = [index[signature] for signature in signatures]
+		return tuple(key)
+
+	def __setResonanceState(self, state, atoms, bonds):
+		"""
+		Set the electron states of `atoms` and the bond types of `bonds` to
+		those in `state`.
+		"""
+		electronStates, bondTypes = state
+		for atom, electronState in zip(atoms, electronStates):
+			atom.electronState = electronState
+		for bond, bondType in zip(bonds, bondTypes):
+			bond.bondType = bondType
+
 	def findAllDelocalizationPaths(self, atom1):
 		"""
 		Find all the delocalization paths allyl to the radical center indicated
@@ -842,24 +942,10 @@ class Structure:
 
 	def isBondInCycle(self, bond):
 		"""
-		Return :data:`True` if `atom` is in one or more cycles in the structure,
+		Return :data:`True` if `bond` is in one or more cycles in the structure,
 		and :data:`False` if not.
 		"""
-		atom1 = bond.atoms[0]
-		atom2 = bond.atoms[1]
-		cycle_list = self.graph.getAllCycles(atom1)
-		for cycle in cycle_list:
-			if atom2 in cycle:
-				return True
-		return False
-		
-		# You could have both atoms of the bond be in separate cycles,
-		# eg. C6H11-C6H11
-		# /\_/\
-		# || ||
-		# \/ \/
-		# so this doesn't work: 
-		## return self.isAtomInCycle(bond.atoms[0]) and self.isAtomInCycle(bond.atoms[1])
+		return self.graph.isEdgeInCycle(bond)
 
 	def getAllCycles(self, atom):
 		"""
@@ -873,10 +959,7 @@ class Structure:
 		Return :data:`True` if one or more cycles are present in the structure
 		and :data:`False` otherwise.
 		"""
-		for atom in self.atoms():
-			if self.isAtomInCycle(atom):
-				return True
-		return False
+		return self.graph.isCyclic()
 
 	def calculateNumberOfRotors(self):
 		"""
@@ -888,6 +971,7 @@ class Structure:
 		# rotors = obmol.NumRotors()
 		# return rotors
 		
+		if 'rotors' in self._cache: return self._cache['rotors']
 		if self.isLinear(): return 0
 		rotors = 0
 		for bond in self.bonds():
@@ -899,6 +983,7 @@ class Structure:
 				if len(self.graph[atom])==1: break
 			else: # didn't break
 				rotors+=1
+		self._cache['rotors'] = rotors
 		return rotors
 		
 		
@@ -906,6 +991,14 @@ class Structure:
 		"""
 		Return :data:`True` if the structure is linear and :data:`False` otherwise.
 		"""
+		if 'linear' not in self._cache:
+			self._cache['linear'] = self.__isLinear()
+		return self._cache['linear']
+
+	def __isLinear(self):
+		"""
+		Determine whether the structure is linear.
+		"""
 		atoms = self.atoms()
 		atomCount = len(atoms)
 		
@@ -1274,10 +1367,13 @@ class Structure:
 
 		return symmetryNumber
 
-	def calculateSymmetryNumber(self):
+	def estimateSymmetryNumber(self):
 		"""
-		Return the symmetry number for the structure. The symmetry number
-		includes both external and internal modes.
+		Return the symmetry number for the structure estimated as the product
+		of the contributions of each atom and bond not in a cycle and of each
+		axis of cumulated double bonds. This heuristic neglects the symmetry
+		of cycles; it is kept for comparison with
+		:meth:`calculateSymmetryNumber`.
 		"""
 		symmetryNumber = 1
 
@@ -1294,21 +1390,288 @@ class Structure:
 		#if self.isCyclic():
 		#	symmetryNumber *= self.calculateCyclicSymmetryNumber()
 
+		return symmetryNumber
+
+	def calculateSymmetryNumber(self):
+		"""
+		Calculate the symmetry number for the structure, which includes both
+		external and internal modes, and store it in the `symmetryNumber`
+		attribute. The symmetry number is found from the number of
+		automorphisms of the graph of the structure, i.e. the number of
+		permutations of the atoms that leave the structure unchanged, by
+		removing those that correspond to reflections rather than rotations:
+
+		* At each atom with three or more neighbors that is not planar, and
+		  at each planar atom with a double bond, the exchange of two
+		  identical substituents is a reflection, so the number is halved.
+
+		* At a planar atom with only single bonds, such an exchange is a
+		  rotation of the whole structure or of an internal rotor, so the
+		  number is unchanged.
+
+		* The exchanges at both ends of a double bond (or of an axis of
+		  cumulated double bonds) together form a rotation about the axis, so
+		  the number is doubled for each axis at which at least one end has
+		  identical substituents and neither end has different ones.
+
+		* The whole ring skeleton of a monocycle is treated as planar, so its
+		  permutations are rotations. In a polycyclic ring system (e.g. a
+		  bridged or spiro system) that is not planar, half of the
+		  permutations of its atoms are reflections if any are, so the number
+		  is halved for each system with a permutation that holds an atom at
+		  which the rings branch fixed and makes an odd permutation of its
+		  neighbors in the system.
+
+		As in :meth:`calculateBondSymmetryNumber`, an exchange of the ends of
+		an O-O single bond is not counted. A Kekule structure of an aromatic
+		ring has the symmetry of the ring with benzene bonds.
+		"""
+		if 'symmetryNumber' in self._cache:
+			self.symmetryNumber = self._cache['symmetryNumber']
+			return
+
+		# The alternating single and double bonds of a Kekule structure
+		# would hide half of the symmetry of an aromatic ring
+		kekuleBonds = self.__getKekuleRingBonds()
+		if len(kekuleBonds) > 0:
+			struct = self.copy()
+			for bond in struct.__getKekuleRingBonds():
+				bond.bondType = 'B'
+			struct.resetCachedStructureInfo()
+			struct.calculateSymmetryNumber()
+			self._cache['symmetryNumber'] = struct.symmetryNumber
+			self.symmetryNumber = struct.symmetryNumber
+			return
+
+		vertexClasses = self.graph.getVertexClasses()
+		symmetryNumber = self.graph.countAutomorphisms()
+
+		# Exchanges of identical substituents that are reflections
+		for atom in self.atoms():
+			neighbors = self.getBonds(atom)
+			if len(neighbors) < 3: continue
+			if len(neighbors) + self.__countLonePairs(atom) == 3:
+				for bond in neighbors.values():
+					if not bond.isSingle(): break
+				else:
+					continue
+			if self.__hasExchangeableSubstituents(atom, neighbors.keys(), vertexClasses):
+				symmetryNumber /= 2
+
+		# Rotations about axes of double bonds
+		for bonds in self.__getDoubleBondAxes():
+			atoms = []
+			for bond in bonds: atoms.extend(bond.atoms)
+			symmetric = False; broken = False
+			for atom in atoms:
+				if atoms.count(atom) > 1: continue
+				substituents = [atom2 for atom2, bond in self.getBonds(atom).iteritems() if bond not in bonds]
+				if len(substituents) == 0:
+					pass
+				elif len(substituents) == 1:
+					# An end with one substituent is straight, unless it has a
+					# lone pair (e.g. =N-H is bent)
+					if self.__countLonePairs(atom) > 0: broken = True
+				elif len(substituents) == 2 and self.__hasExchangeableSubstituents(atom, substituents, vertexClasses):
+					symmetric = True
+				else:
+					broken = True
+			if symmetric and not broken:
+				symmetryNumber *= 2
+
+		# O-O single bonds are treated as optical isomers
+		for bond in self.bonds():
+			atom1, atom2 = bond.atoms
+			if bond.isSingle() and not self.isBondInCycle(bond) and \
+				atom1.atomType.label == 'Os' and atom2.atomType.label == 'Os' and \
+				atom1.getFreeElectronCount() == 0 and atom2.getFreeElectronCount() == 0 and \
+				vertexClasses[atom1] == vertexClasses[atom2]:
+				if self.graph.extendsToAutomorphism({atom1: atom2, atom2: atom1}):
+					symmetryNumber /= 2
+
+		# Permutations of the atoms of polycyclic ring systems that are not
+		# planar, half of which are reflections if any are
+		for atoms, numRings in self.__getRingSystems():
+			if numRings < 2: continue
+			if self.__hasRingSystemReflection(atoms, vertexClasses):
+				symmetryNumber /= 2
+
+		self._cache['symmetryNumber'] = symmetryNumber
 		self.symmetryNumber = symmetryNumber
 
+	def __countLonePairs(self, atom):
+		"""
+		Return the number of lone pairs on `atom` according to the octet rule.
+		"""
+		order = sum([bond.bondType.order for bond in self.getBonds(atom).values()])
+		return max(0, int(8 - atom.atomType.element.valence[0] - order - atom.getFreeElectronCount()) / 2)
+
+	def __hasExchangeableSubstituents(self, atom, neighbors, vertexClasses):
+		"""
+		Return :data:`True` if the substituents of `atom` starting at any two
+		of the atoms in `neighbors` can be exchanged while the rest of the
+		structure is held fixed, and :data:`False` otherwise. Only substituents
+		attached by bonds that are not in a cycle can be exchanged. The
+		classes of equivalent atoms are given by `vertexClasses`.
+		"""
+		neighbors = [atom1 for atom1 in neighbors if not self.isBondInCycle(self.getBond(atom, atom1))]
+		for i, atom1 in enumerate(neighbors):
+			for atom2 in neighbors[i+1:]:
+				if vertexClasses[atom1] != vertexClasses[atom2]: continue
+				if not self.getBond(atom, atom1).equivalent(self.getBond(atom, atom2)): continue
+				# Terminal atoms are exchangeable if they are equivalent
+				if len(self.graph[atom1]) == 1:
+					return True
+				branch1 = self.__getSubstituent(atom, atom1)
+				branch2 = self.__getSubstituent(atom, atom2)
+				mapping = {atom1: atom2, atom2: atom1}
+				for atom3 in self.atoms():
+					if atom3 not in branch1 and atom3 not in branch2:
+						mapping[atom3] = atom3
+				if self.graph.extendsToAutomorphism(mapping):
+					return True
+		return False
+
+	def __hasRingSystemReflection(self, atoms, vertexClasses):
+		"""
+		Return :data:`True` if a permutation of the atoms of the structure
+		that leaves it unchanged is a reflection of the ring system whose
+		atoms are given by the set `atoms`, and :data:`False` otherwise. Such
+		a permutation is found at an atom with four bonds and lone pairs that
+		is bonded to three or more atoms of the ring system: if the atom can
+		be held fixed while its neighbors in the ring system are permuted by
+		an odd permutation, the permutation is a reflection. Only one atom of
+		each class given by `vertexClasses` needs to be checked. A ring system
+		without such an atom is taken to be planar, and a rigid ring system
+		whose permutations fix none of these atoms (e.g. twistane) is taken to
+		have none that are reflections.
+		"""
+		classes = set()
+		for atom in atoms:
+			if vertexClasses[atom] in classes: continue
+			bonds = self.getBonds(atom)
+			if len(bonds) + self.__countLonePairs(atom) != 4: continue
+			neighbors = [atom1 for atom1 in bonds if atom1 in atoms]
+			if len(neighbors) < 3: continue
+			classes.add(vertexClasses[atom])
+			# The odd permutations of the neighbors are the exchanges of two
+			# of them and, for four neighbors, the cycles of all four
+			permutations = []
+			for i, atom1 in enumerate(neighbors):
+				for atom2 in neighbors[i+1:]:
+					permutations.append({atom1: atom2, atom2: atom1})
+			if len(neighbors) == 4:
+				atom1 = neighbors[0]
+				for i in range(1, 4):
+					for j in range(1, 4):
+						if i == j: continue
+						atom2 = neighbors[i]; atom3 = neighbors[j]; atom4 = neighbors[6-i-j]
+						permutations.append({atom1: atom2, atom2: atom3, atom3: atom4, atom4: atom1})
+			for permutation in permutations:
+				mapping = {atom: atom}
+				for atom1 in neighbors:
+					atom2 = permutation.get(atom1, atom1)
+					if vertexClasses[atom1] != vertexClasses[atom2]: break
+					mapping[atom1] = atom2
+				else:
+					if self.graph.extendsToAutomorphism(mapping):
+						return True
+		return False
+
+	def __getRingSystems(self):
+		"""
+		Return a list of the ring systems in the structure, i.e. the sets of
+		rings in the smallest set of smallest rings that are joined by shared
+		atoms. Each ring system is given as a tuple of the set of its atoms
+		and the number of rings in it.
+		"""
+		systems = []
+		for ring in self.getSmallestSetOfSmallestRings():
+			atoms = set(ring); numRings = 1
+			for system in systems[:]:
+				if len(atoms & system[0]) > 0:
+					atoms |= system[0]; numRings += system[1]
+					systems.remove(system)
+			systems.append((atoms, numRings))
+		return systems
+
+	def __getKekuleRingBonds(self):
+		"""
+		Return a list of the bonds of the six-membered rings in the structure
+		whose bonds alternate between single and double bonds, i.e. the
+		Kekule structures of aromatic rings.
+		"""
+		bonds = []
+		for ring in self.getSmallestSetOfSmallestRings():
+			if len(ring) != 6: continue
+			ringBonds = [self.getBond(ring[i-1], ring[i]) for i in range(6)]
+			orders = [bond.bondType.order for bond in ringBonds]
+			if orders == [1, 2] * 3 or orders == [2, 1] * 3:
+				bonds.extend(ringBonds)
+		return bonds
+
+	def __getSubstituent(self, atom, atom1):
+		"""
+		Return the set of atoms in the substituent of `atom` that starts at
+		its neighbor `atom1`, which must be attached by a bond not in a cycle.
+		"""
+		substituent = set([atom1])
+		atoms = [atom1]
+		for atom2 in atoms:
+			for atom3 in self.graph[atom2]:
+				if atom3 is not atom and atom3 not in substituent:
+					substituent.add(atom3)
+					atoms.append(atom3)
+		return substituent
+
+	def __getDoubleBondAxes(self):
+		"""
+		Return a list of the axes of double bonds in the structure, each of
+		which is a list of one double bond or of two or more cumulated double
+		bonds. Double bonds in cycles are not included.
+		"""
+		axes = []
+		for bond in self.bonds():
+			if not bond.isDouble() or self.isBondInCycle(bond): continue
+			for axis in axes:
+				for bond2 in axis:
+					if bond.atoms[0] in bond2.atoms or bond.atoms[1] in bond2.atoms: break
+				else:
+					continue
+				axis.append(bond)
+				break
+			else:
+				axes.append([bond])
+		# Combine axes that share an atom
+		merged = True
+		while merged:
+			merged = False
+			for i, axis1 in enumerate(axes):
+				atoms1 = set([atom for bond in axis1 for atom in bond.atoms])
+				for axis2 in axes[i+1:]:
+					if any([atom in atoms1 for bond in axis2 for atom in bond.atoms]):
+						axis1.extend(axis2)
+						axes.remove(axis2)
+						merged = True
+						break
+				if merged: break
+		return axes
+
 	def countInternalRotors(self):
 		"""
 		Determine the number of internal rotors in the structure. Any single
 		bond not in a cycle and between two atoms that also have other bonds
 		are considered to be internal rotors.
 		"""
-		count = 0
-		for bond in self.bonds():
-			if bond.isSingle():
-				if len(self.getBonds(bond.atoms[0])) > 1 and len(self.getBonds(bond.atoms[1])) > 1:
-					if not self.isBondInCycle(bond):
-						count += 1
-		return count
+		if 'internalRotors' not in self._cache:
+			count = 0
+			for bond in self.bonds():
+				if bond.isSingle():
+					if len(self.getBonds(bond.atoms[0])) > 1 and len(self.getBonds(bond.atoms[1])) > 1:
+						if not self.isBondInCycle(bond):
+							count += 1
+			self._cache['internalRotors'] = count
+		return self._cache['internalRotors']
 
 	def calculateLennardJonesParameters(self):
 		"""
@@ -1319,6 +1682,8 @@ class Structure:
 
 		via the MultiWell User's Manual (2009.3 edition) by J. R. Barker et al.
 		"""
+		if 'lennardJones' in self._cache: return self._cache['lennardJones']
+
 		# Count the number of heavy atoms in the structure
 		count = sum([1 for atom in self.atoms() if atom.isNonHydrogen()])
 
@@ -1354,7 +1719,8 @@ class Structure:
 		elif count == 5:	sigma = 5.784;    epsilon = 341.1
 		else:				sigma = 5.949;    epsilon = 399.3
 
-		return sigma * 1e-10, epsilon * constants.kB
+		self._cache['lennardJones'] = (sigma * 1e-10, epsilon * constants.kB)
+		return self._cache['lennardJones']
 
 ################################################################################
 
@@ -164,11 +164,13 @@ class BatchReactor(ReactionSystem):
 		#self._cantera = phase  # if we save it, we have to pickle it, and we can't pickle the has_species function
 		ctml_writer.validate() # turns on validation
 
-	def runCantera(self, model):
+	def runCantera(self, model, label=''):
 		"""
 		Execute a simulation of the reaction system in Cantera. The procedure:
 		(1) write a CTML (Cantera) file, (2) read it into Cantera, (3) create
-		the reactor in Cantera, and (4) return the simulation results.
+		the reactor in Cantera, and (4) return the simulation results. The
+		optional `label` is appended to the name of the CTML file, so that
+		simultaneous simulations do not overwrite one another's files.
 		"""
 
 		# Create a folder in the scratch directory for Cantera files if needed
@@ -176,7 +178,7 @@ class BatchReactor(ReactionSystem):
 		os.path.exists(cantera_folder) or os.mkdir(cantera_folder)
 		
 		# Write the CTML file to scratch/cantera/ folder
-		cti_file = os.path.join(cantera_folder, 'cantera_input_%03d' % len(model.core.species))
+		cti_file = os.path.join(cantera_folder, 'cantera_input_%03d%s' % (len(model.core.species), label))
 		logging.debug("Writing CTML file %s" % cti_file)
 		ctml_writer.dataset(cti_file) # change name
 		ctml_writer.write()
@@ -256,10 +258,11 @@ class BatchReactor(ReactionSystem):
 		"""
 		self.expansionCoeff = 0.0
 
-	def simulate(self, model):
+	def simulate(self, model, label=''):
 		"""
 		Conduct a simulation of the current reaction system using the core-edge
-		reaction model `model`.
+		reaction model `model`. The optional `label` is used to distinguish the
+		Cantera input files of simultaneous simulations.
 
 		Edge species fluxes are tracked, relative to the characteristic core
 		flux at that time, throughout the simulation.
@@ -270,6 +273,15 @@ class BatchReactor(ReactionSystem):
 		If one or more of these exceed `model.fluxToleranceMoveToCore` then the
 		species with the highest will be returned.
 
+		If `model.maximumObjectsToEnlarge` is greater than one, then instead of
+		a single species or network, a list of up to that many edge species and
+		networks whose fluxes exceeded `model.fluxToleranceMoveToCore` during
+		the simulation is returned, ranked in order of decreasing flux (the
+		object that caused the simulation to be interrupted, if any, is first).
+		This allows the model to be enlarged by several species at once,
+		trading a somewhat larger model for fewer simulations. The limit is
+		per reaction system.
+
 		If the simulation completes without interruption, then any that fall
 		below `model.fluxToleranceKeepInEdge` will be removed from the
 		edge, along with the reactions that involve them.
@@ -279,7 +291,7 @@ class BatchReactor(ReactionSystem):
 		"""
 
 		# try writing cantera file
-		sim,gas = self.runCantera(model)
+		sim,gas = self.runCantera(model, label)
 
 		# Assemble stoichiometry matrix for all core and edge species
 		# Rows are species (core, then edge); columns are reactions (core, then edge)
@@ -287,6 +299,9 @@ class BatchReactor(ReactionSystem):
 
 		tlist = []; ylist = []; dydtlist = []
 		maxRelativeSpeciesFluxes = numpy.zeros(len(model.core.species) + len(model.edge.species), float)
+		# The edge species corresponding to the fluxes above (the edge may be
+		# trimmed at the end of the simulation)
+		edgeSpecies = model.edge.species[:]
 
 		maxRelativeNetworkLeakFluxes = numpy.zeros(len(model.unirxnNetworks), float)
 
@@ -391,13 +406,17 @@ class BatchReactor(ReactionSystem):
 					logging.info('\tCharacteristic flux: %s' % (charFlux))
 					logging.info('\tCritical flux: %s (%s times charFlux)' % (criticalFlux, model.fluxToleranceInterrupt))
 					logging.info('\tSpecies flux for %s: %s (%.2g times charFlux)' % (maxSpecies, maxSpeciesFlux, maxSpeciesFlux/charFlux))
-					return tlist, ylist, dydtlist, False, maxSpecies
+					maxObject = maxSpecies
 				else:
 					logging.info('At t = %s, a network leak flux exceeds the critical flux for simulation interruption' % (time))
 					logging.info('\tCharacteristic flux: %s' % (charFlux))
 					logging.info('\tCritical flux: %s (%s times charFlux)' % (criticalFlux, model.fluxToleranceInterrupt))
 					logging.info('\tNetwork leak flux for %s: %s (%.2g times charFlux)' % (maxNetwork, maxNetworkFlux, maxNetworkFlux/charFlux))
-					return tlist, ylist, dydtlist, False, maxNetwork
+					maxObject = maxNetwork
+				if model.maximumObjectsToEnlarge > 1:
+					return tlist, ylist, dydtlist, False, self.getObjectsToEnlarge(model,
+						edgeSpecies, maxRelativeSpeciesFluxes, maxRelativeNetworkLeakFluxes, maxObject)
+				return tlist, ylist, dydtlist, False, maxObject
 
 			# Test for simulation completion
 			for target in model.termination:
@@ -477,16 +496,63 @@ class BatchReactor(ReactionSystem):
 				logging.info('\tCharacteristic flux: %s' % (charFlux))
 				logging.info('\tCritical flux: %s (%s times charFlux)' % (criticalFlux, model.fluxToleranceMoveToCore))
 				logging.info('\tSpecies flux for %s: %s (%.2g times charFlux)' % (maxSpecies, maxSpeciesFlux, maxSpeciesFlux/charFlux))
-				return tlist, ylist, dydtlist, False, maxSpecies
+				maxObject = maxSpecies
 			else:
 				logging.info('At some time the network leak flux for %s exceeded the critical flux\nrelative to the characteristic core flux at that time' % (maxNetwork))
 				logging.info('\tCharacteristic flux: %s' % (charFlux))
 				logging.info('\tCritical flux: %s (%s times charFlux)' % (criticalFlux, model.fluxToleranceMoveToCore))
 				logging.info('\tNetwork leak flux for %s: %s (%.2g times charFlux)' % (maxNetwork, maxNetworkFlux, maxNetworkFlux/charFlux))
-				return tlist, ylist, dydtlist, False, maxNetwork
+				maxObject = maxNetwork
+			if model.maximumObjectsToEnlarge > 1:
+				return tlist, ylist, dydtlist, False, self.getObjectsToEnlarge(model,
+					edgeSpecies, maxRelativeSpeciesFluxes, maxRelativeNetworkLeakFluxes, maxObject)
+			return tlist, ylist, dydtlist, False, maxObject
 
 		return tlist, ylist, dydtlist, True, None
 
+	def getObjectsToEnlarge(self, model, edgeSpecies, maxRelativeSpeciesFluxes,
+		maxRelativeNetworkLeakFluxes, maxObject):
+		"""
+		Return a list of up to `model.maximumObjectsToEnlarge` edge species and
+		networks whose maximum relative fluxes during the simulation exceeded
+		`model.fluxToleranceMoveToCore`, ranked by decreasing flux. The array
+		`maxRelativeSpeciesFluxes` contains the maximum species fluxes relative
+		to the characteristic flux for all core species followed by the edge
+		species in the list `edgeSpecies` (the edge at the start of the
+		simulation), while the array `maxRelativeNetworkLeakFluxes` contains
+		the maximum network leak fluxes relative to the critical flux for
+		interruption. The object `maxObject` chosen by the usual single-object
+		criterion is always placed first in the list. The limit applies to
+		this reaction system only; the objects returned by several reaction
+		systems are merged, so the model can be enlarged by more objects than
+		the limit in one iteration.
+		"""
+
+		numCoreSpecies = len(model.core.species)
+
+		# Rank on the same relative scale as the species fluxes; any species
+		# removed from the edge during this simulation are not candidates
+		candidates = []
+		currentEdgeSpecies = set(model.edge.species)
+		for i in range(numCoreSpecies, len(maxRelativeSpeciesFluxes)):
+			spec = edgeSpecies[i - numCoreSpecies]
+			if maxRelativeSpeciesFluxes[i] > model.fluxToleranceMoveToCore and spec in currentEdgeSpecies:
+				candidates.append((maxRelativeSpeciesFluxes[i], spec))
+		if settings.unimolecularReactionNetworks:
+			for i, network in enumerate(model.unirxnNetworks):
+				if maxRelativeNetworkLeakFluxes[i] >= model.fluxToleranceMoveToCore:
+					candidates.append((maxRelativeNetworkLeakFluxes[i] * model.fluxToleranceInterrupt, network))
+		candidates.sort(key=lambda item: -item[0])
+
+		objectsToEnlarge = [maxObject]
+		for flux, obj in candidates:
+			if len(objectsToEnlarge) >= model.maximumObjectsToEnlarge: break
+			if obj is not maxObject: objectsToEnlarge.append(obj)
+
+		logging.info('Returning %i object(s) to enlarge: %s' % (len(objectsToEnlarge), ', '.join([str(obj) for obj in objectsToEnlarge])))
+
+		return objectsToEnlarge
+
 	def printSimulationStatus(self, model, t, y, y0, charFlux, maxSpeciesFlux, maxSpecies):
 		"""
 		Log a line of text describing the current status of the simulation. The
@@ -50,6 +50,7 @@ cdef class ThermoGAData(ThermoData):
 	cdef public double H298, S298
 	cdef public list Cp
 	cdef public str index
+	cdef tuple _breakpointKey, _breakpoints
 	
 	# can't cpdef special methods like __add__ :-(
 	#cpdef ThermoGAData __add__(ThermoGAData self, ThermoGAData other)
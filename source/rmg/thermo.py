@@ -40,7 +40,9 @@ significant speed boost to running in pure Python mode.
 import quantities as pq
 import constants
 import data
+import bisect
 import math
+import numpy
 import scipy
 from scipy import linalg
 from scipy import optimize
@@ -144,6 +146,8 @@ class ThermoGAData(ThermoData):
 		self.S298 = S298
 		self.Cp = Cp or [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0]
 		self.index = index
+		self._breakpointKey = None
+		self._breakpoints = None
 	
 	def __reduce__(self):
 		"""
@@ -151,6 +155,25 @@ class ThermoGAData(ThermoData):
 		"""
 		return (ThermoGAData, (self.H298, self.S298, self.Cp, self.comment, self.index))
 
+	def __getstate__(self):
+		"""
+		Used for pickling when not compiled with Cython, since :meth:`__reduce__`
+		is then ignored. The cached breakpoints are left out, as they are
+		recomputed when needed.
+		"""
+		state = self.__dict__.copy()
+		del state['_breakpointKey']
+		del state['_breakpoints']
+		return state
+
+	def __setstate__(self, state):
+		"""
+		Used for unpickling when not compiled with Cython.
+		"""
+		self.__dict__.update(state)
+		self._breakpointKey = None
+		self._breakpoints = None
+
 	# how do we cythonize 'special' methods?
 	# it's so confusing. This breaks pure python mode:
 	#@cython.locals(self=ThermoGAData, other=ThermoGAData, new=ThermoGAData, i=cython.int)
@@ -202,10 +225,25 @@ class ThermoGAData(ThermoData):
 			if self.Cp[i] != other.Cp[i]: return False
 		return True
 
+	def __getBreakpoints(self):
+		"""
+		Return lists of the enthalpy in J/mol and entropy in J/mol*K at each of
+		the temperatures in :data:`ThermoGAData.CpTlist`, and of the slope and
+		intercept of the heat capacity between each pair of these temperatures.
+		These are recomputed only when the enthalpy, entropy, or heat capacity
+		data has changed since the last call, as the heat capacity list may be
+		modified in place.
+		"""
+		if self._breakpointKey is None or self._breakpointKey != (self.H298, self.S298, self.Cp):
+			self._breakpoints = getGABreakpoints(self.H298, self.S298, self.Cp)
+			self._breakpointKey = (self.H298, self.S298, list(self.Cp))
+		return self._breakpoints
+
 	def getHeatCapacity(self, T):
 		"""
 		Return the constant-pressure heat capacity (Cp) in J/mol*K at temperature `T` in K.
 		"""
+		cython.declare(i=cython.int, Tmin=cython.double, Tmax=cython.double)
 		if not self.isTemperatureValid(T):
 			raise data.TemperatureOutOfRangeException('Invalid temperature for heat capacity estimation from group additivity.')
 		if T < 300.0:
@@ -213,63 +251,89 @@ class ThermoGAData(ThermoData):
 		elif T > ThermoGAData.CpTlist[-1]:
 			return self.Cp[-1]
 		else:
-			cython.declare(Tmin=cython.double, Tmax=cython.double, Cpmin=cython.double, Cpmax=cython.double)
-			for Tmin, Tmax, Cpmin, Cpmax in zip(ThermoGAData.CpTlist[:-1], \
-					ThermoGAData.CpTlist[1:], self.Cp[:-1], self.Cp[1:]):
-				if Tmin <= T and T <= Tmax:
-					return (Cpmax - Cpmin) * ((T - Tmin) / (Tmax - Tmin)) + Cpmin
+			CpTlist = ThermoGAData.CpTlist
+			i = max(bisect.bisect_left(CpTlist, T) - 1, 0)
+			Tmin = CpTlist[i]; Tmax = CpTlist[i+1]
+			return (self.Cp[i+1] - self.Cp[i]) * ((T - Tmin) / (Tmax - Tmin)) + self.Cp[i]
 	
 	def getEnthalpy(self, T):
 		"""
 		Return the enthalpy in J/mol at temperature `T` in K.
 		"""	
 		
-		cython.declare(H=cython.double, slope=cython.double, intercept=cython.double,
-		     Tmin=cython.double, Tmax=cython.double, Cpmin=cython.double, Cpmax=cython.double)
-		
-		H = self.H298
 		if not self.isTemperatureValid(T):
 			raise data.TemperatureOutOfRangeException('Invalid temperature for enthalpy estimation from group additivity.')
-		for Tmin, Tmax, Cpmin, Cpmax in zip(ThermoGAData.CpTlist[:-1], \
-				ThermoGAData.CpTlist[1:], self.Cp[:-1], self.Cp[1:]):
-			if T > Tmin:
-				slope = (Cpmax - Cpmin) / (Tmax - Tmin)
-				intercept = (Cpmin * Tmax - Cpmax * Tmin) / (Tmax - Tmin)
-				if T < Tmax:	H += 0.5 * slope * (T*T - Tmin*Tmin) + intercept * (T - Tmin)
-				else:			H += 0.5 * slope * (Tmax*Tmax - Tmin*Tmin) + intercept * (Tmax - Tmin)
-		if T > ThermoGAData.CpTlist[-1]:
-			H += self.Cp[-1] * (T - ThermoGAData.CpTlist[-1])
-		return H
+		return self.__getEnthalpyAndEntropy(T)[0]
 	
 	def getEntropy(self, T):
 		"""
 		Return the entropy in J/mol*K at temperature `T` in K.
 		"""
 		
-		S = self.S298
 		if not self.isTemperatureValid(T):
 			raise data.TemperatureOutOfRangeException('Invalid temperature for entropy estimation from group additivity.')
-		for Tmin, Tmax, Cpmin, Cpmax in zip(ThermoGAData.CpTlist[:-1], \
-				ThermoGAData.CpTlist[1:], self.Cp[:-1], self.Cp[1:]):
-			if T > Tmin:
-				slope = (Cpmax - Cpmin) / (Tmax - Tmin)
-				intercept = (Cpmin * Tmax - Cpmax * Tmin) / (Tmax - Tmin)
-				if T < Tmax:	S += slope * (T - Tmin) + intercept * math.log(T/Tmin)
-				else:			S += slope * (Tmax - Tmin) + intercept * math.log(Tmax/Tmin)
-		if T > ThermoGAData.CpTlist[-1]:
-			S += self.Cp[-1] * math.log(T / ThermoGAData.CpTlist[-1])
-		return S
+		return self.__getEnthalpyAndEntropy(T)[1]
 	
 	def getFreeEnergy(self, T):
 		"""
 		Return the Gibbs free energy in J/mol at temperature `T` in K.
 		"""
 			
+		cython.declare(H=cython.double, S=cython.double)
 		if not self.isTemperatureValid(T):
 			raise data.TemperatureOutOfRangeException('Invalid temperature for free energy estimation from group additivity.')
-		G = self.getEnthalpy(T) - T * self.getEntropy(T)
+		H, S = self.__getEnthalpyAndEntropy(T)
+		G = H - T * S
 		return G
-	
+
+	def __getEnthalpyAndEntropy(self, T):
+		"""
+		Return the enthalpy in J/mol and entropy in J/mol*K at temperature `T`
+		in K, found by adding the integral over the part of the segment of the
+		heat capacity interpolation containing `T` to the values at the start
+		of that segment. Above the last temperature in
+		:data:`ThermoGAData.CpTlist` the heat capacity is taken as constant.
+		"""
+		cython.declare(i=cython.int, Tmin=cython.double, slope=cython.double, intercept=cython.double)
+		CpTlist = ThermoGAData.CpTlist
+		i = bisect.bisect_left(CpTlist, T) - 1
+		if i < 0:
+			return self.H298, self.S298
+		Hlist, Slist, slopes, intercepts = self.__getBreakpoints()
+		if i == len(CpTlist) - 1:
+			return Hlist[i] + self.Cp[-1] * (T - CpTlist[-1]), Slist[i] + self.Cp[-1] * math.log(T / CpTlist[-1])
+		Tmin = CpTlist[i]; slope = slopes[i]; intercept = intercepts[i]
+		return Hlist[i] + (0.5 * slope * (T*T - Tmin*Tmin) + intercept * (T - Tmin)), \
+			Slist[i] + (slope * (T - Tmin) + intercept * math.log(T/Tmin))
+
+	def getHeatCapacities(self, Tlist):
+		"""
+		Return an array of the constant-pressure heat capacities (Cp) in
+		J/mol*K at each of the temperatures in `Tlist` in K.
+		"""
+		return ThermoGADataSet([self]).getHeatCapacities(Tlist)[0]
+
+	def getEnthalpies(self, Tlist):
+		"""
+		Return an array of the enthalpies in J/mol at each of the temperatures
+		in `Tlist` in K.
+		"""
+		return ThermoGADataSet([self]).getEnthalpies(Tlist)[0]
+
+	def getEntropies(self, Tlist):
+		"""
+		Return an array of the entropies in J/mol*K at each of the temperatures
+		in `Tlist` in K.
+		"""
+		return ThermoGADataSet([self]).getEntropies(Tlist)[0]
+
+	def getFreeEnergies(self, Tlist):
+		"""
+		Return an array of the Gibbs free energies in J/mol at each of the
+		temperatures in `Tlist` in K.
+		"""
+		return ThermoGADataSet([self]).getFreeEnergies(Tlist)[0]
+
 	def fromDatabase(self, data, comment):
 		"""
 		Process a list of numbers `data` and associated description `comment`
@@ -329,6 +393,160 @@ class ThermoGAData(ThermoData):
 	
 ################################################################################
 
+def getGABreakpoints(H298, S298, Cp):
+	"""
+	Return lists of the enthalpy in J/mol and entropy in J/mol*K at each of the
+	temperatures in :data:`ThermoGAData.CpTlist`, and of the slope and
+	intercept of the heat capacity between each pair of these temperatures,
+	for group additivity data with enthalpy `H298` in J/mol, entropy `S298` in
+	J/mol*K, and heat capacities `Cp` in J/mol*K. The heat capacity is
+	linearly interpolated between these temperatures, and each segment is
+	integrated exactly.
+	"""
+	cython.declare(H=cython.double, S=cython.double, slope=cython.double, intercept=cython.double,
+	     Tmin=cython.double, Tmax=cython.double, Cpmin=cython.double, Cpmax=cython.double)
+	H = H298; S = S298
+	Hlist = [H]; Slist = [S]; slopes = []; intercepts = []
+	for Tmin, Tmax, Cpmin, Cpmax in zip(ThermoGAData.CpTlist[:-1], \
+			ThermoGAData.CpTlist[1:], Cp[:-1], Cp[1:]):
+		slope = (Cpmax - Cpmin) / (Tmax - Tmin)
+		intercept = (Cpmin * Tmax - Cpmax * Tmin) / (Tmax - Tmin)
+		H += 0.5 * slope * (Tmax*Tmax - Tmin*Tmin) + intercept * (Tmax - Tmin)
+		S += slope * (Tmax - Tmin) + intercept * math.log(Tmax/Tmin)
+		Hlist.append(H); Slist.append(S)
+		slopes.append(slope); intercepts.append(intercept)
+	return Hlist, Slist, slopes, intercepts
+
+class ThermoGADataSet:
+	"""
+	A set of group additivity thermodynamic data, such as that of all of the
+	species in a reaction model, stored as stacked arrays so that the
+	thermodynamic properties of every species can be evaluated at once. The
+	attributes are:
+
+	=============== ============================================================
+	Attribute       Description
+	=============== ============================================================
+	`thermoData`    The list of :class:`ThermoGAData` objects in the set
+	`H298`          An array of the enthalpies of formation at 298 K in J/mol
+	`S298`          An array of the entropies of formation at 298 K in J/mol*K
+	`Cp`            An array of the heat capacities in J/mol*K of each species
+	                at each of the temperatures in :data:`ThermoGAData.CpTlist`
+	`Hlist`         An array of the enthalpies in J/mol of each species at each
+	                of these temperatures
+	`Slist`         An array of the entropies in J/mol*K of each species at
+	                each of these temperatures
+	`Tmin`          The minimum temperature in K at which all of the data is
+	                valid
+	`Tmax`          The maximum temperature in K at which all of the data is
+	                valid
+	=============== ============================================================
+
+	Each of the methods accepts either a single temperature or an array of
+	temperatures `T` in K, and returns an array whose first dimension runs
+	over the species in the set and whose remaining dimensions are those of
+	`T`.
+	"""
+
+	def __init__(self, thermoData):
+		self.thermoData = thermoData
+		self.H298 = numpy.array([t.H298 for t in thermoData], numpy.float64)
+		self.S298 = numpy.array([t.S298 for t in thermoData], numpy.float64)
+		self.Cp = numpy.zeros((len(thermoData), len(ThermoGAData.CpTlist)), numpy.float64)
+		self.Hlist = numpy.zeros_like(self.Cp)
+		self.Slist = numpy.zeros_like(self.Cp)
+		for i, t in enumerate(thermoData):
+			self.Cp[i,:] = t.Cp
+			self.Hlist[i,:], self.Slist[i,:] = getGABreakpoints(t.H298, t.S298, t.Cp)[0:2]
+		self.Tmin = max([t.Tmin for t in thermoData] or [298.0])
+		self.Tmax = min([t.Tmax for t in thermoData] or [2500.0])
+
+	def __getSegments(self, T, quantity):
+		"""
+		Return the temperatures `T` in K as an array, along with the index of
+		the segment of the heat capacity interpolation containing each of them
+		and the bounding temperatures of these segments. Indices of -1 and
+		``len(ThermoGAData.CpTlist) - 1`` indicate temperatures below and above
+		the range of interpolation, respectively.
+		"""
+		T = numpy.asarray(T, numpy.float64)
+		if (T < self.Tmin).any() or (T > self.Tmax).any():
+			raise data.TemperatureOutOfRangeException('Invalid temperature for %s estimation from group additivity.' % quantity)
+		CpTlist = numpy.array(ThermoGAData.CpTlist)
+		index = numpy.searchsorted(CpTlist, T, side='left') - 1
+		segment = numpy.minimum(numpy.maximum(index, 0), len(CpTlist) - 2)
+		return T, index, segment, CpTlist[segment], CpTlist[segment+1]
+
+	def __getSlopesAndIntercepts(self, segment, Tmin, Tmax):
+		"""
+		Return the slopes and intercepts of the linear interpolation of the
+		heat capacity of each species over the given segments.
+		"""
+		Cpmin = self.Cp[:,segment]; Cpmax = self.Cp[:,segment+1]
+		slope = (Cpmax - Cpmin) / (Tmax - Tmin)
+		intercept = (Cpmin * Tmax - Cpmax * Tmin) / (Tmax - Tmin)
+		return slope, intercept
+
+	def getHeatCapacities(self, T):
+		"""
+		Return the constant-pressure heat capacities (Cp) in J/mol*K of each
+		species at temperature `T` in K.
+		"""
+		T, index, segment, Tmin, Tmax = self.__getSegments(T, 'heat capacity')
+		Cpmin = self.Cp[:,segment]; Cpmax = self.Cp[:,segment+1]
+		Cp = (Cpmax - Cpmin) * ((T - Tmin) / (Tmax - Tmin)) + Cpmin
+		shape = (-1,) + (1,) * T.ndim
+		Cp = numpy.where(T < 300.0, self.Cp[:,0].reshape(shape), Cp)
+		Cp = numpy.where(T > ThermoGAData.CpTlist[-1], self.Cp[:,-1].reshape(shape), Cp)
+		return Cp
+
+	def getEnthalpies(self, T):
+		"""
+		Return the enthalpies in J/mol of each species at temperature `T` in K.
+		"""
+		T, index, segment, Tmin, Tmax = self.__getSegments(T, 'enthalpy')
+		slope, intercept = self.__getSlopesAndIntercepts(segment, Tmin, Tmax)
+		H = self.Hlist[:,segment] + (0.5 * slope * (T*T - Tmin*Tmin) + intercept * (T - Tmin))
+		shape = (-1,) + (1,) * T.ndim
+		H = numpy.where(index < 0, self.H298.reshape(shape), H)
+		H = numpy.where(index == len(ThermoGAData.CpTlist) - 1,
+			self.Hlist[:,-1].reshape(shape) + self.Cp[:,-1].reshape(shape) * (T - ThermoGAData.CpTlist[-1]), H)
+		return H
+
+	def getEntropies(self, T):
+		"""
+		Return the entropies in J/mol*K of each species at temperature `T` in K.
+		"""
+		T, index, segment, Tmin, Tmax = self.__getSegments(T, 'entropy')
+		slope, intercept = self.__getSlopesAndIntercepts(segment, Tmin, Tmax)
+		S = self.Slist[:,segment] + (slope * (T - Tmin) + intercept * numpy.log(T/Tmin))
+		shape = (-1,) + (1,) * T.ndim
+		S = numpy.where(index < 0, self.S298.reshape(shape), S)
+		S = numpy.where(index == len(ThermoGAData.CpTlist) - 1,
+			self.Slist[:,-1].reshape(shape) + self.Cp[:,-1].reshape(shape) * numpy.log(T / ThermoGAData.CpTlist[-1]), S)
+		return S
+
+	def getFreeEnergies(self, T):
+		"""
+		Return the Gibbs free energies in J/mol of each species at temperature
+		`T` in K.
+		"""
+		T = numpy.asarray(T, numpy.float64)
+		return self.getEnthalpies(T) - T * self.getEntropies(T)
+
+	def getFreeEnergiesOfReaction(self, T, stoichiometry):
+		"""
+		Return the Gibbs free energies of reaction in J/mol at temperature `T`
+		in K for each of the reactions in the stoichiometry matrix
+		`stoichiometry`, whose rows correspond to the species in the set and
+		whose columns correspond to the reactions, as returned by
+		:meth:`model.CoreEdgeReactionModel.getStoichiometryMatrix`. The matrix
+		may be either a dense array or a SciPy sparse matrix.
+		"""
+		return stoichiometry.T.dot(self.getFreeEnergies(T))
+
+################################################################################
+
 class ThermoNASAPolynomial(ThermoData):
 	"""
 	A single NASA polynomial for thermodynamic data. The `coeffs` attribute
@@ -607,6 +825,136 @@ class ThermoNASAData(ThermoData):
 
 ################################################################################
 
+class ThermoNASADataSet:
+	"""
+	A set of thermodynamic data given by NASA polynomials, such as that of all
+	of the species in a reaction model, stored as stacked arrays so that the
+	thermodynamic properties of every species can be evaluated at once. The
+	attributes are:
+
+	=============== ============================================================
+	Attribute       Description
+	=============== ============================================================
+	`thermoData`    The list of thermodynamic data objects in the set
+	--------------- ------------------------------------------------------------
+	`nasaIndices`   The indices of the :class:`ThermoNASAData` objects
+	`coeffs`        The coefficients of the polynomials of each of these,
+	                padded with zeros to a common number of polynomials
+	`Trange`        The minimum and maximum temperatures in K at which each of
+	                the polynomials is valid; padded entries are never valid
+	--------------- ------------------------------------------------------------
+	`otherIndices`  The indices of any other thermodynamic data objects, which
+	                are evaluated individually
+	=============== ============================================================
+
+	As in :meth:`ThermoNASAData.selectPolynomialForTemperature`, the first
+	polynomial of each species that is valid at a given temperature is used.
+	Each of the methods accepts either a single temperature or an array of
+	temperatures `T` in K, and returns an array whose first dimension runs
+	over the species in the set and whose remaining dimensions are those of
+	`T`.
+	"""
+
+	def __init__(self, thermoData):
+		self.thermoData = thermoData
+
+		self.nasaIndices = numpy.array([i for i, t in enumerate(thermoData) if isinstance(t, ThermoNASAData)], numpy.int32)
+		nasa = [thermoData[i] for i in self.nasaIndices]
+		numPolynomials = max([len(t.polynomials) for t in nasa] or [0])
+		self.coeffs = numpy.zeros((len(nasa), numPolynomials, 7), numpy.float64)
+		self.Trange = numpy.zeros((2, len(nasa), numPolynomials), numpy.float64)
+		self.Trange[0,:,:] = numpy.inf; self.Trange[1,:,:] = -numpy.inf
+		for i, t in enumerate(nasa):
+			for j, poly in enumerate(t.polynomials):
+				self.coeffs[i,j,:] = [poly.c0, poly.c1, poly.c2, poly.c3, poly.c4, poly.c5, poly.c6]
+				if poly.Tmin == 0 and poly.Tmax == 0:
+					self.Trange[:,i,j] = [-numpy.inf, numpy.inf]
+				else:
+					self.Trange[:,i,j] = [poly.Tmin, poly.Tmax]
+
+		self.otherIndices = [i for i, t in enumerate(thermoData) if not isinstance(t, ThermoNASAData)]
+
+	def __evaluate(self, T, method):
+		"""
+		Return an array of the thermodynamic quantity of each species given
+		by `method`, the name of the corresponding method of
+		:class:`ThermoNASAPolynomial`, at temperature `T` in K.
+		"""
+		T = numpy.asarray(T, numpy.float64)
+		Tlist = T.reshape(-1)
+		result = numpy.zeros((len(self.thermoData), len(Tlist)), numpy.float64)
+
+		if len(self.nasaIndices) > 0:
+			# Select the first valid polynomial of each species at each temperature
+			valid = (self.Trange[0,:,:,numpy.newaxis] <= Tlist) & (Tlist <= self.Trange[1,:,:,numpy.newaxis])
+			found = valid.any(axis=1)
+			if not found.all():
+				raise data.TemperatureOutOfRangeException("No polynomial found for T=%s" % Tlist[numpy.nonzero(~found)[1][0]])
+			poly = numpy.argmax(valid, axis=1)
+			c0, c1, c2, c3, c4, c5, c6 = self.coeffs[numpy.arange(len(self.nasaIndices))[:,numpy.newaxis],poly,:].transpose(2,0,1)
+
+			T2 = Tlist * Tlist
+			T4 = T2 * T2
+			if method == 'getHeatCapacity':
+				value = (c0 + Tlist*(c1 + Tlist*(c2 + Tlist*(c3 + c4*Tlist)))) * constants.R
+			else:
+				H = (c0*Tlist + c1*T2/2 + c2*T2*Tlist/3 + c3*T4/4 + c4*T4*Tlist/5 + c5) * constants.R
+				S = (c0*numpy.log(Tlist) + c1*Tlist + c2*T2/2 + c3*T2*Tlist/3 + c4*T4/4 + c6) * constants.R
+				if method == 'getEnthalpy': value = H
+				elif method == 'getEntropy': value = S
+				else: value = H - Tlist * S
+			result[self.nasaIndices,:] = value
+
+		for i in self.otherIndices:
+			function = getattr(self.thermoData[i], method)
+			result[i,:] = [function(t) for t in Tlist]
+
+		return result.reshape((len(self.thermoData),) + T.shape)
+
+	def getHeatCapacities(self, T):
+		"""
+		Return the constant-pressure heat capacities (Cp) in J/mol*K of each
+		species at temperature `T` in K.
+		"""
+		return self.__evaluate(T, 'getHeatCapacity')
+
+	def getEnthalpies(self, T):
+		"""
+		Return the enthalpies in J/mol of each species at temperature `T` in K.
+		"""
+		return self.__evaluate(T, 'getEnthalpy')
+
+	def getEntropies(self, T):
+		"""
+		Return the entropies in J/mol*K of each species at temperature `T` in K.
+		"""
+		return self.__evaluate(T, 'getEntropy')
+
+	def getFreeEnergies(self, T):
+		"""
+		Return the Gibbs free energies in J/mol of each species at temperature
+		`T` in K.
+		"""
+		return self.__evaluate(T, 'getFreeEnergy')
+
+	def getEnthalpiesOfReaction(self, T, stoichiometry):
+		"""
+		Return the enthalpies of reaction in J/mol at temperature `T` in K for
+		each of the reactions in the stoichiometry matrix `stoichiometry`, as
+		in :meth:`ThermoGADataSet.getFreeEnergiesOfReaction`.
+		"""
+		return stoichiometry.T.dot(self.getEnthalpies(T))
+
+	def getFreeEnergiesOfReaction(self, T, stoichiometry):
+		"""
+		Return the Gibbs free energies of reaction in J/mol at temperature `T`
+		in K for each of the reactions in the stoichiometry matrix
+		`stoichiometry`, as in :meth:`ThermoGADataSet.getFreeEnergiesOfReaction`.
+		"""
+		return stoichiometry.T.dot(self.getFreeEnergies(T))
+
+################################################################################
+
 #: The default temperature in K
 ThermoWilhoitDataB = 500.0
 
@@ -888,11 +1236,18 @@ def convertGAtoWilhoit(GAthermo, atoms, rotors, linear, fixedB=1, Bmin=300.0, Bm
 	
 	cf. Paul Yelvington's thesis, p. 185-186
 	"""
+	return convertGAtoWilhoitBatch([GAthermo], [atoms], [rotors], [linear], fixedB, Bmin, Bmax)[0]
+
+def convertGAtoWilhoitBatch(GAthermoList, atomsList, rotorsList, linearList, fixedB=1, Bmin=300.0, Bmax=6000.0):
+	"""Convert each of the Group Additivity thermo instances in `GAthermoList` into a Wilhoit thermo instance.
+	
+	This is equivalent to calling :func:`convertGAtoWilhoit` for each instance with the
+	corresponding entries of `atomsList`, `rotorsList` and `linearList`. If B is fixed,
+	the least squares fits of all of the instances are found at once using
+	:func:`GA2WilhoitBatch`; otherwise B is optimized for each instance in turn.
+	Returns a list of `ThermoWilhoitData` instances.
+	"""
 	
-	# get info from incoming group additivity thermo
-	H298 = GAthermo.H298
-	S298 = GAthermo.S298
-	Cp_list = GAthermo.Cp
 	T_list = ThermoGAData.CpTlist  # usually [300, 400, 500, 600, 800, 1000, 1500] but why assume?
 	R = constants.R
 	B = ThermoWilhoitDataB # Constant (if fixed=1), set once in the class def.
@@ -903,58 +1258,65 @@ def convertGAtoWilhoit(GAthermo, atoms, rotors, linear, fixedB=1, Bmin=300.0, Bm
 	Bmin=Bmin/1000.
 	Bmax=Bmax/1000.
 	
-	Cp_list = [x/R for x in Cp_list] # convert to Cp/R
+	Cp_lists = [[x/R for x in GAthermo.Cp] for GAthermo in GAthermoList] # convert to Cp/R
 	
-	(cp0, cpInf) = CpLimits(atoms, rotors, linear) # determine the heat capacity limits (non-dimensional)
+	# determine the heat capacity limits (non-dimensional)
+	limits = [CpLimits(atoms, rotors, linear) for atoms, rotors, linear in zip(atomsList, rotorsList, linearList)]
 	
-	if (cp0==cpInf):
-		a0=0.0
-		a1=0.0
-		a2=0.0
-		a3=0.0
-		resid = 0.0
-	elif(fixedB == 1):
-		(a0, a1, a2, a3, resid) = GA2Wilhoit(B, T_list, Cp_list, cp0, cpInf)		
+	if(fixedB == 1):
+		fits = [(a0, a1, a2, a3, B, resid) for a0, a1, a2, a3, resid in
+			GA2WilhoitBatch(B, T_list, Cp_lists, [cp0 for cp0, cpInf in limits], [cpInf for cp0, cpInf in limits])]
 	else:
-		(a0, a1, a2, a3, B, resid) = GA2Wilhoit_BOpt(T_list, Cp_list, cp0, cpInf, Bmin, Bmax)
+		fits = []
+		for Cp_list, (cp0, cpInf) in zip(Cp_lists, limits):
+			if (cp0==cpInf):
+				fits.append((0.0, 0.0, 0.0, 0.0, B, 0.0))
+			else:
+				fits.append(GA2Wilhoit_BOpt(T_list, Cp_list, cp0, cpInf, Bmin, Bmax))
 	m = len(T_list)
-	err = math.sqrt(resid/m) # gmagoon 1/19/10: this is a (probably) faster alternative to using rmsErrWilhoit, and it fits better within a scheme where we modify B
 
-	# scale everything back
-	T_list = [t*1000. for t in T_list]
-	B = B*1000.
-	Cp_list = [x*R for x in Cp_list]
-	
-	# cp0 and cpInf should be in units of J/mol-K
-	cp0 = cp0*R
-	cpInf = cpInf*R
-	
-	# output comment
-	comment = ''
-	
-	# first set H0 = S0 = 0, then calculate what they should be
-	# by referring to H298, S298
-	H0 = 0
-	S0 = 0
-	# create Wilhoit instance
-	WilhoitThermo = ThermoWilhoitData( cp0, cpInf, a0, a1, a2, a3, H0, S0, B=B, comment=comment)
-	# calculate correct I, J (integration constants for H, S, respectively)
-	H0 = H298 - WilhoitThermo.getEnthalpy(298.15)
-	S0 = S298 - WilhoitThermo.getEntropy(298.15)
-	# update Wilhoit instance with correct I,J
-	WilhoitThermo.H0 = H0
-	WilhoitThermo.S0 = S0
-
-	# calculate the correct err for the monoatomic case; there seems to be a bug in linalg.lstsq() where resid is incorrectly returned as [] when A matrix is all zeroes (this is also the reason for the check above for cp0==cpInf, where we set resid = 0)
-	if(cp0==cpInf):
-		err = WilhoitThermo.rmsErrWilhoit(T_list, Cp_list)/R #rms Error (J/mol-K units until it is divided by R)
-	WilhoitThermo.comment = WilhoitThermo.comment + 'Wilhoit function fitted to GA data with Cp0=%2g and Cp_inf=%2g. RMS error = %.3f*R. '%(cp0,cpInf,err) + GAthermo.comment
+	WilhoitList = []
+	for GAthermo, (cp0, cpInf), (a0, a1, a2, a3, Bfit, resid) in zip(GAthermoList, limits, fits):
 
-	#print a warning if the rms fit is worse that 0.25*R
-	if (err>0.25):
-		logging.warning("Poor GA-to-Wilhoit fit quality: RMS error = %.3f*R" % err)
+		err = math.sqrt(resid/m) # gmagoon 1/19/10: this is a (probably) faster alternative to using rmsErrWilhoit, and it fits better within a scheme where we modify B
+
+		# scale everything back
+		T_list_K = [t*1000. for t in T_list]
+		Bfit = Bfit*1000.
+		Cp_list = GAthermo.Cp
+		
+		# cp0 and cpInf should be in units of J/mol-K
+		cp0 = cp0*R
+		cpInf = cpInf*R
+		
+		# output comment
+		comment = ''
+		
+		# first set H0 = S0 = 0, then calculate what they should be
+		# by referring to H298, S298
+		H0 = 0
+		S0 = 0
+		# create Wilhoit instance
+		WilhoitThermo = ThermoWilhoitData( cp0, cpInf, a0, a1, a2, a3, H0, S0, B=Bfit, comment=comment)
+		# calculate correct I, J (integration constants for H, S, respectively)
+		H0 = GAthermo.H298 - WilhoitThermo.getEnthalpy(298.15)
+		S0 = GAthermo.S298 - WilhoitThermo.getEntropy(298.15)
+		# update Wilhoit instance with correct I,J
+		WilhoitThermo.H0 = H0
+		WilhoitThermo.S0 = S0
+
+		# calculate the correct err for the monoatomic case; there seems to be a bug in linalg.lstsq() where resid is incorrectly returned as [] when A matrix is all zeroes (this is also the reason for the check above for cp0==cpInf, where we set resid = 0)
+		if(cp0==cpInf):
+			err = WilhoitThermo.rmsErrWilhoit(T_list_K, Cp_list)/R #rms Error (J/mol-K units until it is divided by R)
+		WilhoitThermo.comment = WilhoitThermo.comment + 'Wilhoit function fitted to GA data with Cp0=%2g and Cp_inf=%2g. RMS error = %.3f*R. '%(cp0,cpInf,err) + GAthermo.comment
+
+		#print a warning if the rms fit is worse that 0.25*R
+		if (err>0.25):
+			logging.warning("Poor GA-to-Wilhoit fit quality: RMS error = %.3f*R" % err)
+		
+		WilhoitList.append(WilhoitThermo)
 	
-	return WilhoitThermo
+	return WilhoitList
 
 def GA2Wilhoit(B, T_list, Cp_list, cp0, cpInf):
 	#input: B (in kiloKelvin), GA temperature and Cp_list (non-dimensionalized), Wilhoit parameters, Cp0/R and CpInf/R
@@ -984,6 +1346,36 @@ def GA2Wilhoit(B, T_list, Cp_list, cp0, cpInf):
 	
 	return a0, a1, a2, a3, resid
 	
+def GA2WilhoitBatch(B, T_list, Cp_lists, cp0s, cpInfs):
+	#input: B (in kiloKelvin), GA temperature and a list of Cp_lists (non-dimensionalized), one per species, and lists of the Wilhoit parameters Cp0/R and CpInf/R of each species
+	#output: a list of the Wilhoit parameters a0-a3 and the sum of squared errors between Wilhoit and GA data for each species
+	#the least squares matrix of GA2Wilhoit is (cpInf-cp0) times a matrix that only depends on B and the temperatures, so all of the species can be fitted at once
+	if len(Cp_lists) == 0:
+		return []
+	m = len(T_list)
+	T = numpy.array(T_list)
+	y = T/(T+B)
+	A = numpy.zeros([m,4])
+	A[:,0] = y*y*(y-1)
+	A[:,1] = A[:,0] * y
+	A[:,2] = A[:,1] * y
+	A[:,3] = A[:,2] * y
+	cp0 = numpy.array(cp0s, numpy.float64)
+	cpInf = numpy.array(cpInfs, numpy.float64)
+	b = numpy.array(Cp_lists, numpy.float64).T - cp0 - numpy.outer(y*y, cpInf-cp0)
+
+	x = linalg.lstsq(A,b)[0]
+	resid = numpy.sum((numpy.dot(A,x) - b)**2, axis=0)
+
+	# monatomic species (cp0 == cpInf) have no fitted parameters
+	dCp = cpInf - cp0
+	nonzero = dCp != 0
+	x[:,nonzero] /= dCp[nonzero]
+	x[:,~nonzero] = 0.0
+	resid[~nonzero] = 0.0
+
+	return [(x[0,i], x[1,i], x[2,i], x[3,i], resid[i]) for i in range(len(Cp_lists))]
+	
 def GA2Wilhoit_BOpt(T_list, Cp_list, cp0, cpInf, Bmin, Bmax):
 	#input: GA temperature and Cp_list (scaled/non-dimensionalized), Wilhoit parameters, Cp0/R and CpInf/R, and maximum and minimum bounds for B (in kK)
 	#output: Wilhoit parameters, including optimized B value (in kK), and the sum of squared errors between Wilhoit and GA data (dimensionless)
@@ -1036,83 +1428,113 @@ def convertWilhoitToNASA(Wilhoit, fixed=1, weighting=1, tint=1000.0, Tmin = 298.
 	Returns a `ThermoNASAData` instance containing two `ThermoNASAPolynomial` 
 	polynomials
 	"""
+	return convertWilhoitToNASABatch([Wilhoit], fixed, weighting, tint, Tmin, Tmax, contCons)[0]
+
+def convertWilhoitToNASABatch(WilhoitList, fixed=1, weighting=1, tint=1000.0, Tmin = 298.0, Tmax=6000.0, contCons=3):
+	"""Convert each of the Wilhoit thermo instances in `WilhoitList` into a NASA polynomial thermo instance.
+	
+	This is equivalent to calling :func:`convertWilhoitToNASA` for each instance with
+	the same options. If tint is fixed, the least squares fits of all of the instances
+	are found at once using :func:`Wilhoit2NASABatch`; otherwise tint is optimized for
+	each instance in turn. Returns a list of `ThermoNASAData` instances.
+	"""
 	
 	# Scale the temperatures to kK
 	Tmin = Tmin/1000
 	tint = tint/1000
 	Tmax = Tmax/1000
 
-	# Make copy of Wilhoit data so we don't modify the original
-	wilhoit_scaled = ThermoWilhoitData(Wilhoit.cp0, Wilhoit.cpInf, Wilhoit.a0, Wilhoit.a1, Wilhoit.a2, Wilhoit.a3, Wilhoit.H0, Wilhoit.S0, Wilhoit.comment, B=Wilhoit.B)
-	# Rescale Wilhoit parameters
-	wilhoit_scaled.cp0 /= constants.R
-	wilhoit_scaled.cpInf /= constants.R
-	wilhoit_scaled.B /= 1000.
+	wilhoits_scaled = []
+	for Wilhoit in WilhoitList:
+		# Make copy of Wilhoit data so we don't modify the original
+		wilhoit_scaled = ThermoWilhoitData(Wilhoit.cp0, Wilhoit.cpInf, Wilhoit.a0, Wilhoit.a1, Wilhoit.a2, Wilhoit.a3, Wilhoit.H0, Wilhoit.S0, Wilhoit.comment, B=Wilhoit.B)
+		# Rescale Wilhoit parameters
+		wilhoit_scaled.cp0 /= constants.R
+		wilhoit_scaled.cpInf /= constants.R
+		wilhoit_scaled.B /= 1000.
+		wilhoits_scaled.append(wilhoit_scaled)
 	
 	#if we are using fixed tint, do not allow tint to float
 	if(fixed == 1):
-		nasa_low, nasa_high = Wilhoit2NASA(wilhoit_scaled, Tmin, Tmax, tint, weighting, contCons)
+		tints = [tint for wilhoit_scaled in wilhoits_scaled]
+		polynomials = Wilhoit2NASABatch(wilhoits_scaled, Tmin, Tmax, tint, weighting, contCons)
+		#the unweighted fits are also needed to evaluate the unweighted error
+		if(weighting == 1):
+			unweighted = Wilhoit2NASABatch(wilhoits_scaled, Tmin, Tmax, tint, 0, contCons)
+		else:
+			unweighted = polynomials
 	else:
-		nasa_low, nasa_high, tint = Wilhoit2NASA_TintOpt(wilhoit_scaled, Tmin, Tmax, weighting, contCons)
-	iseUnw = TintOpt_objFun(tint, wilhoit_scaled, Tmin, Tmax, 0, contCons) #the scaled, unweighted ISE (integral of squared error)
-	rmsUnw = math.sqrt(iseUnw/(Tmax-Tmin))
-	rmsStr = '(Unweighted) RMS error = %.3f*R;'%(rmsUnw)
-	if(weighting == 1):
-		iseWei= TintOpt_objFun(tint, wilhoit_scaled, Tmin, Tmax, weighting, contCons) #the scaled, weighted ISE
-		rmsWei = math.sqrt(iseWei/math.log(Tmax/Tmin))
-		rmsStr = 'Weighted RMS error = %.3f*R;'%(rmsWei)+rmsStr
-
-	#print a warning if the rms fit is worse that 0.25*R
-	if(rmsUnw > 0.25 or rmsWei > 0.25):
-		logging.warning("Poor Wilhoit-to-NASA fit quality: RMS error = %.3f*R" % (rmsWei if weighting == 1 else rmsUnw))
+		tints = []; polynomials = []; unweighted = []
+		for wilhoit_scaled in wilhoits_scaled:
+			nasa_low, nasa_high, tint_opt = Wilhoit2NASA_TintOpt(wilhoit_scaled, Tmin, Tmax, weighting, contCons)
+			tints.append(tint_opt)
+			polynomials.append((nasa_low, nasa_high))
+			unweighted.append(None if weighting == 1 else (nasa_low, nasa_high))
+
+	NASAthermoList = []
+	for Wilhoit, wilhoit_scaled, tint, (nasa_low, nasa_high), unw in zip(WilhoitList, wilhoits_scaled, tints, polynomials, unweighted):
+
+		iseUnw = TintOpt_objFun(tint, wilhoit_scaled, Tmin, Tmax, 0, contCons, unw) #the scaled, unweighted ISE (integral of squared error)
+		rmsUnw = math.sqrt(iseUnw/(Tmax-Tmin))
+		rmsStr = '(Unweighted) RMS error = %.3f*R;'%(rmsUnw)
+		if(weighting == 1):
+			iseWei= TintOpt_objFun(tint, wilhoit_scaled, Tmin, Tmax, weighting, contCons, (nasa_low, nasa_high)) #the scaled, weighted ISE
+			rmsWei = math.sqrt(iseWei/math.log(Tmax/Tmin))
+			rmsStr = 'Weighted RMS error = %.3f*R;'%(rmsWei)+rmsStr
+
+		#print a warning if the rms fit is worse that 0.25*R
+		if(rmsUnw > 0.25 or (weighting == 1 and rmsWei > 0.25)):
+			logging.warning("Poor Wilhoit-to-NASA fit quality: RMS error = %.3f*R" % (rmsWei if weighting == 1 else rmsUnw))
+			
+		#restore to conventional units of K for Tint and units based on K rather than kK in NASA polynomial coefficients
+		tint=tint*1000.
+		Tmin_K = Tmin*1000
+		Tmax_K = Tmax*1000
 		
-	#restore to conventional units of K for Tint and units based on K rather than kK in NASA polynomial coefficients
-	tint=tint*1000.
-	Tmin = Tmin*1000
-	Tmax = Tmax*1000
-	
-	nasa_low.c1 /= 1000.
-	nasa_low.c2 /= 1000000.
-	nasa_low.c3 /= 1000000000.
-	nasa_low.c4 /= 1000000000000.
-	
-	nasa_high.c1 /= 1000.
-	nasa_high.c2 /= 1000000.
-	nasa_high.c3 /= 1000000000.
-	nasa_high.c4 /= 1000000000000.
-	
-	# output comment
-	comment = 'NASA function fitted to Wilhoit function. ' + rmsStr + Wilhoit.comment
-	nasa_low.Trange = (Tmin,tint); nasa_low.Tmin = Tmin; nasa_low.Tmax = tint
-	nasa_low.comment = 'Low temperature range polynomial'
-	nasa_high.Trange = (tint,Tmax); nasa_high.Tmin = tint; nasa_high.Tmax = Tmax
-	nasa_high.comment = 'High temperature range polynomial'
-	
-	#for the low polynomial, we want the results to match the Wilhoit value at 298.15K
-	#low polynomial enthalpy:
-	Hlow = (Wilhoit.getEnthalpy(298.15) - nasa_low.getEnthalpy(298.15))/constants.R
-	###polynomial_low.coeffs[5] = (Wilhoit.getEnthalpy(298.15) - polynomial_low.getEnthalpy(298.15))/constants.R
-	#low polynomial entropy:
-	Slow = (Wilhoit.getEntropy(298.15) - nasa_low.getEntropy(298.15))/constants.R
-	###polynomial_low.coeffs[6] = (Wilhoit.getEntropy(298.15) - polynomial_low.getEntropy(298.15))/constants.R
-	
-	# update last two coefficients
-	nasa_low.c5 = Hlow
-	nasa_low.c6 = Slow
-	
-	#for the high polynomial, we want the results to match the low polynomial value at tint
-	#high polynomial enthalpy:
-	Hhigh = (nasa_low.getEnthalpy(tint) - nasa_high.getEnthalpy(tint))/constants.R
-	#high polynomial entropy:
-	Shigh = (nasa_low.getEntropy(tint) - nasa_high.getEntropy(tint))/constants.R
-	
-	# update last two coefficients
-	#polynomial_high.coeffs = (b6,b7,b8,b9,b10,Hhigh,Shigh)
-	nasa_high.c5 = Hhigh
-	nasa_high.c6 = Shigh
-	
-	NASAthermo = ThermoNASAData( Trange=(Tmin,Tmax), polynomials=[nasa_low,nasa_high], comment=comment)
-	return NASAthermo
+		nasa_low.c1 /= 1000.
+		nasa_low.c2 /= 1000000.
+		nasa_low.c3 /= 1000000000.
+		nasa_low.c4 /= 1000000000000.
+		
+		nasa_high.c1 /= 1000.
+		nasa_high.c2 /= 1000000.
+		nasa_high.c3 /= 1000000000.
+		nasa_high.c4 /= 1000000000000.
+		
+		# output comment
+		comment = 'NASA function fitted to Wilhoit function. ' + rmsStr + Wilhoit.comment
+		nasa_low.Trange = (Tmin_K,tint); nasa_low.Tmin = Tmin_K; nasa_low.Tmax = tint
+		nasa_low.comment = 'Low temperature range polynomial'
+		nasa_high.Trange = (tint,Tmax_K); nasa_high.Tmin = tint; nasa_high.Tmax = Tmax_K
+		nasa_high.comment = 'High temperature range polynomial'
+		
+		#for the low polynomial, we want the results to match the Wilhoit value at 298.15K
+		#low polynomial enthalpy:
+		Hlow = (Wilhoit.getEnthalpy(298.15) - nasa_low.getEnthalpy(298.15))/constants.R
+		###polynomial_low.coeffs[5] = (Wilhoit.getEnthalpy(298.15) - polynomial_low.getEnthalpy(298.15))/constants.R
+		#low polynomial entropy:
+		Slow = (Wilhoit.getEntropy(298.15) - nasa_low.getEntropy(298.15))/constants.R
+		###polynomial_low.coeffs[6] = (Wilhoit.getEntropy(298.15) - polynomial_low.getEntropy(298.15))/constants.R
+		
+		# update last two coefficients
+		nasa_low.c5 = Hlow
+		nasa_low.c6 = Slow
+		
+		#for the high polynomial, we want the results to match the low polynomial value at tint
+		#high polynomial enthalpy:
+		Hhigh = (nasa_low.getEnthalpy(tint) - nasa_high.getEnthalpy(tint))/constants.R
+		#high polynomial entropy:
+		Shigh = (nasa_low.getEntropy(tint) - nasa_high.getEntropy(tint))/constants.R
+		
+		# update last two coefficients
+		#polynomial_high.coeffs = (b6,b7,b8,b9,b10,Hhigh,Shigh)
+		nasa_high.c5 = Hhigh
+		nasa_high.c6 = Shigh
+		
+		NASAthermo = ThermoNASAData( Trange=(Tmin_K,Tmax_K), polynomials=[nasa_low,nasa_high], comment=comment)
+		NASAthermoList.append(NASAthermo)
+
+	return NASAthermoList
 
 ################################################################################
 
@@ -1133,9 +1555,52 @@ def Wilhoit2NASA(wilhoit, tmin, tmax, tint, weighting, contCons):
 		    note: 5th (and higher) derivatives of NASA Cp(T) are zero and hence will automatically be continuous at tint by the form of the Cp(T) function
 	output: NASA polynomials (nasa_low, nasa_high) with scaled parameters
 	"""
+	A = Wilhoit2NASAMatrix(tmin, tmax, tint, weighting, contCons)
+	b = Wilhoit2NASAVector(wilhoit, tmin, tmax, tint, weighting, contCons)
+
+	# solve A*x=b for x (note that factor of 2 in b vector and 10*10 submatrix of A
+	# matrix is not required; not including it should give same result, except
+	# Lagrange multipliers will differ by a factor of two)
+	x = linalg.solve(A,b,overwrite_a=1,overwrite_b=1)
+
+	nasa_low = ThermoNASAPolynomial(T_range=(0,0), coeffs=[x[0], x[1], x[2], x[3], x[4], 0.0, 0.0], comment='')
+	nasa_high = ThermoNASAPolynomial(T_range=(0,0), coeffs=[x[5], x[6], x[7], x[8], x[9], 0.0, 0.0], comment='')
+
+	return nasa_low, nasa_high
+
+def Wilhoit2NASABatch(wilhoits, tmin, tmax, tint, weighting, contCons):
+	"""
+	Fit NASA polynomials to each of the Wilhoit functions in the list
+	`wilhoits` as in :func:`Wilhoit2NASA`. The least squares matrix depends
+	only on the temperatures `tmin`, `tmax`, and `tint` and the fitting
+	options, so all of the fits are found from a single solve with one
+	right-hand side per Wilhoit function. Returns a list of the (nasa_low,
+	nasa_high) polynomials with scaled parameters.
+	"""
+	if len(wilhoits) == 0:
+		return []
+	A = Wilhoit2NASAMatrix(tmin, tmax, tint, weighting, contCons)
+	b = scipy.zeros([10+contCons, len(wilhoits)])
+	for i, wilhoit in enumerate(wilhoits):
+		b[:,i] = Wilhoit2NASAVector(wilhoit, tmin, tmax, tint, weighting, contCons)
+
+	x = linalg.solve(A,b,overwrite_a=1,overwrite_b=1)
+
+	polynomials = []
+	for i in range(len(wilhoits)):
+		nasa_low = ThermoNASAPolynomial(T_range=(0,0), coeffs=[x[0,i], x[1,i], x[2,i], x[3,i], x[4,i], 0.0, 0.0], comment='')
+		nasa_high = ThermoNASAPolynomial(T_range=(0,0), coeffs=[x[5,i], x[6,i], x[7,i], x[8,i], x[9,i], 0.0, 0.0], comment='')
+		polynomials.append((nasa_low, nasa_high))
+	return polynomials
+
+def Wilhoit2NASAMatrix(tmin, tmax, tint, weighting, contCons):
+	"""
+	Return the (typically 13*13) symmetric matrix A of the linear system
+	A*x = b solved by :func:`Wilhoit2NASA`, which does not depend on the
+	Wilhoit parameters. The temperatures are in kiloKelvin.
+	"""
 	#construct (typically 13*13) symmetric A matrix (in A*x = b); other elements will be zero
 	A = scipy.zeros([10+contCons,10+contCons])
-	b = scipy.zeros([10+contCons])
 
 	if weighting:
 		A[0,0] = 2*math.log(tint/tmin)
@@ -1232,7 +1697,16 @@ def Wilhoit2NASA(wilhoit, tmin, tmax, tint, weighting, contCons):
 		for j in range(0, i):
 			A[i,j] = A[j,i]
 
-	#construct b vector
+	return A
+
+def Wilhoit2NASAVector(wilhoit, tmin, tmax, tint, weighting, contCons):
+	"""
+	Return the vector b of the linear system A*x = b solved by
+	:func:`Wilhoit2NASA` for the scaled Wilhoit function `wilhoit`. The
+	temperatures are in kiloKelvin.
+	"""
+	b = scipy.zeros([10+contCons])
+
 	w0int = wilhoit.integral_T0(tint)
 	w1int = wilhoit.integral_T1(tint)
 	w2int = wilhoit.integral_T2(tint)
@@ -1277,16 +1751,8 @@ def Wilhoit2NASA(wilhoit, tmin, tmax, tint, weighting, contCons):
 		b[8] = 2*(w3max - w3int)
 		b[9] = 2*(w4max - w4int)
 
-	# solve A*x=b for x (note that factor of 2 in b vector and 10*10 submatrix of A
-	# matrix is not required; not including it should give same result, except
-	# Lagrange multipliers will differ by a factor of two)
-	x = linalg.solve(A,b,overwrite_a=1,overwrite_b=1)
-
-	nasa_low = ThermoNASAPolynomial(T_range=(0,0), coeffs=[x[0], x[1], x[2], x[3], x[4], 0.0, 0.0], comment='')
-	nasa_high = ThermoNASAPolynomial(T_range=(0,0), coeffs=[x[5], x[6], x[7], x[8], x[9], 0.0, 0.0], comment='')
+	return b
 
-	return nasa_low, nasa_high
-	
 def Wilhoit2NASA_TintOpt(wilhoit, tmin, tmax, weighting, contCons):
 	#input: Wilhoit parameters, Cp0/R, CpInf/R, and B (kK), a0, a1, a2, a3, Tmin (minimum temperature (in kiloKelvin), Tmax (maximum temperature (in kiloKelvin)
 	#output: NASA parameters for Cp/R, b1, b2, b3, b4, b5 (low temp parameters) and b6, b7, b8, b9, b10 (high temp parameters), and Tint
@@ -1298,13 +1764,14 @@ def Wilhoit2NASA_TintOpt(wilhoit, tmin, tmax, weighting, contCons):
 	(nasa1, nasa2) = Wilhoit2NASA(wilhoit, tmin, tmax, tint[0] ,weighting, contCons)
 	return nasa1, nasa2, tint[0]
 
-def TintOpt_objFun(tint, wilhoit, tmin, tmax, weighting, contCons):
+def TintOpt_objFun(tint, wilhoit, tmin, tmax, weighting, contCons, polynomials=None):
 	#input: Tint (intermediate temperature, in kiloKelvin); Wilhoit parameters, Cp0/R, CpInf/R, and B (kK), a0, a1, a2, a3, Tmin (minimum temperature (in kiloKelvin), Tmax (maximum temperature (in kiloKelvin)
+	#       polynomials (optional): the (nasa_low, nasa_high) polynomials fitted with the same weighting, if already known
 	#output: the quantity Integrate[(Cp(Wilhoit)/R-Cp(NASA)/R)^2, {t, tmin, tmax}]
 	if (weighting == 1):
-		result = TintOpt_objFun_W(tint, wilhoit, tmin, tmax, contCons)
+		result = TintOpt_objFun_W(tint, wilhoit, tmin, tmax, contCons, polynomials)
 	else:
-		result = TintOpt_objFun_NW(tint, wilhoit, tmin, tmax, contCons)
+		result = TintOpt_objFun_NW(tint, wilhoit, tmin, tmax, contCons, polynomials)
 
 	# numerical errors could accumulate to give a slightly negative result
 	# this is unphysical (it's the integral of a *squared* error) so we
@@ -1323,7 +1790,7 @@ def TintOpt_objFun(tint, wilhoit, tmin, tmax, weighting, contCons):
 
 	return result
 
-def TintOpt_objFun_NW(tint, wilhoit, tmin, tmax, contCons):
+def TintOpt_objFun_NW(tint, wilhoit, tmin, tmax, contCons, polynomials=None):
 	"""
 	Evaluate the objective function - the integral of the square of the error in the fit.
 	
@@ -1331,9 +1798,12 @@ def TintOpt_objFun_NW(tint, wilhoit, tmin, tmax, contCons):
 			Wilhoit parameters, Cp0/R, CpInf/R, and B (kK), a0, a1, a2, a3, 
 			Tmin (minimum temperature (in kiloKelvin), 
 			Tmax (maximum temperature (in kiloKelvin)
+			polynomials (optional): the unweighted (nasa_low, nasa_high) fit, if already known
 	output: the quantity Integrate[(Cp(Wilhoit)/R-Cp(NASA)/R)^2, {t, tmin, tmax}]
 	"""
-	nasa_low, nasa_high = Wilhoit2NASA(wilhoit,tmin,tmax,tint, 0, contCons)
+	if polynomials is None:
+		polynomials = Wilhoit2NASA(wilhoit,tmin,tmax,tint, 0, contCons)
+	nasa_low, nasa_high = polynomials
 	b1, b2, b3, b4, b5 = nasa_low.c0, nasa_low.c1, nasa_low.c2, nasa_low.c3, nasa_low.c4
 	b6, b7, b8, b9, b10 = nasa_high.c0, nasa_high.c1, nasa_high.c2, nasa_high.c3, nasa_high.c4
 
@@ -1352,7 +1822,7 @@ def TintOpt_objFun_NW(tint, wilhoit, tmin, tmax, contCons):
 
 	return result
 
-def TintOpt_objFun_W(tint, wilhoit, tmin, tmax, contCons):
+def TintOpt_objFun_W(tint, wilhoit, tmin, tmax, contCons, polynomials=None):
 	"""
 	Evaluate the objective function - the integral of the square of the error in the fit.
 	
@@ -1361,9 +1831,12 @@ def TintOpt_objFun_W(tint, wilhoit, tmin, tmax, contCons):
 			Wilhoit parameters: Cp0/R, CpInf/R, and B (kK), a0, a1, a2, a3, 
 			Tmin (minimum temperature (in kiloKelvin), 
 			Tmax (maximum temperature (in kiloKelvin)
+			polynomials (optional): the weighted (nasa_low, nasa_high) fit, if already known
 	output: the quantity Integrate[1/t*(Cp(Wilhoit)/R-Cp(NASA)/R)^2, {t, tmin, tmax}]
 	"""
-	nasa_low, nasa_high = Wilhoit2NASA(wilhoit,tmin,tmax,tint, 1, contCons)
+	if polynomials is None:
+		polynomials = Wilhoit2NASA(wilhoit,tmin,tmax,tint, 1, contCons)
+	nasa_low, nasa_high = polynomials
 	b1, b2, b3, b4, b5 = nasa_low.c0, nasa_low.c1, nasa_low.c2, nasa_low.c3, nasa_low.c4
 	b6, b7, b8, b9, b10 = nasa_high.c0, nasa_high.c1, nasa_high.c2, nasa_high.c3, nasa_high.c4
 
@@ -0,0 +1,121 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#	RMG - Reaction Mechanism Generator
+#
+#	Copyright (c) 2002-2009 Prof. William H. Green (whgreen@mit.edu) and the
+#	RMG Team (rmg_dev@mit.edu)
+#
+#	Permission is hereby granted, free of charge, to any person obtaining a
+#	copy of this software and associated documentation files (the 'Software'),
+#	to deal in the Software without restriction, including without limitation
+#	the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#	and/or sell copies of the Software, and to permit persons to whom the
+#	Software is furnished to do so, subject to the following conditions:
+#
+#	The above copyright notice and this permission notice shall be included in
+#	all copies or substantial portions of the Software.
+#
+#	THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#	IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#	FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#	AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#	LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#	FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#	DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+"""
+Contains functions for low-overhead timing of the phases of RMG execution
+(database loading, simulation, model enlargement, pressure-dependent network
+updates, and so on). Each phase is bracketed by calls to :func:`start` and
+:func:`stop`; phases may be nested, in which case the time spent in the inner
+phase is excluded from that of the outer phase, so that the recorded times
+of all phases sum to the total time spent in instrumented code. The times are
+accumulated until :func:`save` is called at the end of each iteration of the
+main RMG loop, at which point they are appended to a machine-readable
+comma-separated file (with columns for the iteration, phase, and time in
+seconds) and reset.
+
+The recognized phases are:
+
+======================= ========================================================
+Phase                   Description
+======================= ========================================================
+``database``            Loading of the thermo, kinetics, and frequency databases
+``simulate``            Simulation of a reaction system (one phase per system,
+                        labeled ``simulate 1``, ``simulate 2``, etc., unless
+                        the systems are simulated in parallel)
+``enlarge``             Model enlargement not accounted for by the phases below
+``templateMatching``    Matching of reactant structures to family templates
+``recipeApplication``   Application of family recipes to generate products
+``speciesDedup``        Identification of existing species for new structures
+``thermoEstimation``    Estimation of thermodynamic data for new species
+``kineticsLookup``      Selection of kinetics for new reactions
+``networkUpdate``       Updating of pressure-dependent reaction networks
+``restartSave``         Saving of the restart file
+======================= ========================================================
+
+"""
+
+import time
+
+import log as logging
+
+################################################################################
+
+# The accumulated time spent in each phase since the last save
+phaseTimes = {}
+
+# The stack of phases currently being timed; each item is a list containing the
+# phase name, its start time, and the time spent in nested phases
+phaseStack = []
+
+def start(phase):
+	"""
+	Start timing the phase labeled `phase`. Every call to this function must
+	be matched by a subsequent call to :func:`stop`.
+	"""
+	phaseStack.append([phase, time.time(), 0.0])
+
+def stop():
+	"""
+	Stop timing the most recently started phase, adding the time spent in
+	that phase (excluding any nested phases) to its total.
+	"""
+	phase, startTime, nestedTime = phaseStack.pop()
+	elapsed = time.time() - startTime
+	phaseTimes[phase] = phaseTimes.get(phase, 0.0) + elapsed - nestedTime
+	if len(phaseStack) > 0:
+		phaseStack[-1][2] += elapsed
+
+def reset():
+	"""
+	Discard all accumulated phase times.
+	"""
+	phaseTimes.clear()
+
+def save(path, iteration):
+	"""
+	Append the accumulated phase times to the comma-separated file at `path`,
+	labeling each with the iteration number `iteration`, then reset the times.
+	The file is created (with a header) when `iteration` is zero.
+	"""
+
+	if iteration == 0: f = open(path, 'w')
+	else: f = open(path, 'a')
+	if iteration == 0:
+		f.write('Iteration,Phase,Time (s)\n')
+	phases = phaseTimes.keys()
+	phases.sort()
+	for phase in phases:
+		f.write('%i,%s,%.6f\n' % (iteration, phase, phaseTimes[phase]))
+		logging.debug('Time spent in phase %s: %.3f s' % (phase, phaseTimes[phase]))
+	f.close()
+
+	reset()
+
+################################################################################
@@ -0,0 +1,249 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#	RMG - Reaction Mechanism Generator
+#
+#	Copyright (c) 2002-2009 Prof. William H. Green (whgreen@mit.edu) and the
+#	RMG Team (rmg_dev@mit.edu)
+#
+#	Permission is hereby granted, free of charge, to any person obtaining a
+#	copy of this software and associated documentation files (the 'Software'),
+#	to deal in the Software without restriction, including without limitation
+#	the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#	and/or sell copies of the Software, and to permit persons to whom the
+#	Software is furnished to do so, subject to the following conditions:
+#
+#	The above copyright notice and this permission notice shall be included in
+#	all copies or substantial portions of the Software.
+#
+#	THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#	IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#	FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#	AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#	LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#	FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#	DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+"""
+Contains functions for applying the reservoir state method using collision
+matrices in banded storage. The single exponential down model of collisional
+energy transfer gives a negligible transfer probability between energy grains
+more than sixteen times the average energy transferred in a deactivating
+collision apart, so each collision matrix only has entries within a fixed
+half bandwidth of its diagonal. Storing just these diagonals requires memory
+proportional to the number of grains rather than its square, which allows
+large networks to be studied using fine energy grains.
+
+A collision matrix `Mcoll` with half bandwidth `hb` and `nGrains` energy grains
+is stored as an array of shape ``[2*hb+1, nGrains]``, with the element in row
+`r` and column `s` of the full matrix found at ``Mcoll[hb+r-s, s]``; this is
+the layout used by LAPACK and :func:`scipy.linalg.solve_banded`. The functions
+reproduce the calculations of the corresponding subroutines in the
+``mastereqn`` and ``rs`` Fortran modules, and return an error message in the
+same manner, which is empty if the calculation was successful. The only
+intended difference is that the gas law constant is evaluated in double
+precision throughout, so the rate coefficients agree with those from the
+Fortran modules to within about one part in a million.
+"""
+
+import math
+import numpy
+
+import rmg.constants as constants
+
+################################################################################
+
+def getHalfBandwidth(Elist, dEdown):
+	"""
+	Return the number of energy grains in `Elist` (in J/mol) on either side of
+	the diagonal of the collision matrix that can have nonzero entries for a
+	bath gas with average energy transferred in a deactivating collision of
+	`dEdown` in J/mol.
+	"""
+	dE = Elist[1] - Elist[0]
+	return min(int(math.ceil(16 * dEdown / dE)), len(Elist) - 1)
+
+def bandedDot(Mcoll, x):
+	"""
+	Return the product of the collision matrix `Mcoll` in banded storage with
+	the vector or matrix `x`, whose first dimension runs over energy grains.
+	"""
+	nGrains = Mcoll.shape[1]
+	halfbandwidth = (Mcoll.shape[0] - 1) / 2
+	y = numpy.zeros(x.shape, numpy.float64)
+	for k in range(Mcoll.shape[0]):
+		# Entries of this diagonal have row r = s + d for column s
+		d = k - halfbandwidth
+		s0 = max(-d, 0); s1 = nGrains - max(d, 0)
+		if x.ndim == 1:
+			y[s0+d:s1+d] += Mcoll[k,s0:s1] * x[s0:s1]
+		else:
+			y[s0+d:s1+d] += Mcoll[k,s0:s1,numpy.newaxis] * x[s0:s1]
+	return y
+
+################################################################################
+
+def collisionMatrix(T, Elist, collFreq, densStates, E0, dEdown):
+	"""
+	Construct the collision matrix in banded storage for an isomer with
+	density of states `densStates` and ground-state energy `E0` in J/mol at
+	temperature `T` in K, using the single exponential down model with
+	parameter `dEdown` in J/mol and the energy grains `Elist` in J/mol. The
+	matrix is scaled by the collision frequency `collFreq` in Hz. Returns the
+	matrix and an error message.
+	"""
+
+	nGrains = len(Elist)
+	halfbandwidth = getHalfBandwidth(Elist, dEdown)
+	Mcoll = numpy.zeros([2*halfbandwidth+1, nGrains], numpy.float64)
+
+	# Determine the first grain with a nonzero density of states
+	indices = numpy.flatnonzero(densStates > 0)
+	if len(indices) == 0:
+		return Mcoll, 'Unable to determine starting energy grain.'
+	start = indices[0]
+
+	# Unnormalized transfer probabilities from grain s (column) to grain r
+	# (row), for which detailed balance gives the upward transitions
+	nBands = 2 * halfbandwidth + 1
+	s = numpy.arange(nGrains)[numpy.newaxis,:].repeat(nBands, axis=0)
+	r = s + numpy.arange(-halfbandwidth, halfbandwidth+1)[:,numpy.newaxis]
+	valid = (s >= start) & (r >= start) & (r < nGrains)
+	r[~valid] = s[~valid]
+	valid &= (Elist[r] >= E0) & (Elist[s] >= E0) & (densStates[s] != 0)
+	down = valid & (r <= s)
+	up = valid & (r > s)
+	Mcoll[down] = numpy.exp(-(Elist[s[down]] - Elist[r[down]]) / dEdown)
+	dE = Elist[r[up]] - Elist[s[up]]
+	Mcoll[up] = numpy.exp(-dE / dEdown) * densStates[r[up]] / densStates[s[up]] * numpy.exp(-dE / (constants.R * T))
+
+	# Normalization coefficients, chosen so that each column sums to unity;
+	# each depends on those of the lower grains, as the entries above the
+	# diagonal in each column are scaled by the coefficient of their row
+	C = numpy.zeros([nGrains + halfbandwidth], numpy.float64)
+	for s in range(start, nGrains):
+		value = (1 - numpy.dot(C[s:s+halfbandwidth], Mcoll[0:halfbandwidth,s])) / numpy.sum(Mcoll[halfbandwidth:,s])
+		if not value > 0:
+			return Mcoll, 'Error normalizing collisional transfer probabilities matrix.'
+		C[s+halfbandwidth] = value
+	C = C[halfbandwidth:]
+
+	# Entries above the diagonal are scaled by the coefficient of their row,
+	# and those on or below it by the coefficient of their column
+	for k in range(nBands):
+		d = k - halfbandwidth
+		if d < 0:
+			Mcoll[k,-d:] *= C[0:nGrains+d]
+		else:
+			Mcoll[k,:] *= C
+	Mcoll[halfbandwidth,start:] -= 1
+
+	return collFreq * Mcoll, ''
+
+################################################################################
+
+def reservoirCutoffs(E0, Eres, Elist, dEdown):
+	"""
+	Return the number of energy grains in `Elist` in J/mol in the reservoir of
+	each isomer, given the ground-state energies `E0` and active-state energies
+	`Eres` of the isomers in J/mol.
+	"""
+	Emin = numpy.min(Elist)
+	dE = Elist[1] - Elist[0]
+	nRes = numpy.zeros([len(E0)], numpy.int32)
+	for i in range(len(E0)):
+		nRes[i] = int(math.ceil((Eres[i] - 10 * dEdown - Emin) / dE))
+		start = int(math.ceil((E0[i] - Emin) / dE))
+		if nRes[i] < start:
+			nRes[i] = int(math.ceil((Eres[i] - Emin) / dE)) - 4
+			if nRes[i] < start:
+				nRes[i] = start + 4
+	return nRes
+
+def estimateRateCoefficients_RS(T, P, Elist, Mcoll, densStates, E0, Eres, Kij, Fim, Gnj, dEdown, nIsom, nProd, nGrains):
+	"""
+	Estimate the phenomenological rate coefficients at temperature `T` in K
+	and pressure `P` in Pa using the reservoir state method. The collision
+	matrices `Mcoll` of the isomers are given in banded storage as an array of
+	shape ``[nIsom, 2*hb+1, nGrains]``; the other parameters are the same as
+	for the ``rs`` Fortran module. The steady-state populations of the active
+	grains are found by solving a banded linear system, with the grains
+	ordered first by energy and then by isomer so that the combined half
+	bandwidth is `nIsom` times that of the collision matrices. Returns the
+	rate coefficient matrix and an error message.
+	"""
+
+	import scipy.linalg
+
+	K = numpy.zeros([nIsom+nProd, nIsom+nProd], numpy.float64)
+
+	halfbandwidth = (Mcoll.shape[1] - 1) / 2
+
+	# Determine the reservoir and active grains of each isomer
+	nRes = reservoirCutoffs(E0[0:nIsom], Eres, Elist, dEdown)
+	active = numpy.arange(nGrains)[:,numpy.newaxis] >= nRes[numpy.newaxis,:]
+	indices = numpy.cumsum(active.reshape(-1)).reshape(nGrains, nIsom) - 1
+	indices[~active] = -1
+	nAct = numpy.sum(active)
+
+	# Construct the active-state matrix in banded storage
+	bandwidth = halfbandwidth * nIsom
+	L = numpy.zeros([2*bandwidth+1, nAct], numpy.float64)
+	Z = numpy.zeros([nAct, nIsom+nProd], numpy.float64)
+	boltzmann = numpy.exp(-Elist / constants.R / T)
+	nBands = 2 * halfbandwidth + 1
+	for i in range(nIsom):
+		s = numpy.arange(nRes[i], nGrains)[numpy.newaxis,:].repeat(nBands, axis=0)
+		k = numpy.arange(nBands)[:,numpy.newaxis].repeat(s.shape[1], axis=1)
+		r = s + k - halfbandwidth
+		valid = (r >= nRes[i]) & (r < nGrains)
+		r = r[valid]; s = s[valid]; k = k[valid]
+		L[bandwidth + indices[r,i] - indices[s,i], indices[s,i]] = Mcoll[i,k,s]
+		# Collisional activation from the reservoir at equilibrium
+		dist = densStates[i,:] * boltzmann
+		dist[nRes[i]:] = 0
+		Z[indices[nRes[i]:,i], i] = bandedDot(Mcoll[i], dist)[nRes[i]:]
+	for i in range(nIsom):
+		for j in range(i):
+			r = numpy.arange(max(nRes[i], nRes[j]), nGrains)
+			L[bandwidth + indices[r,i] - indices[r,j], indices[r,j]] = Kij[i,j,r]
+			L[bandwidth, indices[r,j]] -= Kij[i,j,r]
+			L[bandwidth + indices[r,j] - indices[r,i], indices[r,i]] = Kij[j,i,r]
+			L[bandwidth, indices[r,i]] -= Kij[j,i,r]
+	for i in range(nIsom):
+		for n in range(nProd):
+			r = numpy.arange(nRes[i], nGrains)
+			L[bandwidth, indices[r,i]] -= Gnj[n,i,r]
+			Z[indices[r,i], n+nIsom] = Fim[i,n,r]
+	Z = -Z
+
+	# Solve for the steady-state populations of the active grains
+	try:
+		Z = scipy.linalg.solve_banded((bandwidth, bandwidth), L, Z, overwrite_ab=True, overwrite_b=True)
+	except (numpy.linalg.LinAlgError, ValueError):
+		return K, 'Active-state matrix is singular.'
+
+	pa = numpy.zeros([nGrains, nIsom+nProd, nIsom], numpy.float64)
+	for i in range(nIsom):
+		pa[nRes[i]:,:,i] = Z[indices[nRes[i]:,i],:]
+	if (pa < 0).any():
+		return K, 'One or more negative steady-state populations encountered.'
+
+	# Rate coefficients for collisional stabilization into the reservoirs and
+	# for dissociation from the active grains
+	for i in range(nIsom):
+		K[i,:] = numpy.sum(bandedDot(Mcoll[i], pa[:,:,i])[0:nRes[i],:], axis=0)
+	for n in range(nProd):
+		for i in range(nIsom):
+			K[n+nIsom,:] += numpy.dot(Gnj[n,i,nRes[i]:], pa[nRes[i]:,:,i])
+
+	# Diagonal entries balance the loss from each isomer
+	for n in range(nIsom+nProd):
+		K[n,n] = 0
+		K[n,n] = -numpy.sum(K[:,n])
+
+	return K, ''
@@ -0,0 +1,202 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#	RMG - Reaction Mechanism Generator
+#
+#	Copyright (c) 2002-2009 Prof. William H. Green (whgreen@mit.edu) and the
+#	RMG Team (rmg_dev@mit.edu)
+#
+#	Permission is hereby granted, free of charge, to any person obtaining a
+#	copy of this software and associated documentation files (the 'Software'),
+#	to deal in the Software without restriction, including without limitation
+#	the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#	and/or sell copies of the Software, and to permit persons to whom the
+#	Software is furnished to do so, subject to the following conditions:
+#
+#	The above copyright notice and this permission notice shall be included in
+#	all copies or substantial portions of the Software.
+#
+#	THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#	IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#	FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#	AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#	LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#	FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#	DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+"""
+Contains a persistent on-disk cache of the phenomenological rate coefficients
+:math:`k(T,P)` of unimolecular reaction networks, so that networks that recur
+from one job to the next need not be recalculated. Each network is identified
+by a canonical description of everything its rate coefficients depend on: the
+species of each isomer, the ground-state energies, the kinetics of the path
+reactions, the bath gas and collision parameters, the approximate method, the
+temperature, pressure and energy grids, and the interpolation model. The
+description does not depend on the order of the isomers or path reactions in
+the network, so the cached rate coefficients are stored with the isomers in a
+canonical order and rearranged to match the network they are reused for. The
+fitted kinetics are not cached, as which net reactions are fitted depends on
+the order of the isomers; they are refitted from the rearranged rate
+coefficients instead.
+
+The cache stores one pickle file per network in a directory, named using a
+hash of the description; the description itself is saved alongside the
+results and checked when they are loaded.
+"""
+
+import cPickle
+import hashlib
+import os
+import os.path
+
+import rmg.log as logging
+
+################################################################################
+
+# The temperatures in K at which the heat capacity of each species is included
+# in its description, as the spectral data of the species is fitted to these
+temperatures = [300.0, 400.0, 500.0, 600.0, 800.0, 1000.0, 1500.0]
+
+def getSpeciesDescription(spec):
+	"""
+	Return a string that identifies the species `spec` by its structure and
+	the properties used to determine its densities of states and collision
+	frequencies.
+	"""
+	struct = spec.structure[0]
+	lennardJones = spec.lennardJones
+	if lennardJones is not None:
+		lennardJones = (lennardJones.sigma, lennardJones.epsilon)
+	# The molecular weight is rounded, as its last digits depend on the order
+	# in which the masses of the atoms are summed
+	return '%s radicals=%i MW=%.10g LJ=%r S298=%r Cp=%r' % (struct.toInChI(), struct.getRadicalCount(),
+		spec.getMolecularWeight(), lennardJones, spec.getEntropy(298.0),
+		[spec.getHeatCapacity(T) for T in temperatures])
+
+class NetworkCache:
+	"""
+	A persistent cache of the phenomenological rate coefficients of
+	unimolecular reaction networks. The attributes are:
+
+	=============== ============================================================
+	Attribute       Description
+	=============== ============================================================
+	`path`          The directory in which the cached results are stored
+	=============== ============================================================
+
+	"""
+
+	def __init__(self, path):
+		self.path = path
+
+	def getNetworkDescription(self, network, Tlist, Plist, grainSize, numGrains, method, model):
+		"""
+		Return a canonical description of the unimolecular reaction network
+		`network` for calculating its rate coefficients at the temperatures
+		`Tlist` in K and pressures `Plist` in Pa using approximate method
+		`method` with energy grain size `grainSize` in J/mol or `numGrains`
+		grains, and fitting them to the interpolation model `model`. The
+		isomers, ground-state energies and bath gas of the network must
+		already be set. Also returns the canonical order of the isomers as a
+		list of their indices in the network.
+		"""
+
+		import rmg.settings as settings
+
+		# Order the isomers by their species
+		isomerDescriptions = [' + '.join(sorted([getSpeciesDescription(spec) for spec in isomer.species]))
+			for isomer in network.isomers]
+		order = sorted(range(len(network.isomers)), key=lambda i: isomerDescriptions[i])
+		index = dict([(isomer, order.index(i)) for i, isomer in enumerate(network.isomers)])
+
+		lines = []
+		lines.append('method %r banded=%r' % (method.lower(), settings.bandedCollisionMatrix and method.lower() == 'reservoirstate'))
+		lines.append('grains %r %r' % (grainSize, numGrains))
+		lines.append('temperatures %r' % (list(Tlist)))
+		lines.append('pressures %r' % (list(Plist)))
+		lines.append('model %r' % (model,))
+		lines.append('bath gas %s dEdown=%r' % (getSpeciesDescription(network.bathGas), network.bathGas.expDownParam))
+		for i in order:
+			lines.append('isomer E0=%r %s' % (network.isomers[i].E0, isomerDescriptions[i]))
+		# The path reactions are described by the kinetics used at each
+		# temperature, as these are what the rate coefficients depend on
+		reactions = []
+		for reaction in network.pathReactions:
+			kinetics = [reaction.getBestKinetics(T) for T in Tlist]
+			reactions.append('reaction %i -> %i E0=%r kinetics=%r' % (index[reaction.reactant], index[reaction.product],
+				reaction.E0, [(k.A, k.n, k.Ea) for k in kinetics]))
+		lines.extend(sorted(reactions))
+
+		return '\n'.join(lines), order
+
+	def getFilename(self, description):
+		"""
+		Return the path of the file in which the results for the network with
+		the given canonical `description` are stored.
+		"""
+		return os.path.join(self.path, '%s.pkl' % hashlib.sha1(description).hexdigest())
+
+	def load(self, network, Tlist, Plist, grainSize, numGrains, method, model):
+		"""
+		Return the cached rate coefficients of `network` for the given
+		calculation parameters, as described in :meth:`getNetworkDescription`,
+		with the isomers in the order of the network. Returns ``None`` if the
+		network has not been cached.
+		"""
+		description, order = self.getNetworkDescription(network, Tlist, Plist, grainSize, numGrains, method, model)
+		path = self.getFilename(description)
+		if not os.path.exists(path):
+			return None
+		try:
+			f = open(path, 'rb')
+			try:
+				cachedDescription, Kc = cPickle.load(f)
+			finally:
+				f.close()
+		except (IOError, EOFError, ValueError, cPickle.UnpicklingError), e:
+			logging.warning('Unable to read cached unimolecular reaction network %s: %s' % (path, e))
+			return None
+		if cachedDescription != description:
+			return None
+
+		# Rearrange the results from the canonical order of the isomers
+		K = Kc.copy()
+		for c1, i1 in enumerate(order):
+			for c2, i2 in enumerate(order):
+				K[:,:,i1,i2] = Kc[:,:,c1,c2]
+		return K
+
+	def save(self, network, Tlist, Plist, grainSize, numGrains, method, model, K):
+		"""
+		Store the rate coefficients `K` of `network`, calculated using the
+		given parameters, in the cache.
+		"""
+		description, order = self.getNetworkDescription(network, Tlist, Plist, grainSize, numGrains, method, model)
+		path = self.getFilename(description)
+
+		# Rearrange the results into the canonical order of the isomers
+		Kc = K.copy()
+		for c1, i1 in enumerate(order):
+			for c2, i2 in enumerate(order):
+				Kc[:,:,c1,c2] = K[:,:,i1,i2]
+
+		# Write to a temporary file first, so that other jobs sharing the
+		# cache never read an incomplete file
+		try:
+			if not os.path.exists(self.path):
+				os.makedirs(self.path)
+			temp = '%s.%i.tmp' % (path, os.getpid())
+			f = open(temp, 'wb')
+			try:
+				cPickle.dump((description, Kc), f, cPickle.HIGHEST_PROTOCOL)
+			finally:
+				f.close()
+			os.rename(temp, path)
+		except (IOError, OSError), e:
+			logging.warning('Unable to write cached unimolecular reaction network %s: %s' % (path, e))
+
+################################################################################
@@ -38,6 +38,8 @@ import rmg.log as logging
 import numpy
 
 import rmg.constants as constants
+import rmg.parallel as parallel
+import rmg.settings as settings
 import states
 
 ################################################################################
@@ -113,14 +115,14 @@ class Isomer:
 		"""
 		return len(self.species) > 1
 
-	def calculateDensityOfStates(self, Elist):
+	def convolveDensitiesOfStates(self, Elist):
 		"""
-		Calculate the density of states in mol/J of the isomer at the specified
-		list of energies `Elist` in J/mol.
+		Return the density of states in mol/J of the isomer at the specified
+		list of energies `Elist` in J/mol, relative to the ground state of the
+		isomer. For multimolecular isomers this is the convolution of the
+		densities of states of the individual species.
 		"""
 
-		# Initialize density of states
-		self.densStates = numpy.zeros(len(Elist), numpy.float64)
 		densStates = numpy.zeros(len(Elist), numpy.float64)
 
 		# Calculate the density of states for each species, convolving when
@@ -130,12 +132,25 @@ class Isomer:
 			if densStates0 is not None:
 				states.convolve(densStates, densStates0, Elist)
 
-		# Shift to appropriate energy grain using E0
-		index = -1
-		for i, E in enumerate(Elist):
-			if self.E0 < E and index < 0:
-				index = i
-		if index >= 0:
+		return densStates
+
+	def calculateDensityOfStates(self, Elist, densStates=None):
+		"""
+		Calculate the density of states in mol/J of the isomer at the specified
+		list of energies `Elist` in J/mol. If the density of states relative to
+		the ground state of the isomer, as returned by
+		:meth:`convolveDensitiesOfStates`, is already known, it can be passed as
+		`densStates` to avoid recalculating it.
+		"""
+
+		# Initialize density of states
+		self.densStates = numpy.zeros(len(Elist), numpy.float64)
+		if densStates is None:
+			densStates = self.convolveDensitiesOfStates(Elist)
+
+		# Shift to appropriate energy grain using E0 (the first grain above it)
+		index = numpy.searchsorted(Elist, self.E0, side='right')
+		if index < len(Elist):
 			self.densStates[index:len(densStates)] = densStates[0:len(densStates)-index]
 		else:
 			raise UnirxnNetworkException('Invalid energy range %s-%s kJ/mol for density of states calculation for %s with ground-state energy %s kJ/mol.'
@@ -151,7 +166,7 @@ class Isomer:
 		"""
 		dE = Elist[1] - Elist[0]
 		self.eqDist = self.densStates * numpy.exp(-Elist / constants.R / T) * dE
-		self.Q = sum(self.eqDist)
+		self.Q = numpy.sum(self.eqDist)
 		self.eqDist /= self.Q
 
 	def calculateCollisionFrequency(self, T, P, bathGas):
@@ -180,25 +195,19 @@ class Isomer:
 
 		dE = E[1] - E[0]
 
-		FeNum = 0; FeDen = 0
-		Delta1 = 0; Delta2 = 0; DeltaN = 0; Delta = 1
+		value = densStates * numpy.exp(-E / constants.R / T)
 
-		for r in range(0, len(E)):
-			value = densStates[r] * math.exp(-E[r] / constants.R / T)
-			if E[r] > E0:
-				FeNum += value * dE
-				if FeDen == 0:
-					FeDen = value * constants.R * T
-		if FeDen == 0: return 1.0
+		# The denominator uses the first nonzero value above E0
+		above = numpy.flatnonzero((E > E0) & (value != 0))
+		if len(above) == 0: return 1.0
+		FeNum = numpy.sum(value[E > E0] * dE)
+		FeDen = value[above[0]] * constants.R * T
 		Fe = FeNum / FeDen
 
-		for r in range(0, len(E)):
-			value = densStates[r] * math.exp(-E[r] / constants.R / T)
-			# Delta
-			if E[r] < E0:
-				Delta1 += value * dE
-				Delta2 += value * dE * math.exp(-(E0 - E[r]) / (Fe * constants.R * T))
-			DeltaN += value * dE
+		below = E < E0
+		Delta1 = numpy.sum(value[below] * dE)
+		Delta2 = numpy.sum(value[below] * dE * numpy.exp(-(E0 - E[below]) / (Fe * constants.R * T)))
+		DeltaN = numpy.sum(value * dE)
 
 		Delta1 /= DeltaN
 		Delta2 /= DeltaN
@@ -269,8 +278,26 @@ class Network:
 	                :data:`False` if the kinetics are out of date and need to
 	                be recomputed
 	`explored`      A list of all of the fully-explored unimolecular isomers
+	--------------- ------------------------------------------------------------
+	`grainCache`    The grain size, number of grains, and list of energy grains
+	                used in the most recent rate coefficient calculation
+	`maxEnergyCache` A dictionary of the energy above the ground state of the
+	                highest-energy unimolecular isomer at which its equilibrium
+	                distribution becomes negligible, keyed on its species and
+	                the temperature
+	`densStatesCache` A dictionary of the densities of states of the isomers,
+	                relative to their ground states, keyed on the energy grains
+	                and the species in the isomer
+	`rateCache`     A dictionary of the microcanonical rate coefficients of the
+	                path reactions, keyed on the energy grains, temperature,
+	                species, kinetics, and ground-state energies used
 	=============== ============================================================
 
+	The entries in the lower half of the above table allow a network that has
+	been modified (e.g. by adding a path reaction) to be updated without
+	repeating the parts of the calculation that are unaffected by the change.
+	The energy grains are only regrown when the maximum energy must increase.
+
 	"""
 
 	def __init__(self, id=0):
@@ -280,6 +307,10 @@ class Network:
 		self.netReactions = []
 		self.valid = True
 		self.explored = []
+		self.grainCache = None
+		self.maxEnergyCache = {}
+		self.densStatesCache = {}
+		self.rateCache = {}
 
 	def __repr__(self):
 		return '<Network "%s">' % ([str(isomer.species[0]) for isomer in self.isomers if isomer.isUnimolecular()])
@@ -343,6 +374,22 @@ class Network:
 		self.explored.extend(other.explored)
 		self.invalidate()
 	
+	def getCaches(self):
+		"""
+		Return the caches used to avoid repeating parts of the rate coefficient
+		calculation in subsequent updates, e.g. to pass them back from a
+		worker process.
+		"""
+		return (self.grainCache, self.maxEnergyCache, self.densStatesCache, self.rateCache)
+
+	def setCaches(self, caches):
+		"""
+		Replace the caches used to avoid repeating parts of the rate
+		coefficient calculation with `caches`, as returned by
+		:meth:`getCaches`.
+		"""
+		self.grainCache, self.maxEnergyCache, self.densStatesCache, self.rateCache = caches
+
 	def invalidate(self):
 		"""
 		Mark a network as in need of a new pressure-dependence calculation.
@@ -411,9 +458,20 @@ class Network:
 		isomers and for all multimolecular isomers that are reactants of a
 		path reaction with the forward reaction defined as the association.
 		"""
-		# Calculate the density of states for each isomer
+		# Calculate the density of states for each isomer, reusing those
+		# calculated with the same energy grains in a previous update
+		densStatesCache = {}
+		gridKey = getEnergyGrainsKey(Elist)
 		for isomer in self.isomers:
-			isomer.calculateDensityOfStates(Elist)
+			key = (gridKey, tuple([spec.id for spec in isomer.species]))
+			densStates = self.densStatesCache.get(key)
+			if densStates is None:
+				densStates = isomer.convolveDensitiesOfStates(Elist)
+			densStatesCache[key] = densStates
+			isomer.calculateDensityOfStates(Elist, densStates)
+
+		# Only keep the densities of states of the current isomers
+		self.densStatesCache = densStatesCache
 
 	def shiftToZeroEnergy(self):
 		"""
@@ -465,15 +523,15 @@ class Network:
 		the distribution is some fraction of the maximum, and (3) add the
 		difference between the ground-state energy of the isomer and the
 		highest ground-state energy in the system (either isomer or transition
-		state). Parameters are the desired grain size `grainSize` and number of
-		grains `numGrains` and the temperature to use for the equilibrium
-		calculation `Tmax`, which should be the highest temperature of interest.
+		state). The equilibrium distribution is evaluated on grains that extend
+		to an analytic estimate of the energy in (2), so usually only one
+		density of states calculation is needed, and the energy is cached for
+		subsequent updates of the network. Parameters are the desired grain
+		size `grainSize` and number of grains `numGrains` and the temperature
+		to use for the equilibrium calculation `Tmax`, which should be the
+		highest temperature of interest.
 		"""
 
-		# For the purposes of finding the maximum energy we will use 401 grains
-		nE = 401
-		dE = 0.0
-
 		# Determine minimum energy and isomer with minimum ground-state energy
 		isomer = None
 		for i in self.isomers:
@@ -488,40 +546,17 @@ class Network:
 			if i.isUnimolecular():
 				if isomer is None: isomer = i
 				elif i.E0 > isomer.E0: isomer = i
-		Emax0 = isomer.E0
-		
-		# (Try to) purposely overestimate Emax using arbitrary multiplier
-		# This is to (hopefully) avoid multiple density of states calculations
-		mult = 50
-		done = False
-		while not done:
 
-			Emax = math.ceil(Emax0 + mult * constants.R * Tmax)
+		# Determine the energy above the ground state of that isomer at which
+		# its equilibrium distribution becomes negligible, reusing the value
+		# from a previous update if the isomer and temperature are unchanged
+		key = (tuple([spec.id for spec in isomer.species]), Tmax)
+		Etail = self.maxEnergyCache.get(key)
+		if Etail is None:
+			Etail = self.__calculateTailEnergy(isomer, Emin, Tmax)
+		self.maxEnergyCache = {key: Etail}
 
-			Elist = self.getEnergyGrains(Emin, Emax, dE, nE)
-			isomer.calculateDensityOfStates(Elist)
-			isomer.calculateEqDist(Elist, Tmax)
-
-			# Find maximum of distribution
-			maxIndex = 0
-			value = 0.0
-			for r, E in enumerate(Elist):
-				if isomer.eqDist[r] > value:
-					value = isomer.eqDist[r]
-					maxIndex = r
-
-			# If tail of distribution is much lower than the maximum, then we've found bounds for Emax
-			tol = 1e-8
-			if isomer.eqDist[-1] / value < tol:
-				r = nE - 1
-				while r > 0 and not done:
-					if isomer.eqDist[r] / value > tol:
-						done = True
-					else:
-						r -= 1
-				Emax = Elist[r] + max([rxn.getBestKinetics(Tmax).Ea for rxn in self.pathReactions]) - Emax0
-			else:
-				mult += 50
+		Emax = Etail + max([rxn.getBestKinetics(Tmax).Ea for rxn in self.pathReactions])
 
 		# Add difference between isomer ground-state energy and highest
 		# transition state or isomer energy
@@ -532,12 +567,103 @@ class Network:
 		# Round Emax up to nearest integer
 		Emax = math.ceil(Emax)
 
+		# Reuse the energy grains from the previous update of this network if
+		# they still span the required range, so that the densities of states
+		# and microcanonical rates calculated with them can also be reused
+		if self.grainCache is not None:
+			grainSize0, numGrains0, Elist = self.grainCache
+			if grainSize0 == grainSize and numGrains0 == numGrains and Elist[0] == Emin and Elist[-1] >= Emax:
+				return Elist
+
 		# Return the chosen energy grains
-		return self.getEnergyGrains(Emin, Emax, grainSize, numGrains)
+		Elist = self.getEnergyGrains(Emin, Emax, grainSize, numGrains)
+		self.grainCache = (grainSize, numGrains, Elist)
+		return Elist
+
+	def __estimateTailEnergy(self, isomer, Tmax, tol):
+		"""
+		Return an estimate of the energy above the ground state of the
+		unimolecular `isomer` at which its equilibrium distribution at `Tmax`
+		in K falls to the fraction `tol` of its maximum, or ``None`` if no
+		heat capacity data is available. The internal degrees of freedom are
+		treated as :math:`s` classical oscillators, with :math:`s` determined
+		from the heat capacity, so that the distribution is proportional to
+		:math:`E^{s-1} e^{-E/RT}`.
+		"""
+
+		species = isomer.species[0]
+		if species.thermoData is None:
+			return None
+
+		# Number of classical oscillators, excluding the translational and
+		# PV contributions to the heat capacity
+		s = species.getHeatCapacity(Tmax) / constants.R - 2.5
+		if s <= 1.0:
+			# The distribution decreases monotonically from zero energy
+			return -math.log(tol) * constants.R * Tmax
+
+		# Solve (s-1) ln(x/xp) - (x-xp) = ln(tol), where x = E/RT and xp is
+		# the location of the maximum, using Newton's method
+		xp = s - 1.0
+		x = xp - 2.0 * math.log(tol)
+		for iter in range(100):
+			dx = ((s - 1.0) * math.log(x / xp) - (x - xp) - math.log(tol)) / ((s - 1.0) / x - 1.0)
+			x -= dx
+			if abs(dx) < 1e-6 * x: break
+
+		return x * constants.R * Tmax
+
+	def __calculateTailEnergy(self, isomer, Emin, Tmax):
+		"""
+		Return the energy above the ground state of the unimolecular `isomer`
+		at which its equilibrium distribution at `Tmax` in K becomes negligible.
+		The distribution is evaluated from the density of states on a coarse
+		set of energy grains that extend to an estimate of this energy, with
+		some margin; if the estimate proves too small, the grains are extended
+		and the calculation repeated.
+		"""
+
+		# For the purposes of finding the maximum energy we will use 401 grains
+		nE = 401
+		dE = 0.0
+		tol = 1e-8
+
+		Emax0 = isomer.E0
+
+		# Purposely overestimate the energy to (hopefully) avoid multiple
+		# density of states calculations
+		Etail = self.__estimateTailEnergy(isomer, Tmax, tol)
+		if Etail is None:
+			Etail = 50 * constants.R * Tmax
+		else:
+			Etail *= 1.2
+
+		while True:
+
+			Emax = math.ceil(Emax0 + Etail)
+
+			Elist = self.getEnergyGrains(Emin, Emax, dE, nE)
+			isomer.calculateDensityOfStates(Elist)
+			isomer.calculateEqDist(Elist, Tmax)
+
+			# Find maximum of distribution
+			value = numpy.max(isomer.eqDist)
+
+			# If tail of distribution is much lower than the maximum, then we've found bounds for Emax
+			if isomer.eqDist[-1] / value < tol:
+				# Find the last grain at which the distribution is above the tolerance
+				indices = numpy.flatnonzero(isomer.eqDist[1:] / value > tol)
+				r = indices[-1] + 1 if len(indices) > 0 else 1
+				return Elist[r] - Emax0
+			else:
+				Etail *= 1.5
 
 	def calculateRateCoefficients(self, Tlist, Plist, Elist, method, errorCheck=True):
 		"""
-		Calculate the phenomenological rate coefficients for the network.
+		Calculate the phenomenological rate coefficients for the network at
+		each temperature in `Tlist` and pressure in `Plist`. The temperatures
+		are independent of one another, so they are divided among worker
+		processes if more than one is allowed.
 		"""
 
 		K = numpy.zeros([len(Tlist), len(Plist),\
@@ -545,50 +671,28 @@ class Network:
 
 		try:
 
-			for t, T in enumerate(Tlist):
-
-				# Calculate equilibrium distributions
-				for isomer in self.isomers:
-					if isomer.densStates is not None:
-						isomer.calculateEqDist(Elist, T)
-					
-	#			# DEBUG: Plot equilibrium distributions
-	#			import pylab
-	#			for isomer in self.isomers:
-	#				if isomer.densStates is not None:
-	#					pylab.plot(Elist / 1000.0, isomer.eqDist, '-')
-	#			pylab.xlabel('Energy (kJ/mol)')
-	#			pylab.ylabel('Equilibrium distribution')
-	#			pylab.show()
-
-				# Calculate microcanonical rates k(E)
-				# It might seem odd that this is dependent on temperature, and it
-				# isn't -- unless the Arrhenius expression has a negative n
-				for reaction in self.pathReactions:
-					reaction.kf, reaction.kb = reaction.calculateMicrocanonicalRate(Elist,
-						T, reaction.reactant.densStates, reaction.product.densStates)
-					
-#				# DEBUG: Plot microcanonical rates
-#				import pylab
-#				for i, reaction in enumerate(self.pathReactions):
-#					if reaction.isIsomerization() or reaction.isDissociation():
-#						pylab.semilogy(Elist / 1000.0, reaction.kf, '-')
-#					if reaction.isIsomerization() or reaction.isAssociation():
-#						pylab.semilogy(Elist / 1000.0, reaction.kb, '--')
-#				pylab.xlabel('Energy (kJ/mol)')
-#				pylab.ylabel('Microcanonical rate')
-#				pylab.show()
-
-				for p, P in enumerate(Plist):
-
-					# Calculate collision frequencies
-					for isomer in self.isomers:
-						if isomer.isUnimolecular():
-							isomer.calculateCollisionFrequency(T, P, self.bathGas)
-							
-					# Determine phenomenological rate coefficients using approximate
-					# method
-					K[t,p,:,:] = self.applyApproximateMethod(T, P, Elist, method, errorCheck)
+			numProcesses = parallel.getNumberOfProcesses(len(Tlist))
+
+			if numProcesses == 1:
+				for t, T in enumerate(Tlist):
+					K[t,:,:,:] = self.calculateRateCoefficientsAtTemperature(T, Plist, Elist, method, errorCheck)
+			else:
+				# The worker processes inherit the snapshot when they are forked
+				global networkSnapshot
+				networkSnapshot = (self, Tlist, Plist, Elist, method, errorCheck)
+				try:
+					results = parallel.map(calculateRateCoefficientsWorker, range(len(Tlist)))
+				finally:
+					networkSnapshot = None
+				for t, (Kt, msg, rateCache) in enumerate(results):
+					if Kt is None:
+						raise UnirxnNetworkException(msg)
+					K[t,:,:,:] = Kt
+					self.rateCache.update(rateCache)
+
+			# Only keep the microcanonical rates of the current path reactions
+			keys = [self.__getRateKey(reaction, Elist, T) for T in Tlist for reaction in self.pathReactions]
+			self.rateCache = dict([(key, self.rateCache[key]) for key in keys if key in self.rateCache])
 
 		except UnirxnNetworkException, e:
 
@@ -611,15 +715,101 @@ class Network:
 
 		return K
 
-	def applyApproximateMethod(self, T, P, Elist, method, errorCheck=True):
+	def calculateRateCoefficientsAtTemperature(self, T, Plist, Elist, method, errorCheck=True):
 		"""
-		Apply the approximate method specified in `method` to estimate the
-		phenomenological rate coefficients for the network. This function
-		expects that all preparations have already been made, as in the
-		:meth:`calculateRateCoefficients` method.
+		Calculate the phenomenological rate coefficients for the network at
+		temperature `T` in K and each pressure in `Plist`. The microcanonical
+		rate coefficients and other temperature-dependent quantities are
+		computed once and reused for all of the pressures.
 		"""
 
-		logging.debug('Applying %s method at %g K, %g bar...' % (method, T, P*1e-5))
+		K = numpy.zeros([len(Plist), len(self.isomers), len(self.isomers)], numpy.float64)
+
+		# Calculate equilibrium distributions
+		for isomer in self.isomers:
+			if isomer.densStates is not None:
+				isomer.calculateEqDist(Elist, T)
+
+#		# DEBUG: Plot equilibrium distributions
+#		import pylab
+#		for isomer in self.isomers:
+#			if isomer.densStates is not None:
+#				pylab.plot(Elist / 1000.0, isomer.eqDist, '-')
+#		pylab.xlabel('Energy (kJ/mol)')
+#		pylab.ylabel('Equilibrium distribution')
+#		pylab.show()
+
+		# Calculate microcanonical rates k(E), reusing those calculated in a
+		# previous update if nothing they depend on has changed
+		# It might seem odd that this is dependent on temperature, and it
+		# isn't -- unless the Arrhenius expression has a negative n
+		# The inverse Laplace transforms of the kinetics of all of the path
+		# reactions not in the cache are evaluated together
+		keys = [self.__getRateKey(reaction, Elist, T) for reaction in self.pathReactions]
+		reactions = [reaction for reaction, key in zip(self.pathReactions, keys) if key not in self.rateCache]
+		if len(reactions) > 0:
+			from rmg.reaction import kineticsInverseLaplaceTransformBatch
+			kineticsList = [reaction.getBestKinetics(T) for reaction in reactions]
+			E0list = [reaction.E0 for reaction in reactions]
+			densStates = numpy.array([reaction.reactant.densStates for reaction in reactions], numpy.float64)
+			klist = kineticsInverseLaplaceTransformBatch(kineticsList, E0list, densStates, Elist, T)
+			for reaction, k in zip(reactions, klist):
+				self.rateCache[self.__getRateKey(reaction, Elist, T)] = reaction.calculateMicrocanonicalRate(Elist,
+					T, reaction.reactant.densStates, reaction.product.densStates, k)
+		for reaction, key in zip(self.pathReactions, keys):
+			reaction.kf, reaction.kb = self.rateCache[key]
+
+#		# DEBUG: Plot microcanonical rates
+#		import pylab
+#		for i, reaction in enumerate(self.pathReactions):
+#			if reaction.isIsomerization() or reaction.isDissociation():
+#				pylab.semilogy(Elist / 1000.0, reaction.kf, '-')
+#			if reaction.isIsomerization() or reaction.isAssociation():
+#				pylab.semilogy(Elist / 1000.0, reaction.kb, '--')
+#		pylab.xlabel('Energy (kJ/mol)')
+#		pylab.ylabel('Microcanonical rate')
+#		pylab.show()
+
+		# Construct the pressure-independent arrays used by the approximate method
+		arrays = self.prepareApproximateMethod(T, Elist, method)
+
+		for p, P in enumerate(Plist):
+
+			# Calculate collision frequencies
+			for isomer in self.isomers:
+				if isomer.isUnimolecular():
+					isomer.calculateCollisionFrequency(T, P, self.bathGas)
+
+			# Determine phenomenological rate coefficients using approximate
+			# method
+			K[p,:,:] = self.applyApproximateMethod(T, P, Elist, method, errorCheck, arrays)
+
+		return K
+
+	def __getRateKey(self, reaction, Elist, T):
+		"""
+		Return a key that identifies the microcanonical rate coefficients of
+		path reaction `reaction` at temperature `T` in K on the energy grains
+		`Elist` in J/mol. The key contains everything the rates depend on, so
+		that cached rates are reused only if they would be unchanged.
+		"""
+		kinetics = reaction.getBestKinetics(T)
+		return (getEnergyGrainsKey(Elist), T,
+			tuple([spec.id for spec in reaction.reactant.species]), reaction.reactant.E0,
+			tuple([spec.id for spec in reaction.product.species]), reaction.product.E0,
+			reaction.E0, kinetics.A, kinetics.n, kinetics.Ea)
+
+	def prepareApproximateMethod(self, T, Elist, method):
+		"""
+		Construct the arrays needed to apply the approximate method specified
+		in `method` at temperature `T` in K that do not depend on pressure,
+		and return them in a dictionary. These include the microcanonical rate
+		coefficient arrays and, where applicable, the collision efficiencies
+		or the collision matrices for a collision frequency of unity. This
+		function expects that the equilibrium distributions and microcanonical
+		rates have already been calculated at this temperature, as in the
+		:meth:`calculateRateCoefficientsAtTemperature` method.
+		"""
 
 		# Matrix and vector size indicators
 		nIsom = self.numUniIsomers()
@@ -628,11 +818,14 @@ class Network:
 
 		dE = Elist[1] - Elist[0]
 
+		arrays = {}
+
 		# Density of states per partition function (i.e. normalized density of
 		# states with respect to Boltzmann weighting factor) for each isomer
 		densStates = numpy.zeros([nIsom,nGrains], numpy.float64)
 		for i in range(nIsom): densStates[i,:] = self.isomers[i].densStates * dE / self.isomers[i].Q
-		
+		arrays['densStates'] = densStates
+
 		# If there are no product channels, we must temporarily create a fake
 		# one; this is because f2py can't handle matrices with a dimension of zero
 		if nProd == 0: nProd = 1
@@ -641,7 +834,8 @@ class Network:
 		Eres = numpy.zeros([nIsom+nProd], numpy.float64)
 		for i, isomer in enumerate(self.isomers):
 			Eres[i] = isomer.getActiveSpaceEnergy(self.pathReactions)
-		
+		arrays['Eres'] = Eres
+
 		# Isomerization, dissociation, and association microcanonical rate
 		# coefficients, respectively
 		Kij = numpy.zeros([nIsom,nIsom,nGrains], numpy.float64)
@@ -659,13 +853,108 @@ class Network:
 			elif reaction.isAssociation():
 				Fim[j,i-nIsom,:] = reaction.kf
 				Gnj[i-nIsom,j,:] = reaction.kb
+		arrays['Kij'] = Kij
+		arrays['Gnj'] = Gnj
+		arrays['Fim'] = Fim
+
+		if method.lower() == 'modifiedstrongcollision':
+
+			# Collision efficiency of each isomer
+			collEff = numpy.zeros([nIsom], numpy.float64)
+			for i in range(nIsom): collEff[i] = \
+				self.isomers[i].calculateCollisionEfficiency(T, self.pathReactions, self.bathGas.expDownParam, Elist)
+			arrays['collEff'] = collEff
+
+		elif method.lower() == 'reservoirstate' or method.lower() == 'chemicaleigenvalues':
+
+			# Average energy transferred in a deactivating collision
+			dEdown = self.bathGas.expDownParam
+
+			# Ground-state energy for each isomer
+			E0 = numpy.zeros([nIsom], numpy.float64)
+			for i in range(nIsom): E0[i] = self.isomers[i].E0
+
+			# The full collision matrix for each isomer, for a collision
+			# frequency of unity; the collision matrix is proportional to the
+			# collision frequency, which is the only pressure-dependent input
+			# The reservoir state method can instead store only the band of
+			# each collision matrix, which requires much less memory
+			useBanded = self.__useBandedCollisionMatrix(method)
+			if useBanded:
+				import banded
+				halfbandwidth = banded.getHalfBandwidth(Elist, dEdown)
+				Mcoll = numpy.zeros([nIsom,2*halfbandwidth+1,nGrains], numpy.float64)
+			else:
+				# Fortran ordering lets the collision matrices be passed to the
+				# Fortran modules without being copied
+				import mastereqn
+				Mcoll = numpy.zeros([nIsom,nGrains,nGrains], numpy.float64, order='F')
+			for i in range(nIsom):
+				densStates0 = self.isomers[i].densStates
+				if useBanded:
+					Mcoll[i,:,:], msg = banded.collisionMatrix(T, Elist, 1.0, densStates0, E0[i], dEdown)
+				else:
+					Mcoll[i,:,:], msg = mastereqn.collisionmatrix(T, 0.0, Elist, 1.0, densStates0, E0[i], dEdown)
+				msg = msg.strip()
+				if msg != '':
+					raise UnirxnNetworkException('Unable to determine collision matrix for isomer %i: %s' % (i, msg))
+			arrays['Mcoll'] = Mcoll
+
+			# A work buffer with the same shape and ordering as the collision
+			# matrices, into which they are scaled by the collision frequency
+			# at each pressure
+			if useBanded:
+				arrays['McollWork'] = numpy.zeros(Mcoll.shape, numpy.float64)
+			else:
+				arrays['McollWork'] = numpy.zeros(Mcoll.shape, numpy.float64, order='F')
+
+			if method.lower() == 'chemicaleigenvalues':
+
+				# Use free energy to determine equilibrium ratios of each isomer and product channel
+				eqRatios = numpy.zeros(nIsom+nProd, numpy.float64)
+				for i, isom in enumerate(self.isomers):
+					G = sum([spec.getFreeEnergy(T) for spec in isom.species])
+					eqRatios[i] = math.exp(-G / constants.R / T)
+				eqRatios /= numpy.sum(eqRatios)
+				arrays['eqRatios'] = eqRatios
+
+		return arrays
+
+	def applyApproximateMethod(self, T, P, Elist, method, errorCheck=True, arrays=None):
+		"""
+		Apply the approximate method specified in `method` to estimate the
+		phenomenological rate coefficients for the network. This function
+		expects that all preparations have already been made, as in the
+		:meth:`calculateRateCoefficientsAtTemperature` method. The
+		pressure-independent `arrays` returned by :meth:`prepareApproximateMethod`
+		can be passed to avoid constructing them again for each pressure.
+		"""
+
+		logging.debug('Applying %s method at %g K, %g bar...' % (method, T, P*1e-5))
+
+		if arrays is None:
+			arrays = self.prepareApproximateMethod(T, Elist, method)
+
+		# Matrix and vector size indicators
+		nIsom = self.numUniIsomers()
+		nProd = self.numMultiIsomers()
+		nGrains = len(Elist)
+
+		# If there are no product channels, we must temporarily create a fake
+		# one; this is because f2py can't handle matrices with a dimension of zero
+		if nProd == 0: nProd = 1
+
+		densStates = arrays['densStates']
+		Eres = arrays['Eres']
+		Kij = arrays['Kij']
+		Gnj = arrays['Gnj']
+		Fim = arrays['Fim']
 
 		if method.lower() == 'modifiedstrongcollision':
 
 			# Modified collision frequency of each isomer
 			collFreq = numpy.zeros([nIsom], numpy.float64)
-			for i in range(nIsom): collFreq[i] = self.isomers[i].collFreq * \
-				self.isomers[i].calculateCollisionEfficiency(T, self.pathReactions, self.bathGas.expDownParam, Elist)
+			for i in range(nIsom): collFreq[i] = self.isomers[i].collFreq * arrays['collEff'][i]
 
 			# Apply modified strong collision method
 			import msc
@@ -680,51 +969,42 @@ class Network:
 			# Average energy transferred in a deactivating collision
 			dEdown = self.bathGas.expDownParam
 
-			# Ground-state energy for each isomer
-			E0 = numpy.zeros([nIsom], numpy.float64)
-			for i in range(nIsom): E0[i] = self.isomers[i].E0
-
-			# The full collision matrix for each isomer
-			import mastereqn
-			Mcoll = numpy.zeros([nIsom,nGrains,nGrains], numpy.float64)
+			# The collision matrix for each isomer, found by scaling the
+			# prepared matrices by the collision frequency into the work buffer
+			# so that the prepared matrices can be reused at other pressures
+			Mcoll = arrays['McollWork']
 			for i in range(nIsom):
-				collFreq = self.isomers[i].collFreq
-				densStates0 = self.isomers[i].densStates
-				Mcoll[i,:,:], msg = mastereqn.collisionmatrix(T, P, Elist, collFreq, densStates0, E0[i], dEdown)
-				msg = msg.strip()
-				if msg != '':
-					raise UnirxnNetworkException('Unable to determine collision matrix for isomer %i: %s' % (i, msg))
+				numpy.multiply(arrays['Mcoll'][i], self.isomers[i].collFreq, out=Mcoll[i])
 
 			if method.lower() == 'reservoirstate':
 
+				# Ground-state energy for each isomer
+				E0 = numpy.zeros([nIsom], numpy.float64)
+				for i in range(nIsom): E0[i] = self.isomers[i].E0
+
 				# Apply reservoir state method
-				import rs
-				K, msg = rs.estimateratecoefficients_rs(T, P, Elist, Mcoll, densStates, E0, Eres,
-					Kij, Fim, Gnj, dEdown, nIsom, nProd, nGrains)
+				if self.__useBandedCollisionMatrix(method):
+					import banded
+					K, msg = banded.estimateRateCoefficients_RS(T, P, Elist, Mcoll, densStates, E0, Eres,
+						Kij, Fim, Gnj, dEdown, nIsom, nProd, nGrains)
+				else:
+					import rs
+					K, msg = rs.estimateratecoefficients_rs(T, P, Elist, Mcoll, densStates, E0, Eres,
+						Kij, Fim, Gnj, dEdown, nIsom, nProd, nGrains)
 				msg = msg.strip()
-			
+
 			elif method.lower() == 'chemicaleigenvalues':
 
 				# Ground-state energy for each isomer
 				E0 = numpy.zeros([nIsom+nProd], numpy.float64)
 				for i in range(nIsom+nProd): E0[i] = self.isomers[i].E0
 
-				# Use free energy to determine equilibrium ratios of each isomer and product channel
-				eqRatios = numpy.zeros(nIsom+nProd, numpy.float64)
-				for i, isom in enumerate(self.isomers):
-					G = sum([spec.getFreeEnergy(T) for spec in isom.species])
-					eqRatios[i] = math.exp(-G / constants.R / T)
-				eqRatios /= numpy.sum(eqRatios)
-				
 				# Apply chemically-significant eigenvalue method
 				import cse
 				K, msg = cse.estimateratecoefficients_cse(T, P, Elist, Mcoll, E0,
-					densStates, eqRatios, Kij, Fim, Gnj, nIsom, nProd, nGrains)
+					densStates, arrays['eqRatios'], Kij, Fim, Gnj, nIsom, nProd, nGrains)
 				msg = msg.strip()
 
-				#print K
-				#quit()
-
 		if errorCheck:
 			if msg == '':
 				if not numpy.isfinite(K).all():
@@ -741,4 +1021,47 @@ class Network:
 		else:
 			return K
 
+	def __useBandedCollisionMatrix(self, method):
+		"""
+		Return ``True`` if the collision matrices for the approximate method
+		specified in `method` should be stored in banded form, as set by
+		:data:`settings.bandedCollisionMatrix`. Only the reservoir state method
+		has a banded implementation; the chemically-significant eigenvalue
+		method always uses the full collision matrices.
+		"""
+		return settings.bandedCollisionMatrix and method.lower() == 'reservoirstate'
+
+################################################################################
+
+def getEnergyGrainsKey(Elist):
+	"""
+	Return a key that identifies the list of energy grains `Elist` in J/mol
+	for use in the caches of a :class:`Network`.
+	"""
+	return (Elist[0], Elist[1] - Elist[0], len(Elist))
+
+# The network whose rate coefficients are being calculated, along with the
+# arguments of the calculation, which the worker processes inherit when they
+# are forked
+networkSnapshot = None
+
+def calculateRateCoefficientsWorker(index):
+	"""
+	Calculate the phenomenological rate coefficients of the network being
+	processed at the temperature at position `index` in its list of
+	temperatures. Returns the rate coefficients, an empty string, and the
+	microcanonical rates calculated at that temperature, or ``None``, an error
+	message, and an empty dictionary if the calculation failed, as the result
+	is passed back from a worker process.
+	"""
+	network, Tlist, Plist, Elist, method, errorCheck = networkSnapshot
+	T = Tlist[index]
+	try:
+		K = network.calculateRateCoefficientsAtTemperature(T, Plist, Elist, method, errorCheck)
+	except UnirxnNetworkException, e:
+		return None, e.msg, {}
+	# Also return the microcanonical rates so the main process can cache them
+	rateCache = dict([(key, value) for key, value in network.rateCache.iteritems() if key[1] == T])
+	return K, '', rateCache
+
 ################################################################################
@@ -238,13 +238,13 @@ class GraphCheck(unittest.TestCase):
 		self.assertFalse(graph.isVertexInCycle(vertices[6]))
 		self.assertFalse(graph.isVertexInCycle(vertices[7]))
 
-#		self.assertTrue(graph.isEdgeInCycle(edges[0]))
-#		self.assertTrue(graph.isEdgeInCycle(edges[1]))
-#		self.assertTrue(graph.isEdgeInCycle(edges[2]))
-#		self.assertTrue(graph.isEdgeInCycle(edges[3]))
-#		self.assertFalse(graph.isEdgeInCycle(edges[4]))
-#		self.assertFalse(graph.isEdgeInCycle(edges[5]))
-#		self.assertFalse(graph.isEdgeInCycle(edges[6]))
+		self.assertTrue(graph.isEdgeInCycle(edges[0]))
+		self.assertTrue(graph.isEdgeInCycle(edges[1]))
+		self.assertTrue(graph.isEdgeInCycle(edges[2]))
+		self.assertTrue(graph.isEdgeInCycle(edges[3]))
+		self.assertFalse(graph.isEdgeInCycle(edges[4]))
+		self.assertFalse(graph.isEdgeInCycle(edges[5]))
+		self.assertFalse(graph.isEdgeInCycle(edges[6]))
 
 		self.assertTrue(len(rings) == 1)
 		self.assertTrue(len(rings[0]) == 4)
@@ -277,13 +277,13 @@ class GraphCheck(unittest.TestCase):
 		self.assertTrue(graph.isVertexInCycle(vertices[4]))
 		self.assertTrue(graph.isVertexInCycle(vertices[5]))
 		
-#		self.assertTrue(graph.isEdgeInCycle(edges[0]))
-#		self.assertTrue(graph.isEdgeInCycle(edges[1]))
-#		self.assertTrue(graph.isEdgeInCycle(edges[2]))
-#		self.assertTrue(graph.isEdgeInCycle(edges[3]))
-#		self.assertTrue(graph.isEdgeInCycle(edges[4]))
-#		self.assertTrue(graph.isEdgeInCycle(edges[5]))
-#		self.assertTrue(graph.isEdgeInCycle(edges[6]))
+		self.assertTrue(graph.isEdgeInCycle(edges[0]))
+		self.assertTrue(graph.isEdgeInCycle(edges[1]))
+		self.assertTrue(graph.isEdgeInCycle(edges[2]))
+		self.assertTrue(graph.isEdgeInCycle(edges[3]))
+		self.assertTrue(graph.isEdgeInCycle(edges[4]))
+		self.assertTrue(graph.isEdgeInCycle(edges[5]))
+		self.assertTrue(graph.isEdgeInCycle(edges[6]))
 
 		self.assertTrue(len(rings) == 2)
 		self.assertTrue(len(rings[0]) == 4)
@@ -325,16 +325,16 @@ class GraphCheck(unittest.TestCase):
 		self.assertTrue(graph.isVertexInCycle(vertices[7]))
 		self.assertTrue(graph.isVertexInCycle(vertices[8]))
 
-#		self.assertTrue(graph.isEdgeInCycle(edges[0]))
-#		self.assertTrue(graph.isEdgeInCycle(edges[1]))
-#		self.assertTrue(graph.isEdgeInCycle(edges[2]))
-#		self.assertTrue(graph.isEdgeInCycle(edges[3]))
-#		self.assertFalse(graph.isEdgeInCycle(edges[4]))
-#		self.assertFalse(graph.isEdgeInCycle(edges[5]))
-#		self.assertFalse(graph.isEdgeInCycle(edges[6]))
-#		self.assertTrue(graph.isEdgeInCycle(edges[7]))
-#		self.assertTrue(graph.isEdgeInCycle(edges[8]))
-#		self.assertTrue(graph.isEdgeInCycle(edges[9]))
+		self.assertTrue(graph.isEdgeInCycle(edges[0]))
+		self.assertTrue(graph.isEdgeInCycle(edges[1]))
+		self.assertTrue(graph.isEdgeInCycle(edges[2]))
+		self.assertTrue(graph.isEdgeInCycle(edges[3]))
+		self.assertFalse(graph.isEdgeInCycle(edges[4]))
+		self.assertFalse(graph.isEdgeInCycle(edges[5]))
+		self.assertFalse(graph.isEdgeInCycle(edges[6]))
+		self.assertTrue(graph.isEdgeInCycle(edges[7]))
+		self.assertTrue(graph.isEdgeInCycle(edges[8]))
+		self.assertTrue(graph.isEdgeInCycle(edges[9]))
 
 		self.assertTrue(len(rings) == 2)
 		self.assertTrue(len(rings[0]) == 3 or len(rings[0]) == 4)
@@ -375,22 +375,82 @@ class GraphCheck(unittest.TestCase):
 		self.assertTrue(graph.isVertexInCycle(vertices[6]))
 		self.assertTrue(graph.isVertexInCycle(vertices[7]))
 
-#		self.assertTrue(graph.isEdgeInCycle(edges[0]))
-#		self.assertTrue(graph.isEdgeInCycle(edges[1]))
-#		self.assertTrue(graph.isEdgeInCycle(edges[2]))
-#		self.assertTrue(graph.isEdgeInCycle(edges[3]))
-#		self.assertTrue(graph.isEdgeInCycle(edges[4]))
-#		self.assertTrue(graph.isEdgeInCycle(edges[5]))
-#		self.assertTrue(graph.isEdgeInCycle(edges[6]))
-#		self.assertTrue(graph.isEdgeInCycle(edges[7]))
-#		self.assertTrue(graph.isEdgeInCycle(edges[8]))
-#		self.assertTrue(graph.isEdgeInCycle(edges[9]))
-#		self.assertTrue(graph.isEdgeInCycle(edges[10]))
-#		self.assertTrue(graph.isEdgeInCycle(edges[11]))
+		self.assertTrue(graph.isEdgeInCycle(edges[0]))
+		self.assertTrue(graph.isEdgeInCycle(edges[1]))
+		self.assertTrue(graph.isEdgeInCycle(edges[2]))
+		self.assertTrue(graph.isEdgeInCycle(edges[3]))
+		self.assertTrue(graph.isEdgeInCycle(edges[4]))
+		self.assertTrue(graph.isEdgeInCycle(edges[5]))
+		self.assertTrue(graph.isEdgeInCycle(edges[6]))
+		self.assertTrue(graph.isEdgeInCycle(edges[7]))
+		self.assertTrue(graph.isEdgeInCycle(edges[8]))
+		self.assertTrue(graph.isEdgeInCycle(edges[9]))
+		self.assertTrue(graph.isEdgeInCycle(edges[10]))
+		self.assertTrue(graph.isEdgeInCycle(edges[11]))
 
 		# Not exactly sure how many SSSR rings ought to be found for this case
 		self.assertTrue(len(rings) == 5 or len(rings) == 6)
 
+	def testRingSearch5(self):
+		"""
+		Check the graph cycle identification functions. The test graph is a
+		ladder of twenty fused squares, which has many more cycles than rings.
+		Also checks that the rings are recalculated when the graph changes.
+		"""
+
+		vertices = [Vertex() for i in range(42)]
+		edges = [Edge() for i in range(61)]
+
+		graph = Graph()
+		for vertex in vertices: graph.addVertex(vertex)
+		for i in range(21):
+			graph.addEdge((vertices[2*i], vertices[2*i+1]), edges[3*i])
+			if i > 0:
+				graph.addEdge((vertices[2*i-2], vertices[2*i]), edges[3*i-2])
+				graph.addEdge((vertices[2*i-1], vertices[2*i+1]), edges[3*i-1])
+
+		rings = graph.getSmallestSetOfSmallestRings()
+		self.assertEqual(len(rings), 20)
+		for ring in rings:
+			self.assertEqual(len(ring), 4)
+			for i in range(4):
+				self.assertTrue(graph.hasEdge((ring[i-1], ring[i])))
+
+		# Removing a rung merges two rings into a larger one
+		graph.removeEdge((vertices[20], vertices[21]))
+		rings = graph.getSmallestSetOfSmallestRings()
+		self.assertEqual(len(rings), 19)
+		self.assertEqual(sorted([len(ring) for ring in rings]), [4] * 18 + [6])
+
+	def testAutomorphisms(self):
+		"""
+		Check the counting of graph automorphisms for the cube, the Petersen
+		graph, and the cube with one edge removed.
+		"""
+
+		vertices = [Vertex() for i in range(8)]
+		graph = Graph()
+		for vertex in vertices: graph.addVertex(vertex)
+		for i in range(8):
+			for j in range(i+1, 8):
+				if bin(i ^ j).count('1') == 1:
+					graph.addEdge((vertices[i], vertices[j]), Edge())
+		self.assertEqual(graph.countAutomorphisms(), 48)
+		self.assertTrue(graph.extendsToAutomorphism({vertices[0]: vertices[7]}))
+		self.assertFalse(graph.extendsToAutomorphism({vertices[0]: vertices[1], vertices[1]: vertices[2]}))
+
+		graph.removeEdge((vertices[0], vertices[1]))
+		self.assertEqual(graph.countAutomorphisms(), 4)
+
+		vertices = [Vertex() for i in range(10)]
+		graph = Graph()
+		for vertex in vertices: graph.addVertex(vertex)
+		for i in range(5):
+			graph.addEdge((vertices[i], vertices[(i+1)%5]), Edge())
+			graph.addEdge((vertices[i+5], vertices[(i+2)%5+5]), Edge())
+			graph.addEdge((vertices[i], vertices[i+5]), Edge())
+		self.assertEqual(graph.countAutomorphisms(), 120)
+
 
 
 ################################################################################
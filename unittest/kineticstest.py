@@ -7,8 +7,10 @@ import sys
 sys.path.append('../source')
 
 import math
+import numpy
 		
 from rmg.reaction import *
+from rmg.kinetics import ChebyshevKinetics, PDepArrheniusKinetics, PDepKineticsSet
 import rmg.constants
 
 ################################################################################
@@ -75,6 +77,65 @@ class KineticsCheck(unittest.TestCase):
 			for T in Tlist:
 				self.assertAlmostEqual(kinetics.getRateConstant(T, dHrxn), A * T ** n * math.exp(-(Ea + alpha * dHrxn) / rmg.constants.R / T), 4)
 		
+	def testChebyshevKinetics(self):
+		"""
+		Check that a Chebyshev fit reproduces the rate coefficients it was
+		fitted to, and agrees with a direct evaluation of the polynomials.
+		"""
+		
+		Tlist = [300.0, 500.0, 800.0, 1200.0, 2000.0]; Plist = [1.0e3, 1.0e4, 1.0e5, 1.0e6]
+		K = numpy.array([[1.0e10 * T**0.5 * math.exp(-40000.0 / rmg.constants.R / T) * (P / 1.0e5)**0.2 for P in Plist] for T in Tlist])
+		kinetics = ChebyshevKinetics()
+		kinetics.fitToData(Tlist, Plist, K, 4, 3)
+		for t, T in enumerate(Tlist):
+			for p, P in enumerate(Plist):
+				self.assertAlmostEqual(kinetics.getRateConstant(T, P) / K[t,p], 1.0, 1)
+		
+		T = 700.0; P = 3.0e4
+		Tred = (2.0/T - 1.0/300.0 - 1.0/2000.0) / (1.0/2000.0 - 1.0/300.0)
+		Pred = (2.0*math.log(P) - math.log(1.0e3) - math.log(1.0e6)) / (math.log(1.0e6) - math.log(1.0e3))
+		logk = sum([kinetics.coeffs[t,p] * math.cos(t * math.acos(Tred)) * math.cos(p * math.acos(Pred)) for t in range(4) for p in range(3)])
+		self.assertAlmostEqual(math.log10(kinetics.getRateConstant(T, P)), logk, 10)
+	
+	def testPDepArrheniusKinetics(self):
+		"""
+		Check that pressure-dependent Arrhenius kinetics are interpolated
+		linearly on a log-log scale between the pressures.
+		"""
+		
+		kinetics = PDepArrheniusKinetics([1.0e4, 1.0e5], [ArrheniusKinetics(A=1.0e10, Ea=30000.0, n=0.0), ArrheniusKinetics(A=1.0e12, Ea=50000.0, n=0.5)])
+		T = 1000.0
+		k1 = kinetics.arrhenius[0].getRateConstant(T); k2 = kinetics.arrhenius[1].getRateConstant(T)
+		self.assertAlmostEqual(kinetics.getRateConstant(T, 1.0e4) / k1, 1.0, 10)
+		self.assertAlmostEqual(kinetics.getRateConstant(T, 1.0e5) / k2, 1.0, 10)
+		self.assertAlmostEqual(kinetics.getRateConstant(T, 10**4.25) / (k1**0.75 * k2**0.25), 1.0, 10)
+		self.assertAlmostEqual(kinetics.getArrhenius(10**4.25).getRateConstant(T) / (k1**0.75 * k2**0.25), 1.0, 10)
+	
+	def testPDepKineticsSet(self):
+		"""
+		Check that evaluating a set of pressure-dependent kinetics at once
+		gives the same rate coefficients as evaluating each individually.
+		"""
+		
+		Tlist = [300.0, 500.0, 800.0, 1200.0, 2000.0]; Plist = [1.0e3, 1.0e4, 1.0e5, 1.0e6]
+		kineticsList = []
+		for degreeT, degreeP, Ea in [(4, 4, 40000.0), (3, 2, 80000.0), (6, 4, 10000.0)]:
+			K = numpy.array([[1.0e10 * math.exp(-Ea / rmg.constants.R / T) * (P / 1.0e5)**0.2 for P in Plist] for T in Tlist])
+			kinetics = ChebyshevKinetics()
+			kinetics.fitToData(Tlist, Plist, K, degreeT, degreeP)
+			kineticsList.append(kinetics)
+			kinetics = PDepArrheniusKinetics()
+			kinetics.fitToData(Tlist, Plist[0:degreeP], K[:,0:degreeP])
+			kineticsList.append(kinetics)
+		kineticsSet = PDepKineticsSet(kineticsList)
+		
+		for T in [300.0, 650.0, 2000.0]:
+			for P in [1.0e3, 3.0e3, 1.0e4]:
+				klist = kineticsSet.getRateConstants(T, P)
+				for kinetics, k in zip(kineticsList, klist):
+					self.assertAlmostEqual(k / kinetics.getRateConstant(T, P), 1.0, 10)
+		self.assertRaises(Exception, kineticsSet.getRateConstants, 1000.0, 1.0e7)
+		
 ################################################################################
 
 if __name__ == '__main__':
@@ -0,0 +1,196 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import numpy
+import os
+import sys
+sys.path.append('../source')
+
+import rmg.main as main
+import rmg.model as model
+import rmg.settings as settings
+import rmg.species as species
+from rmg.species import Species
+from rmg.unirxn.network import Network
+from unirxntest import createNetwork
+
+################################################################################
+
+class ReactionSystem:
+	"""
+	A reaction system whose simulation is replaced by a fixed outcome: the edge
+	species with id `removeID` is removed from the edge, and the object to
+	enlarge is the edge species with id `enlargeID` or, if `enlargeID` is
+	:data:`None`, the first network, whose leak fluxes are set to `leakFluxes`
+	(a dictionary of fluxes keyed by species id).
+	"""
+
+	def __init__(self, removeID, enlargeID=None, leakFluxes=None):
+		self.removeID = removeID
+		self.enlargeID = enlargeID
+		self.leakFluxes = leakFluxes or {}
+
+	def simulate(self, reactionModel, suffix=''):
+		speciesDict = dict([(spec.id, spec) for spec in reactionModel.edge.species])
+		if self.removeID in speciesDict:
+			reactionModel.removeSpeciesFromEdge(speciesDict[self.removeID])
+		if self.enlargeID is not None:
+			obj = speciesDict[self.enlargeID]
+		else:
+			obj = reactionModel.unirxnNetworks[0]
+			obj.leakFluxes = dict([(speciesDict[id], flux) for id, flux in self.leakFluxes.iteritems()])
+		t = numpy.linspace(0.0, 1.0, 11)
+		y = numpy.outer(t, numpy.arange(1.0, 4.0)) * (self.removeID + 1)
+		return t, y, 2 * y, True, obj
+
+def createReactionModel():
+	"""
+	Create a reaction model with one core species, five edge species, and
+	one pressure-dependent network. The species are also added to the global
+	list of species.
+	"""
+	reactionModel = model.CoreEdgeReactionModel()
+	reactionModel.core.species.append(Species(id=1, label='A'))
+	for id in range(2, 7):
+		reactionModel.edge.species.append(Species(id=id, label='E%i' % id))
+	species.speciesList.extend(reactionModel.core.species)
+	species.speciesList.extend(reactionModel.edge.species)
+	reactionModel.unirxnNetworks.append(Network(id=1))
+	return reactionModel
+
+def simulateReactionSystems(numProcesses, reactionSystems=None):
+	"""
+	Simulate a set of reaction systems (by default, three of them) against a
+	new reaction model using `numProcesses` processes. Returns the model and
+	the simulation results.
+	"""
+	speciesList = species.speciesList
+	species.speciesList = []
+	reactionModel = createReactionModel()
+	if reactionSystems is None:
+		reactionSystems = [ReactionSystem(2, 4), ReactionSystem(3, None, {5: 0.5, 6: 0.25}), ReactionSystem(2, 6)]
+	numberOfProcesses = settings.numberOfProcesses
+	settings.numberOfProcesses = numProcesses
+	try:
+		results = main.simulateReactionSystems(reactionModel, reactionSystems)
+	finally:
+		settings.numberOfProcesses = numberOfProcesses
+		species.speciesList = speciesList
+	return reactionModel, results
+
+def calculateNetworkKinetics(numProcesses):
+	"""
+	Calculate the phenomenological rate coefficients of two new networks
+	using `numProcesses` processes. Returns the networks and the results.
+	"""
+	networks = [createNetwork(), createNetwork()]
+	networks[1].pathReactions[0].kinetics[0].A *= 10
+	unimolecularReactionNetworks = settings.unimolecularReactionNetworks
+	numberOfProcesses = settings.numberOfProcesses
+	settings.unimolecularReactionNetworks = ('reservoirstate', [600.0, 1000.0, 1500.0, 2000.0], [1.0e4, 1.0e5, 1.0e6], 0.0, 200, ('chebyshev', 3, 2))
+	settings.numberOfProcesses = numProcesses
+	model.networkSnapshot = networks
+	try:
+		results = main.parallel.map(model.calculateNetworkKinetics, range(len(networks)))
+	finally:
+		model.networkSnapshot = None
+		settings.unimolecularReactionNetworks = unimolecularReactionNetworks
+		settings.numberOfProcesses = numberOfProcesses
+	return networks, results
+
+def getProcessID(index):
+	"""
+	Return the id of the process in which this function is called.
+	"""
+	return os.getpid()
+
+################################################################################
+
+class ParallelCheck(unittest.TestCase):
+
+	def testMinItemsPerProcess(self):
+		"""
+		Check that items are only distributed among worker processes if there
+		are enough of them for each process.
+		"""
+		numberOfProcesses = settings.numberOfProcesses
+		settings.numberOfProcesses = 2
+		try:
+			self.assertEqual(main.parallel.map(getProcessID, range(30), 20), [os.getpid()] * 30)
+			processIDs = main.parallel.map(getProcessID, range(40), 20)
+		finally:
+			settings.numberOfProcesses = numberOfProcesses
+		self.assertEqual(len(processIDs), 40)
+		self.assertFalse(os.getpid() in processIDs)
+
+	def testSimulateReactionSystems(self):
+		"""
+		Check that simulating reaction systems in worker processes gives the
+		same results, objects to enlarge, and edge as simulating them serially.
+		"""
+		model1, results1 = simulateReactionSystems(1)
+		model2, results2 = simulateReactionSystems(2)
+
+		self.assertEqual([spec.id for spec in model1.edge.species], [4, 5, 6])
+		self.assertEqual([spec.id for spec in model2.edge.species], [4, 5, 6])
+
+		for (t1, y1, dydt1, valid1, obj1), (t2, y2, dydt2, valid2, obj2) in zip(results1, results2):
+			self.assertTrue((t1 == t2).all())
+			self.assertTrue((y1 == y2).all())
+			self.assertTrue((dydt1 == dydt2).all())
+			self.assertEqual(valid1, valid2)
+			self.assertEqual(obj1.__class__, obj2.__class__)
+			self.assertEqual(obj1.id, obj2.id)
+			if isinstance(obj2, Species):
+				self.assertTrue(obj2 in model2.getLists()[0])
+			else:
+				self.assertTrue(obj2 is model2.unirxnNetworks[0])
+				self.assertEqual(dict([(spec.id, flux) for spec, flux in obj1.leakFluxes.iteritems()]),
+					dict([(spec.id, flux) for spec, flux in obj2.leakFluxes.iteritems()]))
+				for spec in obj2.leakFluxes:
+					self.assertTrue(spec in model2.edge.species)
+
+	def testSimulateReactionSystemsLeakFluxes(self):
+		"""
+		Check that when several reaction systems simulated in worker processes
+		return the same network, its leak flux for each isomer is the maximum
+		over all of the reaction systems.
+		"""
+		reactionSystems = [ReactionSystem(2, None, {5: 0.5, 6: 0.25}), ReactionSystem(3, None, {5: 0.125, 6: 0.75})]
+		reactionModel, results = simulateReactionSystems(2, reactionSystems)
+		network = reactionModel.unirxnNetworks[0]
+		self.assertTrue(results[0][4] is network)
+		self.assertTrue(results[1][4] is network)
+		self.assertEqual(dict([(spec.id, flux) for spec, flux in network.leakFluxes.iteritems()]), {5: 0.5, 6: 0.75})
+
+	def testCalculateNetworkKinetics(self):
+		"""
+		Check that calculating the kinetics of networks in worker processes
+		gives the same rate coefficients, fitted kinetics and caches as
+		calculating them serially.
+		"""
+		networks1, results1 = calculateNetworkKinetics(1)
+		networks2, results2 = calculateNetworkKinetics(2)
+
+		for (K1, kinetics1, caches1), (K2, kinetics2, caches2) in zip(results1, results2):
+			self.assertTrue(K1 is not None)
+			self.assertTrue((K1 == K2).all())
+			self.assertEqual(sorted(kinetics1.keys()), [(1,0), (2,0), (2,1)])
+			self.assertEqual(sorted(kinetics1.keys()), sorted(kinetics2.keys()))
+			for key in kinetics1:
+				self.assertTrue((kinetics1[key].coeffs == kinetics2[key].coeffs).all())
+			grainCache1, maxEnergyCache1, densStatesCache1, rateCache1 = caches1[0]
+			grainCache2, maxEnergyCache2, densStatesCache2, rateCache2 = caches2[0]
+			self.assertTrue((grainCache1[2] == grainCache2[2]).all())
+			self.assertEqual(sorted(rateCache1.keys()), sorted(rateCache2.keys()))
+			self.assertEqual(sorted(caches1[1].keys()), sorted(caches2[1].keys()))
+
+		# The rate coefficients differ between the networks
+		self.assertFalse((results1[0][0] == results1[1][0]).all())
+
+################################################################################
+
+if __name__ == '__main__':
+	unittest.main( testRunner = unittest.TextTestRunner(verbosity=2) )
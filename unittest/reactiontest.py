@@ -17,6 +17,46 @@ import rmg.reaction as reaction
 
 	
 	
+################################################################################
+
+def kineticsInverseLaplaceTransformReference(kinetics, E0, densStates, Elist, T):
+	"""
+	Apply the inverse Laplace transform to the modified Arrhenius expression
+	`kinetics` one energy grain at a time, as a reference for the array-based
+	implementations in :mod:`rmg.reaction`.
+	"""
+	import math
+	import numpy
+	import scipy.special
+	import rmg.constants as constants
+	import rmg.unirxn.states as states
+
+	Ea = max(kinetics.Ea, 0.0)
+	dE = Elist[1] - Elist[0]
+	s = int(math.floor(Ea / dE))
+	k = numpy.zeros(len(Elist), numpy.float64)
+
+	if kinetics.n > 0.0:
+		phi = numpy.zeros(len(Elist), numpy.float64)
+		for i, E in enumerate(Elist):
+			if E != 0.0:
+				phi[i] = E**(kinetics.n-1) / (constants.R**kinetics.n * scipy.special.gamma(kinetics.n))
+		states.convolve(phi, densStates, Elist)
+		numerator = phi
+		prefactor = kinetics.A
+	elif kinetics.n == 0.0:
+		numerator = densStates
+		prefactor = kinetics.A
+	else:
+		numerator = densStates
+		prefactor = kinetics.A * T**kinetics.n
+
+	for r in range(len(Elist)):
+		if Elist[r] > E0 and densStates[r] != 0:
+			k[r] = prefactor * numerator[r - s] / densStates[r]
+
+	return k
+
 ################################################################################
 
 class ReactionCheck(unittest.TestCase):                          
@@ -96,6 +136,34 @@ class ReactionCheck(unittest.TestCase):
 		self.assertTrue(reaction1 is reaction2)
 		self.assertFalse(isNew)
 		
+	def testInverseLaplaceTransformBatch(self):
+		"""
+		Check that the batched inverse Laplace transform, and that of the
+		individual reactions, match a transform evaluated one grain at a time.
+		"""
+		import numpy
+		from rmg.kinetics import ArrheniusKinetics
+
+		Elist = numpy.arange(0.0, 400000.0, 1000.0, numpy.float64)
+		densStates = numpy.zeros(len(Elist), numpy.float64)
+		densStates[20:] = numpy.exp(numpy.linspace(0.0, 30.0, len(Elist) - 20))
+
+		kineticsList = [
+			ArrheniusKinetics(A=1.0e13, n=0.0, Ea=50000.0),
+			ArrheniusKinetics(A=1.0e11, n=1.5, Ea=30000.0),
+			ArrheniusKinetics(A=1.0e12, n=-0.7, Ea=80000.0),
+		]
+		E0list = [80000.0, 50000.0, 120000.0]
+		klist = reaction.kineticsInverseLaplaceTransformBatch(kineticsList, E0list,
+			numpy.array([densStates] * len(kineticsList)), Elist, 1000.0)
+
+		for kinetics, E0, k in zip(kineticsList, E0list, klist):
+			k0 = kineticsInverseLaplaceTransformReference(kinetics, E0, densStates, Elist, 1000.0)
+			self.assertTrue((k == k0).all())
+			k1 = reaction.kineticsInverseLaplaceTransform(kinetics, E0, densStates, Elist, 1000.0)
+			self.assertTrue((k1 == k0).all())
+			self.assertTrue((k[Elist <= E0] == 0).all())
+			self.assertTrue((k[Elist > E0] > 0).all())
 		
 class ReactionSetCheck(unittest.TestCase): 
 	
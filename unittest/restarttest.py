@@ -183,6 +183,9 @@ class RestartCheck(unittest.TestCase):
 		self.assertTrue(thermoGAData0.equals(thermoGAData))
 		self.assertTrue(thermoWilhoitData0.equals(thermoWilhoitData))
 		self.assertTrue(thermoNASAData0.equals(thermoNASAData))
+		# The cached heat capacity breakpoints are not pickled
+		self.assertFalse('_breakpoint' in cPickle.dumps(thermoGAData0))
+		self.assertEqual(thermoGAData.getEnthalpy(1000.0), thermoGAData0.getEnthalpy(1000.0))
 
 	def testKineticsRestart(self):
 		"""
@@ -248,6 +251,57 @@ class RestartCheck(unittest.TestCase):
 		self.assertTrue(reaction0.bestKinetics == reaction.bestKinetics)
 		#self.assertTrue(reaction0.reverse == reaction.reverse)
 
+	def testRestartWriter(self):
+		"""
+		Check that the :class:`rmg.main.RestartWriter` class writes a restart
+		file that can be reloaded, and that a failed or abandoned write leaves
+		the previous restart file intact and no temporary file behind.
+		"""
+		import os
+		import shutil
+		import tempfile
+
+		thermoData0 = thermo.ThermoGAData(H298=-3.08, S298=64.27,
+			Cp=[12.28, 14.34, 16.30, 18.05, 20.92, 23.08, 26.39], comment='acetyl')
+
+		directory = tempfile.mkdtemp()
+		try:
+			path = os.path.join(directory, 'restart.pkl')
+			writer = main.RestartWriter(path)
+			writer.save((thermoData0, [1, 2, 3]))
+			writer.wait()
+			self.assertTrue(writer.pid is None)
+			self.assertFalse(os.path.exists(path + '.tmp'))
+			self.assertEqual(writer.size, os.path.getsize(path))
+			f = open(path, 'rb'); thermoData, items = cPickle.load(f); f.close()
+			self.assertTrue(thermoData0.equals(thermoData))
+			self.assertEqual(items, [1, 2, 3])
+
+			# An object that cannot be pickled makes the write fail
+			try:
+				writer.save((thermoData0, lambda x: x))
+				writer.wait()
+			except cPickle.PicklingError:
+				pass
+			self.assertFalse(os.path.exists(path + '.tmp'))
+			f = open(path, 'rb'); thermoData, items = cPickle.load(f); f.close()
+			self.assertTrue(thermoData0.equals(thermoData))
+			self.assertEqual(items, [1, 2, 3])
+
+			# Abandoning a write reaps the child process
+			writer.save((thermoData0, range(1000000)))
+			pid = writer.pid
+			writer.terminate()
+			self.assertTrue(writer.pid is None)
+			self.assertFalse(os.path.exists(path + '.tmp'))
+			if pid is not None:
+				self.assertRaises(OSError, os.waitpid, pid, os.WNOHANG)
+			f = open(path, 'rb'); thermoData, items = cPickle.load(f); f.close()
+			self.assertTrue(thermoData0.equals(thermoData))
+			self.assertTrue(len(items) in [3, 1000000])
+		finally:
+			shutil.rmtree(directory)
+
 ################################################################################
 
 if __name__ == '__main__':
@@ -43,6 +43,52 @@ class SpeciesCheck(unittest.TestCase):
 		species2 = makeNewSpecies(structure2)
 		
 		self.assertTrue(species1 is species2)
+
+	def testDensityOfStatesCache(self):
+		"""
+		Check that a cached density of states is reused for the same or fewer
+		energy grains and recalculated when the spectral data changes.
+		"""
+		import numpy
+		import rmg.spectral.modes as modes
+
+		def createSpeciesWithSpectralData():
+			spec = Species()
+			spec.spectralData = modes.SpectralData(modes=[
+				modes.RigidRotor(frequencies=[1.0, 1.5, 2.0]),
+				modes.HinderedRotor(frequency=100.0, barrier=500.0),
+				modes.HarmonicOscillator(frequency=500.0),
+				modes.HarmonicOscillator(frequency=1200.0),
+				modes.HarmonicOscillator(frequency=3000.0),
+			])
+			return spec
+
+		Elist = numpy.arange(0.0, 400000.0, 500.0, numpy.float64)
+		species1 = createSpeciesWithSpectralData()
+		species2 = createSpeciesWithSpectralData()
+
+		densStates = species1.calculateDensityOfStates(Elist)
+		self.assertTrue(species1.calculateDensityOfStates(Elist) is not densStates)
+		self.assertTrue((species1.calculateDensityOfStates(Elist) == densStates).all())
+
+		densStates1 = species1.calculateDensityOfStates(Elist[0:400])
+		densStates2 = species2.calculateDensityOfStates(Elist[0:400])
+		self.assertEqual(len(densStates1), 400)
+		self.assertTrue(numpy.allclose(densStates1, densStates2, rtol=1e-8, atol=0.0))
+
+		species1.spectralData = species2.spectralData
+		densStates1 = species1.calculateDensityOfStates(Elist)
+		self.assertTrue(species1.densStatesCache[0][2] is species2.spectralData)
+
+		# The cache is not pickled, and species pickled without a cache (as in
+		# older restart files) are given an empty one
+		import cPickle
+		species3 = cPickle.loads(cPickle.dumps(species1, -1))
+		self.assertEqual(species3.densStatesCache, [])
+		state = species1.__dict__.copy(); del state['densStatesCache']
+		species4 = Species(); species4.__setstate__(state)
+		self.assertTrue((species4.calculateDensityOfStates(Elist) == densStates1).all())
+		self.assertEqual(len(species4.densStatesCache), 1)
 				
 ################################################################################
 
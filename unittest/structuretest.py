@@ -343,8 +343,222 @@ class StructureCheck(unittest.TestCase):
 			if symmetryNumber!=should_be:
 				fail_message+="Got linearity %s for %s (expected %s)\n"%(symmetryNumber,struct,should_be)
 		self.assertEqual(fail_message,'',fail_message)
-		
-				
+
+	def testCachedProperties(self):
+		"""
+		Check that cached derived properties are updated when the structure
+		is modified.
+		"""
+		structure = Structure()
+		structure.fromAdjacencyList("""
+		1 C 0 {2,S}
+		2 C 1 {1,S} {3,S}
+		3 C 0 {2,S}
+		""", addH=True)
+		self.assertEqual(structure.getRadicalCount(), 1)
+		self.assertEqual(structure.calculateNumberOfRotors(), 2)
+		self.assertFalse(structure.isLinear())
+		self.assertAlmostEqual(structure.getMolecularWeight() / 0.04308, 1.0, 2)
+		mass = structure.getMolecularWeight()
+
+		# Saturate the radical site
+		atom = [atom for atom in structure.atoms() if atom.getFreeElectronCount() == 1][0]
+		hydrogen = structure.addAtom(chem.Atom('H', '0'))
+		structure.addBond(chem.Bond([atom, hydrogen], 'S'))
+		atom.decreaseFreeElectron()
+		structure.resetCachedStructureInfo()
+		self.assertEqual(structure.getRadicalCount(), 0)
+		self.assertTrue(structure.getMolecularWeight() > mass)
+
+		# Changing electron states in place requires an explicit reset
+		structure.removeAtom(hydrogen)
+		atom.increaseFreeElectron()
+		structure.resetCachedStructureInfo()
+		self.assertEqual(structure.getRadicalCount(), 1)
+		self.assertEqual(structure.getMolecularWeight(), mass)
+
+	def testAutomorphismSymmetryNumber(self):
+		"""
+		Check the symmetry number calculated from the automorphisms of the
+		structure, including species for which the heuristic estimate fails.
+		"""
+		test_set = [("""
+			1 C 0 {2,D} {3,S} {4,S}
+			2 O 0 {1,D}
+			3 C 0 {1,S}
+			4 C 0 {1,S}
+			""", 18), # acetone
+			("""
+			1 C 0 {2,D} {3,S} {4,S}
+			2 C 0 {1,D}
+			3 C 0 {1,S}
+			4 C 0 {1,S}
+			""", 18), # isobutene
+			("""
+			1 C 0 {2,D} {3,S}
+			2 C 0 {1,D}
+			3 C 0 {1,S}
+			""", 3), # propene
+			("""
+			1 C 0 {2,D}
+			2 C 0 {1,D} {3,D}
+			3 C 0 {2,D}
+			""", 4), # allene
+			("""
+			1 C 0 {2,D}
+			2 C 0 {1,D} {3,D}
+			3 O 0 {2,D}
+			""", 2), # ketene
+			("""
+			1 C 0 {2,S} {3,S} {4,S} {5,S}
+			2 C 0 {1,S}
+			3 C 0 {1,S}
+			4 C 0 {1,S}
+			5 C 0 {1,S}
+			""", 972), # neopentane
+			("""
+			1 C 0 {2,S} {3,S}
+			2 C 0 {1,S} {3,S}
+			3 C 0 {1,S} {2,S}
+			""", 6), # cyclopropane
+			("""
+			1 C 0 {2,S} {6,S}
+			2 C 0 {1,S} {3,S}
+			3 C 0 {2,S} {4,S}
+			4 C 0 {3,S} {5,S}
+			5 C 0 {4,S} {6,S}
+			6 C 0 {5,S} {1,S}
+			""", 12), # cyclohexane
+			("""
+			1 C 0 {2,D} {6,S}
+			2 C 0 {1,D} {3,S}
+			3 C 0 {2,S} {4,D}
+			4 C 0 {3,D} {5,S}
+			5 C 0 {4,S} {6,D}
+			6 C 0 {5,D} {1,S}
+			""", 12), # benzene (Kekule structure)
+			("""
+			1 C 0 {2,B} {6,B}
+			2 C 0 {1,B} {3,B}
+			3 C 0 {2,B} {4,B}
+			4 C 0 {3,B} {5,B}
+			5 C 0 {4,B} {6,B}
+			6 C 0 {5,B} {1,B}
+			""", 12), # benzene
+			("""
+			1 C 0 {3,S} {4,S} {5,S}
+			2 C 0 {3,S} {4,S} {5,S}
+			3 C 0 {1,S} {2,S}
+			4 C 0 {1,S} {2,S}
+			5 C 0 {1,S} {2,S}
+			""", 6), # bicyclo[1.1.1]pentane
+			("""
+			1 C 0 {2,S} {6,S} {7,S}
+			2 C 0 {1,S} {3,S}
+			3 C 0 {2,S} {4,S}
+			4 C 0 {3,S} {5,S} {7,S}
+			5 C 0 {4,S} {6,S}
+			6 C 0 {5,S} {1,S}
+			7 C 0 {1,S} {4,S}
+			""", 2), # norbornane
+			("""
+			1 C 0 {2,S} {3,S} {4,S}
+			2 C 0 {1,S} {3,S}
+			3 C 0 {1,S} {2,S} {4,S}
+			4 C 0 {1,S} {3,S}
+			""", 2), # bicyclobutane
+			("""
+			1 C 0 {2,S} {3,S} {4,S} {5,S}
+			2 C 0 {1,S} {3,S}
+			3 C 0 {1,S} {2,S}
+			4 C 0 {1,S} {5,S}
+			5 C 0 {1,S} {4,S}
+			""", 4), # spiropentane
+			("""
+			1 C 0 {2,S} {3,S} {4,S}
+			2 C 0 {1,S} {5,S}
+			3 C 0 {1,S} {6,S}
+			4 C 0 {1,S} {7,S}
+			5 C 0 {2,S} {8,S} {9,S}
+			6 C 0 {3,S} {8,S} {10,S}
+			7 C 0 {4,S} {9,S} {10,S}
+			8 C 0 {5,S} {6,S}
+			9 C 0 {5,S} {7,S}
+			10 C 0 {6,S} {7,S}
+			""", 12), # adamantane
+			("""
+			1 C 0 {2,S} {4,S} {5,S}
+			2 C 0 {1,S} {3,S} {6,S}
+			3 C 0 {2,S} {4,S} {7,S}
+			4 C 0 {1,S} {3,S} {8,S}
+			5 C 0 {1,S} {6,S} {8,S}
+			6 C 0 {2,S} {5,S} {7,S}
+			7 C 0 {3,S} {6,S} {8,S}
+			8 C 0 {4,S} {5,S} {7,S}
+			""", 24), # cubane
+			("""
+			1 C 0 {2,S} {6,S} {10,S}
+			2 C 0 {1,S} {3,S}
+			3 C 0 {2,S} {4,S} {8,S}
+			4 C 0 {3,S} {5,S}
+			5 C 0 {4,S} {6,S}
+			6 C 0 {1,S} {5,S} {7,S}
+			7 C 0 {6,S} {8,S}
+			8 C 0 {3,S} {7,S} {9,S}
+			9 C 0 {8,S} {10,S}
+			10 C 0 {1,S} {9,S}
+			""", 4), # twistane
+			("""
+			1 C 0 {2,B} {6,B} {7,S}
+			2 C 0 {1,B} {3,B} {9,S}
+			3 C 0 {2,B} {4,B}
+			4 C 0 {3,B} {5,B}
+			5 C 0 {4,B} {6,B}
+			6 C 0 {5,B} {1,B}
+			7 C 0 {1,S} {8,S}
+			8 C 0 {7,S} {9,S}
+			9 C 0 {8,S} {2,S}
+			""", 2), # indane
+			]
+		fail_message = ''
+		for adjlist, should_be in test_set:
+			structure = Structure()
+			structure.fromAdjacencyList(adjlist, addH=True)
+			structure.calculateSymmetryNumber()
+			if structure.symmetryNumber != should_be:
+				fail_message += "Got total symmetry number of %s for %s (expected %s)\n" % (structure.symmetryNumber, structure, should_be)
+		self.assertEqual(fail_message, '', fail_message)
+
+	def testResonanceIsomers(self):
+		"""
+		Check that the resonance isomers of a polyenyl radical are unique and
+		leave the original structure unchanged.
+		"""
+		structure = Structure()
+		structure.fromAdjacencyList("""
+		1 C 0 {2,D}
+		2 C 0 {1,D} {3,S}
+		3 C 0 {2,S} {4,D}
+		4 C 0 {3,D} {5,S}
+		5 C 0 {4,S} {6,D}
+		6 C 0 {5,D} {7,S}
+		7 C 0 {6,S} {8,D}
+		8 C 0 {7,D} {9,S}
+		9 C 1 {8,S} {10,S}
+		10 C 0 {9,S} {11,D}
+		11 C 0 {10,D}
+		""", addH=True)
+		adjlist = structure.toAdjacencyList()
+		isomers = structure.getResonanceIsomers()
+		self.assertEqual(len(isomers), 3)
+		self.assertTrue(isomers[0] is structure)
+		self.assertEqual(structure.toAdjacencyList(), adjlist)
+		for i, isomer in enumerate(isomers):
+			self.assertEqual(len(isomer.atoms()), 24)
+			self.assertEqual(isomer.getRadicalCount(), 1)
+			for other in isomers[i+1:]:
+				self.assertFalse(isomer.isIsomorphic(other))
+
 ################################################################################
 from timeit import Timer
 
@@ -13,6 +13,8 @@ from speciestest import *
 from reactiontest import *
 from simulationtest import *
 from canteraloadertest import *
+from unirxntest import *
+from paralleltest import *
 
 ################################################################################
 
@@ -116,6 +116,55 @@ class ThermoGACheck(unittest.TestCase):
 			S = S0 + 130 * math.log(T/1500.0)
 			self.assertAlmostEqual(thermoData.getEntropy(T), S, 4)
 		
+	def testModifiedHeatCapacity(self):
+		"""
+		Check that the enthalpy and entropy reflect changes made in place to the
+		heat capacity data after they have already been evaluated.
+		"""
+		
+		thermoData = thermo.ThermoGAData(0, 0, [10, 20, 30, 40, 60, 80, 130.0])
+		H = thermoData.getEnthalpy(1000.0); S = thermoData.getEntropy(1000.0)
+		for i in range(len(thermoData.Cp)): thermoData.Cp[i] *= 2
+		self.assertAlmostEqual(thermoData.getEnthalpy(1000.0), 2 * H, 4)
+		self.assertAlmostEqual(thermoData.getEntropy(1000.0), 2 * S, 4)
+	
+	def testThermoGADataSet(self):
+		"""
+		Check that the thermodynamic properties evaluated for many species and
+		temperatures at once match those evaluated one at a time, and that the
+		free energies of reaction are found from the stoichiometry matrix.
+		"""
+		
+		import numpy
+		thermoData = [
+			thermo.ThermoGAData(800000.0, 500.0, [10, 20, 30, 40, 60, 80, 130.0]),
+			thermo.ThermoGAData(-50000.0, 250.0, [35, 41, 46, 50, 57, 62, 70.0]),
+			thermo.ThermoGAData(120000.0, 310.0, [60, 75, 88, 99, 115, 126, 142.0]),
+		]
+		thermoSet = thermo.ThermoGADataSet(thermoData)
+		Tlist = numpy.array([298.0, 300.0, 350.0, 400.0, 777.0, 1500.0, 1800.0, 2500.0])
+		Cp = thermoSet.getHeatCapacities(Tlist)
+		H = thermoSet.getEnthalpies(Tlist)
+		S = thermoSet.getEntropies(Tlist)
+		G = thermoSet.getFreeEnergies(Tlist)
+		self.assertEqual(G.shape, (len(thermoData), len(Tlist)))
+		for i, t in enumerate(thermoData):
+			for j, T in enumerate(Tlist):
+				self.assertAlmostEqual(Cp[i,j], t.getHeatCapacity(T), 6)
+				self.assertAlmostEqual(H[i,j], t.getEnthalpy(T), 6)
+				self.assertAlmostEqual(S[i,j], t.getEntropy(T), 6)
+				self.assertAlmostEqual(G[i,j], t.getFreeEnergy(T), 6)
+			self.assertTrue((t.getFreeEnergies(Tlist) == G[i,:]).all())
+		
+		# Reactions 0 -> 1 and 0 -> 1 + 2
+		stoichiometry = numpy.array([[-1, -1], [1, 1], [0, 1]], numpy.float64)
+		dGrxn = thermoSet.getFreeEnergiesOfReaction(1000.0, stoichiometry)
+		G = [t.getFreeEnergy(1000.0) for t in thermoData]
+		self.assertAlmostEqual(dGrxn[0], G[1] - G[0], 6)
+		self.assertAlmostEqual(dGrxn[1], G[1] + G[2] - G[0], 6)
+		
+		self.assertRaises(data.TemperatureOutOfRangeException, thermoSet.getEnthalpies, [250.0, 1000.0])
+	
 ################################################################################
 
 class ThermoEstimationCheck(unittest.TestCase):                          
@@ -216,6 +265,166 @@ class ThermoEstimationCheck(unittest.TestCase):
 		self.assertAlmostEqual(C6H9.getEntropy(298) / 4.184, 89.78, 1)
 		self.assertAlmostEqual(C6H9.getHeatCapacity(298) / 4.184, 28.72, 1)
 
+	def test4RadicalSaturation(self):
+		"""
+		Check that the saturated molecule estimated for radicals is reused,
+		that the radicals themselves are left unchanged, and that the enthalpy
+		of the hydrogen atoms added at each radical site is subtracted.
+		"""
+		
+		propane = structure.Structure()
+		propane.fromAdjacencyList('\n1 C 0 {2,S}\n2 C 0 {1,S} {3,S}\n3 C 0 {2,S}\n', addH=True)
+		propane.updateAtomTypes()
+		GApropane = species.thermoDatabase.getThermoData(propane)
+		cacheSize = len(species.thermoDatabase.saturatedThermoCache)
+		
+		for adjlist in ['\n1 C 1 {2,S}\n2 C 0 {1,S} {3,S}\n3 C 0 {2,S}\n',
+			'\n1 C 0 {2,S}\n2 C 1 {1,S} {3,S}\n3 C 0 {2,S}\n',
+			'\n1 C 2T {2,S}\n2 C 0 {1,S} {3,S}\n3 C 1 {2,S}\n']:
+			radical = structure.Structure()
+			radical.fromAdjacencyList(adjlist, addH=True)
+			radical.updateAtomTypes()
+			before = radical.toAdjacencyList()
+			GAradical = species.thermoDatabase.getThermoData(radical)
+			self.assertEqual(radical.toAdjacencyList(), before)
+			self.assertNotEqual(GAradical.H298, GApropane.H298)
+		
+		# Propane was the saturated form of each radical
+		self.assertEqual(len(species.thermoDatabase.saturatedThermoCache), cacheSize)
+
+		# Each radical site of a biradical is corrected independently
+		radicals = []
+		for adjlist in ['\n1 C 1 {2,S}\n2 C 0 {1,S} {3,S}\n3 C 0 {2,S}\n',
+			'\n1 C 1 {2,S}\n2 C 0 {1,S} {3,S}\n3 C 1 {2,S}\n']:
+			radical = structure.Structure()
+			radical.fromAdjacencyList(adjlist, addH=True)
+			radical.updateAtomTypes()
+			radicals.append(species.thermoDatabase.getThermoData(radical))
+		self.assertAlmostEqual(radicals[1].H298, 2 * radicals[0].H298 - GApropane.H298, 6)
+
+	def test7SaturatedThermoCacheSize(self):
+		"""
+		Check that the oldest saturated estimate is discarded once the cache
+		is full.
+		"""
+
+		maximumSaturatedThermoCacheSize = species.maximumSaturatedThermoCacheSize
+		thermoDatabase = species.thermoDatabase
+		saturatedThermoCache = thermoDatabase.saturatedThermoCache
+		saturatedThermoKeys = thermoDatabase.saturatedThermoKeys
+		thermoDatabase.saturatedThermoCache = {}
+		thermoDatabase.saturatedThermoKeys = []
+		species.maximumSaturatedThermoCacheSize = 2
+		try:
+			structures = []
+			for adjlist in ['\n1 C 0\n', '\n1 C 0 {2,S}\n2 C 0 {1,S}\n',
+				'\n1 C 0 {2,S}\n2 C 0 {1,S} {3,S}\n3 C 0 {2,S}\n']:
+				struct = structure.Structure()
+				struct.fromAdjacencyList(adjlist, addH=True)
+				struct.updateAtomTypes()
+				structures.append(struct)
+				thermoDatabase.getThermoData(struct)
+			self.assertEqual(len(thermoDatabase.saturatedThermoKeys), 2)
+			self.assertEqual(len(thermoDatabase.saturatedThermoCache), 2)
+			self.assertFalse(species.getSaturatedStructureKey(structures[0]) in thermoDatabase.saturatedThermoCache)
+			self.assertTrue(species.getSaturatedStructureKey(structures[2]) in thermoDatabase.saturatedThermoCache)
+		finally:
+			species.maximumSaturatedThermoCacheSize = maximumSaturatedThermoCacheSize
+			thermoDatabase.saturatedThermoCache = saturatedThermoCache
+			thermoDatabase.saturatedThermoKeys = saturatedThermoKeys
+
+	def test8WorkerCacheEntries(self):
+		"""
+		Check that the saturated estimates and ring correction nodes made in
+		worker processes are added to the caches of the main process.
+		"""
+		import rmg.settings as settings
+
+		thermoDatabase = species.thermoDatabase
+		structures = []
+		for adjlist in ['\n1 C 0 {2,S}\n2 C 0 {1,S} {3,S}\n3 C 0 {2,S} {4,S}\n4 C 0 {3,S}\n',
+			'\n1 C 1 {2,S} {4,S}\n2 C 0 {1,S} {3,S}\n3 C 0 {2,S} {4,S}\n4 C 0 {3,S} {1,S}\n']:
+			struct = structure.Structure()
+			struct.fromAdjacencyList(adjlist, addH=True)
+			struct.updateAtomTypes()
+			structures.append(struct)
+
+		saturatedThermoCache = thermoDatabase.saturatedThermoCache
+		saturatedThermoKeys = thermoDatabase.saturatedThermoKeys
+		ringIndex = thermoDatabase.ringIndex
+		thermoDatabase.saturatedThermoCache = {}
+		thermoDatabase.saturatedThermoKeys = []
+		thermoDatabase.ringIndex = {}
+		numberOfProcesses = settings.numberOfProcesses
+		minItemsPerProcess = species.minItemsPerProcess
+		settings.numberOfProcesses = 2
+		species.minItemsPerProcess = 1
+		try:
+			species.getThermoDataBatch(structures, thermo.ThermoGAData)
+			# Butane and cyclobutane (the saturated form of the radical)
+			self.assertEqual(len(thermoDatabase.saturatedThermoKeys), 2)
+			self.assertTrue(species.getSaturatedStructureKey(structures[0]) in thermoDatabase.saturatedThermoCache)
+			self.assertEqual(len(thermoDatabase.ringIndex), 1)
+			self.assertEqual(thermoDatabase.newCacheEntries, None)
+		finally:
+			settings.numberOfProcesses = numberOfProcesses
+			species.minItemsPerProcess = minItemsPerProcess
+			thermoDatabase.saturatedThermoCache = saturatedThermoCache
+			thermoDatabase.saturatedThermoKeys = saturatedThermoKeys
+			thermoDatabase.ringIndex = ringIndex
+
+	def test6PrimaryLibraryRadical(self):
+		"""
+		Check that the thermo data of a radical in the primary thermo library
+		is returned as a copy, so that corrections to the estimate (e.g. for
+		the symmetry number) do not modify the library.
+		"""
+
+		H = structure.Structure()
+		H.fromAdjacencyList('\n1 H 1\n')
+		H.updateAtomTypes()
+		primaryDatabase = species.thermoDatabase.primaryDatabase
+		libraryData = primaryDatabase.library[primaryDatabase.contains(H)]
+		S298 = libraryData.S298
+
+		GAthermoData = species.thermoDatabase.getThermoData(H)
+		self.assertFalse(GAthermoData is libraryData)
+		self.assertEqual(GAthermoData.S298, S298)
+		GAthermoData.S298 -= 10.0
+		self.assertEqual(libraryData.S298, S298)
+		self.assertEqual(species.thermoDatabase.getThermoData(H).S298, S298)
+
+	def test5RingFingerprint(self):
+		"""
+		Check that ring fingerprints do not depend on the order of the ring
+		atoms, and that each ring motif is indexed once.
+		"""
+		
+		cyclopentene = structure.Structure()
+		cyclopentene.fromAdjacencyList('\n1 C 0 {2,D} {5,S}\n2 C 0 {1,D} {3,S}\n3 C 0 {2,S} {4,S}\n4 C 0 {3,S} {5,S}\n5 C 0 {4,S} {1,S}\n', addH=True)
+		cyclopentene.updateAtomTypes()
+		ring = [atom for atom in cyclopentene.atoms() if atom.isNonHydrogen()]
+		fingerprint = species.getRingFingerprint(cyclopentene, ring)
+		self.assertEqual(fingerprint[0], 5)
+		for i in range(5):
+			self.assertEqual(species.getRingFingerprint(cyclopentene, ring[i:] + ring[:i]), fingerprint)
+			self.assertEqual(species.getRingFingerprint(cyclopentene, ring[i::-1] + ring[:i:-1]), fingerprint)
+		
+		cyclopentane = structure.Structure()
+		cyclopentane.fromAdjacencyList('\n1 C 0 {2,S} {5,S}\n2 C 0 {1,S} {3,S}\n3 C 0 {2,S} {4,S}\n4 C 0 {3,S} {5,S}\n5 C 0 {4,S} {1,S}\n', addH=True)
+		cyclopentane.updateAtomTypes()
+		ring = [atom for atom in cyclopentane.atoms() if atom.isNonHydrogen()]
+		self.assertNotEqual(species.getRingFingerprint(cyclopentane, ring), fingerprint)
+		
+		# Rings with bonds across them are not fingerprinted
+		bicyclobutane = structure.Structure()
+		bicyclobutane.fromAdjacencyList('\n1 C 0 {2,S} {3,S} {4,S}\n2 C 0 {1,S} {3,S}\n3 C 0 {1,S} {2,S} {4,S}\n4 C 0 {1,S} {3,S}\n', addH=True)
+		ring = [atom for atom in bicyclobutane.atoms() if atom.isNonHydrogen()]
+		self.assertTrue(species.getRingFingerprint(bicyclobutane, ring) is None)
+		
+		species.thermoDatabase.getThermoData(cyclopentene)
+		self.assertTrue(fingerprint in species.thermoDatabase.ringIndex)
+
 ################################################################################
 
 
@@ -503,6 +712,33 @@ class ThermoWilhoitToNASACheck(unittest.TestCase):
 		ans = n.integral2_T0(1.0) - n.integral2_T0(.298)
 		self.assertAlmostEqual(ans, 0.71887383097545454, 15)
 
+class ThermoBatchConversionCheck(unittest.TestCase):
+	"""Test conversion of many thermo instances at once"""
+
+	def testBatchConversion(self):
+		"""Check the batch GA-to-Wilhoit-to-NASA conversion matches the serial one.
+		
+		Uses the GA data for molecular oxygen and two synthetic species,
+		including a monatomic one.
+		"""
+		GAthermoList = [
+			thermo.ThermoGAData(H298=0.0, S298=205.026767175, Cp=[29.288, 30.20848, 31.12896, 32.0076, 33.76488, 34.9364, 36.48448]),
+			thermo.ThermoGAData(H298=-104680.0, S298=270.2, Cp=[73.6, 94.0, 112.6, 128.8, 154.8, 174.7, 205.4]),
+			thermo.ThermoGAData(H298=0.0, S298=154.8, Cp=[20.8, 20.8, 20.8, 20.8, 20.8, 20.8, 20.8]),
+		]
+		atomsList = [2, 11, 1]; rotorsList = [0, 2, 0]; linearList = [True, False, False]
+		WilhoitList = thermo.convertGAtoWilhoitBatch(GAthermoList, atomsList, rotorsList, linearList)
+		NASAthermoList = thermo.convertWilhoitToNASABatch(WilhoitList)
+		self.assertEqual(len(NASAthermoList), len(GAthermoList))
+		for GAthermoData, atoms, rotors, linear, WilhoitData, NASAthermoData in zip(GAthermoList, atomsList, rotorsList, linearList, WilhoitList, NASAthermoList):
+			WilhoitData0 = thermo.convertGAtoWilhoit(GAthermoData, atoms, rotors, linear)
+			NASAthermoData0 = thermo.convertWilhoitToNASA(WilhoitData0)
+			for T in [300.0, 500.0, 1000.0, 1500.0, 3000.0]:
+				self.assertAlmostEqual(WilhoitData.getHeatCapacity(T) / WilhoitData0.getHeatCapacity(T), 1.0, 8)
+				self.assertAlmostEqual(NASAthermoData.getHeatCapacity(T) / NASAthermoData0.getHeatCapacity(T), 1.0, 8)
+				self.assertAlmostEqual(NASAthermoData.getEnthalpy(T), NASAthermoData0.getEnthalpy(T), 4)
+				self.assertAlmostEqual(NASAthermoData.getEntropy(T), NASAthermoData0.getEntropy(T), 6)
+
 class ThermoCpToNASACheck(unittest.TestCase):
 	"""Test conversion from Cp/R to NASA polynomials (using numerical integrals)"""
 	def testNASAfromCp(self):
@@ -524,6 +760,52 @@ class ThermoCpToNASACheck(unittest.TestCase):
 		self.assertAlmostEqual(NASAthermoData.polynomials[1].c3, 0.0, 4)
 		self.assertAlmostEqual(NASAthermoData.polynomials[1].c4, 0.0, 4)
 
+class ThermoNASADataSetCheck(unittest.TestCase):
+	"""Test evaluation of the NASA polynomials of many species at once"""
+	
+	def testThermoNASADataSet(self):
+		"""
+		Check that the thermodynamic properties evaluated for many species and
+		temperatures at once match those evaluated one at a time, including
+		for species that are not given by NASA polynomials.
+		"""
+		
+		import numpy
+		thermoData = [
+			thermo.ThermoNASAData([
+				thermo.ThermoNASAPolynomial(T_range=[298.0, 1000.0], coeffs=[4.0, 1.0e-3, -2.0e-6, 1.0e-9, -2.0e-13, -1.0e4, 3.0]),
+				thermo.ThermoNASAPolynomial(T_range=[1000.0, 6000.0], coeffs=[5.0, 2.0e-3, -5.0e-7, 6.0e-11, -3.0e-15, -1.1e4, -2.0]),
+			]),
+			thermo.ThermoGAData(-50000.0, 250.0, [35, 41, 46, 50, 57, 62, 70.0]),
+			thermo.ThermoNASAData([
+				thermo.ThermoNASAPolynomial(T_range=[298.0, 6000.0], coeffs=[3.5, 5.0e-4, 1.0e-7, -2.0e-11, 1.0e-15, 2.0e4, 5.0]),
+			]),
+		]
+		thermoSet = thermo.ThermoNASADataSet(thermoData)
+		Tlist = numpy.array([298.0, 500.0, 1000.0, 1500.0, 2500.0])
+		Cp = thermoSet.getHeatCapacities(Tlist)
+		H = thermoSet.getEnthalpies(Tlist)
+		S = thermoSet.getEntropies(Tlist)
+		G = thermoSet.getFreeEnergies(Tlist)
+		self.assertEqual(G.shape, (len(thermoData), len(Tlist)))
+		for i, t in enumerate(thermoData):
+			for j, T in enumerate(Tlist):
+				self.assertAlmostEqual(Cp[i,j] / t.getHeatCapacity(T), 1.0, 12)
+				self.assertAlmostEqual(H[i,j] / t.getEnthalpy(T), 1.0, 12)
+				self.assertAlmostEqual(S[i,j] / t.getEntropy(T), 1.0, 12)
+				self.assertAlmostEqual(G[i,j] / t.getFreeEnergy(T), 1.0, 12)
+		
+		# Reaction 0 + 2 -> 1
+		stoichiometry = numpy.array([[-1], [1], [-1]], numpy.float64)
+		dHrxn = thermoSet.getEnthalpiesOfReaction(298.0, stoichiometry)
+		dGrxn = thermoSet.getFreeEnergiesOfReaction(298.0, stoichiometry)
+		H = [t.getEnthalpy(298.0) for t in thermoData]
+		G = [t.getFreeEnergy(298.0) for t in thermoData]
+		self.assertAlmostEqual(dHrxn[0], H[1] - H[0] - H[2], 6)
+		self.assertAlmostEqual(dGrxn[0], G[1] - G[0] - G[2], 6)
+		
+		self.assertRaises(data.TemperatureOutOfRangeException, thermoSet.getEnthalpies, 7000.0)
+
 
 
 ################################################################################
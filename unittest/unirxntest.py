@@ -0,0 +1,432 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import math
+import numpy
+import sys
+sys.path.append('../source')
+
+import rmg.constants as constants
+import rmg.model as model
+import rmg.settings as settings
+import rmg.spectral.modes as modes
+from rmg.kinetics import ArrheniusKinetics
+from rmg.reaction import Reaction
+from rmg.species import LennardJones, Species
+from rmg.structure import Structure
+from rmg.thermo import ThermoGAData
+from rmg.unirxn.cache import NetworkCache
+from rmg.unirxn.network import Isomer, Network
+import rmg.unirxn.banded as banded
+
+################################################################################
+
+def createSpecies(id, frequencies, H298=0.0):
+	"""
+	Create a species with spectral data consisting of a nonlinear rigid rotor
+	and harmonic oscillators with the given `frequencies` in cm^-1, an
+	enthalpy of formation of `H298` in J/mol, and representative values of
+	the other thermodynamic, molecular weight, and Lennard-Jones data.
+	"""
+	spec = Species(id=id, label='species%i' % id)
+	spec.spectralData = modes.SpectralData(modes=[modes.RigidRotor(frequencies=[1.0, 1.5, 2.0])])
+	spec.spectralData.modes.extend([modes.HarmonicOscillator(frequency=f) for f in frequencies])
+	spec.thermoData = ThermoGAData(H298=H298, S298=250.0, Cp=[60.0, 70.0, 78.0, 85.0, 95.0, 102.0, 112.0])
+	spec.molWt = 0.044
+	spec.lennardJones = LennardJones(sigma=5.0e-10, epsilon=3.0e-21)
+	return spec
+
+def createNetwork():
+	"""
+	Create a representative network of two isomers connected to each other and
+	to a product channel, in a bath gas.
+	"""
+	A = createSpecies(1, [300.0, 520.0, 760.0, 910.0, 1100.0, 1240.0, 1450.0, 1700.0, 2900.0, 3050.0], 0.0)
+	B = createSpecies(2, [280.0, 490.0, 800.0, 950.0, 1050.0, 1300.0, 1400.0, 1800.0, 2950.0, 3100.0], 40000.0)
+	C = createSpecies(3, [400.0, 700.0, 1000.0, 1500.0, 3000.0], 100000.0)
+	D = createSpecies(4, [600.0, 1200.0], 50000.0)
+
+	network = Network()
+	network.bathGas = createSpecies(5, [])
+	network.bathGas.expDownParam = 4.86 * 4184
+	network.isomers = [Isomer([A]), Isomer([B]), Isomer([C, D])]
+	for isomer, E0 in zip(network.isomers, [0.0, 40000.0, 150000.0]):
+		isomer.E0 = E0
+
+	for reactant, product, E0, Ea in [(0, 1, 160000.0, 160000.0), (1, 2, 230000.0, 190000.0)]:
+		reaction = Reaction(network.isomers[reactant].species, network.isomers[product].species,
+			kinetics=[ArrheniusKinetics(A=1.0e13, n=0.0, Ea=Ea)])
+		reaction.reactant = network.isomers[reactant]
+		reaction.product = network.isomers[product]
+		reaction.E0 = E0
+		network.pathReactions.append(reaction)
+
+	return network
+
+def addIsomer(network):
+	"""
+	Add a third unimolecular isomer to the representative `network`, connected
+	to the first isomer by a new path reaction.
+	"""
+	E = createSpecies(6, [320.0, 500.0, 780.0, 930.0, 1080.0, 1270.0, 1420.0, 1750.0, 2920.0, 3080.0], 20000.0)
+	isomer = Isomer([E])
+	isomer.E0 = 20000.0
+	network.isomers.insert(2, isomer)
+
+	reaction = Reaction(network.isomers[0].species, isomer.species,
+		kinetics=[ArrheniusKinetics(A=1.0e12, n=0.0, Ea=120000.0)])
+	reaction.reactant = network.isomers[0]
+	reaction.product = isomer
+	reaction.E0 = 120000.0
+	network.pathReactions.append(reaction)
+
+def calculateRateCoefficients(network):
+	"""
+	Calculate the phenomenological rate coefficients of `network` using the
+	reservoir state method, as in an update of the network during model
+	generation. Returns the rate coefficients.
+	"""
+	Tlist = [600.0, 1000.0, 1500.0]; Plist = [1.0e4, 1.0e5, 1.0e6]
+	Elist = network.determineEnergyGrains(0.0, 200, max(Tlist))
+	network.calculateDensitiesOfStates(Elist)
+	return network.calculateRateCoefficients(Tlist, Plist, Elist, 'reservoirstate')
+
+def clearCaches(network):
+	"""
+	Clear the caches of energy grains, densities of states and microcanonical
+	rates of `network` and of the densities of states of its species, so that
+	the next update of the network is calculated from scratch.
+	"""
+	network.grainCache = None
+	network.maxEnergyCache = {}
+	network.densStatesCache = {}
+	network.rateCache = {}
+	for isomer in network.isomers:
+		for spec in isomer.species:
+			spec.densStatesCache = []
+
+################################################################################
+
+# Implementations of the isomer routines that loop over the energy grains in
+# Python, as references for the tests and the timings below
+
+def calculateDensityOfStatesLoop(isomer, Elist):
+	"""
+	Calculate the density of states of `isomer`, shifted to the first energy
+	grain above its ground-state energy, one grain at a time.
+	"""
+	isomer.densStates = numpy.zeros(len(Elist), numpy.float64)
+	densStates = isomer.convolveDensitiesOfStates(Elist)
+	index = -1
+	for i, E in enumerate(Elist):
+		if isomer.E0 < E and index < 0:
+			index = i
+	isomer.densStates[index:len(densStates)] = densStates[0:len(densStates)-index]
+
+def calculateEqDistLoop(isomer, Elist, T):
+	"""
+	Calculate the equilibrium distribution of `isomer`, summing the partition
+	function one grain at a time.
+	"""
+	dE = Elist[1] - Elist[0]
+	isomer.eqDist = isomer.densStates * numpy.exp(-Elist / constants.R / T) * dE
+	isomer.Q = sum(isomer.eqDist)
+	isomer.eqDist /= isomer.Q
+
+def calculateCollisionEfficiencyLoop(isomer, T, reactions, dEdown, Elist):
+	"""
+	Calculate the collision efficiency of the unimolecular `isomer`, evaluating
+	the sums over the energy grains one grain at a time.
+	"""
+	E0 = min([reaction.E0 for reaction in reactions if reaction.reactant is isomer or reaction.product is isomer])
+	E0 = max(E0, isomer.E0 + 100000)
+
+	dE = Elist[1] - Elist[0]
+	FeNum = 0.0; FeDen = 0.0
+	Delta1 = 0.0; Delta2 = 0.0; DeltaN = 0.0
+	for r, E in enumerate(Elist):
+		value = isomer.densStates[r] * math.exp(-E / constants.R / T)
+		if E > E0:
+			FeNum += value * dE
+			if FeDen == 0: FeDen = value * constants.R * T
+	if FeDen == 0: return 1.0
+	Fe = FeNum / FeDen
+	for r, E in enumerate(Elist):
+		value = isomer.densStates[r] * math.exp(-E / constants.R / T)
+		if E < E0:
+			Delta1 += value * dE
+			Delta2 += value * dE * math.exp(-(E0 - E) / (Fe * constants.R * T))
+		DeltaN += value * dE
+	Delta = Delta1 / DeltaN - (Fe * constants.R * T) / (dEdown + Fe * constants.R * T) * Delta2 / DeltaN
+	beta = (dEdown / (dEdown + Fe * constants.R * T))**2 / Delta
+	return min(max(beta, 0.0), 1.0)
+
+def determineEnergyGrainsLoop(network, grainSize, numGrains, Tmax):
+	"""
+	Select the energy grains for `network` by repeatedly evaluating the
+	equilibrium distribution of the highest-energy isomer on grains that
+	extend to an arbitrary multiple of :math:`RT`, searching for the maximum
+	and the tail of the distribution one grain at a time.
+	"""
+	nE = 401
+	Emin = math.floor(min([isomer.E0 for isomer in network.isomers]))
+	isomer = None
+	for i in network.isomers:
+		if i.isUnimolecular() and (isomer is None or i.E0 > isomer.E0): isomer = i
+	Emax0 = isomer.E0
+
+	mult = 50
+	done = False
+	while not done:
+		Emax = math.ceil(Emax0 + mult * constants.R * Tmax)
+		Elist = network.getEnergyGrains(Emin, Emax, 0.0, nE)
+		calculateDensityOfStatesLoop(isomer, Elist)
+		calculateEqDistLoop(isomer, Elist, Tmax)
+
+		value = 0.0
+		for r, E in enumerate(Elist):
+			if isomer.eqDist[r] > value:
+				value = isomer.eqDist[r]
+
+		tol = 1e-8
+		if isomer.eqDist[-1] / value < tol:
+			r = nE - 1
+			while r > 0 and not done:
+				if isomer.eqDist[r] / value > tol:
+					done = True
+				else:
+					r -= 1
+			Emax = Elist[r] + max([rxn.getBestKinetics(Tmax).Ea for rxn in network.pathReactions]) - Emax0
+		else:
+			mult += 50
+
+	Emax += max([i.E0 for i in network.isomers] + [r.E0 for r in network.pathReactions])
+	return network.getEnergyGrains(Emin, math.ceil(Emax), grainSize, numGrains)
+
+################################################################################
+
+class IsomerCheck(unittest.TestCase):
+
+	def testDensityOfStatesShift(self):
+		"""
+		Check that the density of states of an isomer starts at the first
+		energy grain above its ground-state energy.
+		"""
+		network = createNetwork()
+		Elist = network.getEnergyGrains(0.0, 400000.0, 0.0, 401)
+		for isomer in network.isomers:
+			isomer.calculateDensityOfStates(Elist)
+			self.assertTrue((isomer.densStates[Elist <= isomer.E0] == 0).all())
+			self.assertTrue((isomer.densStates[Elist > isomer.E0 + 10000.0] > 0).all())
+
+	def testCollisionEfficiency(self):
+		"""
+		Check the collision efficiency against a direct evaluation of the
+		formula, one energy grain at a time.
+		"""
+		network = createNetwork()
+		Elist = network.getEnergyGrains(0.0, 400000.0, 0.0, 401)
+		T = 1000.0; dEdown = 4.86 * 4184
+		isomer = network.isomers[0]
+		isomer.calculateDensityOfStates(Elist)
+
+		beta = calculateCollisionEfficiencyLoop(isomer, T, network.pathReactions, dEdown, Elist)
+		efficiency = isomer.calculateCollisionEfficiency(T, network.pathReactions, dEdown, Elist)
+		self.assertTrue(0.0 < efficiency < 1.0)
+		self.assertAlmostEqual(efficiency / beta, 1.0, 10)
+
+class NetworkCheck(unittest.TestCase):
+
+	def testEnergyGrains(self):
+		"""
+		Check that the energy grains start at the lowest ground-state energy
+		and reach above the highest transition state.
+		"""
+		network = createNetwork()
+		Elist = network.determineEnergyGrains(0.0, 400, 2000.0)
+		self.assertTrue(abs(len(Elist) - 400) <= 1)
+		self.assertEqual(Elist[0], 0.0)
+		self.assertTrue(Elist[-1] > max([reaction.E0 for reaction in network.pathReactions]))
+
+		# A second update with an unchanged highest-energy isomer should reuse
+		# the energy grains without another density of states calculation
+		self.assertEqual(len(network.maxEnergyCache), 1)
+		for isomer in network.isomers: isomer.densStates = None
+		self.assertTrue(network.determineEnergyGrains(0.0, 400, 2000.0) is Elist)
+		self.assertTrue(network.isomers[1].densStates is None)
+
+	def testIncrementalUpdate(self):
+		"""
+		Check that updating a network after an isomer and a path reaction are
+		added, or after the kinetics of a path reaction change, gives the same
+		rate coefficients as calculating them from scratch.
+		"""
+		network = createNetwork()
+		calculateRateCoefficients(network)
+		Elist = network.grainCache[2]
+		rateCache = network.rateCache.copy()
+
+		addIsomer(network)
+		K = calculateRateCoefficients(network)
+		network0 = createNetwork()
+		addIsomer(network0)
+		K0 = calculateRateCoefficients(network0)
+
+		# The update should reuse the energy grains and the microcanonical
+		# rates of the unchanged path reactions
+		self.assertTrue(network.grainCache[2] is Elist)
+		self.assertTrue(len(rateCache) > 0)
+		for key, value in rateCache.iteritems():
+			self.assertTrue(network.rateCache[key] is value)
+		self.assertEqual(K.shape, (3, 3, 4, 4))
+		self.assertTrue(numpy.all(K0[:,:,1,0] > 0) and numpy.all(K0[:,:,2,0] > 0))
+		for i in range(4):
+			for j in range(4):
+				if i != j:
+					for t in range(3):
+						for p in range(3):
+							self.assertAlmostEqual(K[t,p,i,j] / K0[t,p,i,j], 1.0, 10)
+
+		network.pathReactions[0].kinetics[0].A *= 2
+		K = calculateRateCoefficients(network)
+		network0 = createNetwork()
+		addIsomer(network0)
+		network0.pathReactions[0].kinetics[0].A *= 2
+		K0 = calculateRateCoefficients(network0)
+		for i in range(4):
+			for j in range(4):
+				if i != j:
+					for t in range(3):
+						for p in range(3):
+							self.assertAlmostEqual(K[t,p,i,j] / K0[t,p,i,j], 1.0, 10)
+
+	def testNetworkCache(self):
+		"""
+		Check that the rate coefficients of a network cached with one order
+		of the isomers are reused for the same network with the isomers in
+		another order, and that the same net reactions are fitted.
+		"""
+		import shutil
+		import tempfile
+
+		# The species are identified in the cache by their structures
+		adjlists = {1: '1 C 0 {2,S}\n2 O 0 {1,S}', 2: '1 C 0 {2,D}\n2 O 0 {1,D}',
+			3: '1 C 0', 4: '1 O 0', 5: '1 C 0 {2,D}\n2 C 0 {1,D}', 6: '1 C 0 {2,S}\n2 C 0 {1,S}'}
+		def setStructures(network):
+			for spec in network.getSpeciesList() + [network.bathGas]:
+				structure = Structure()
+				structure.fromAdjacencyList('\n' + adjlists[spec.id], addH=True)
+				spec.structure = [structure]
+
+		Tlist = [600.0, 1000.0, 1500.0]; Plist = [1.0e4, 1.0e5, 1.0e6]
+		parameters = (Tlist, Plist, 0.0, 200, 'reservoirstate', ('chebyshev', 3, 2))
+
+		network1 = createNetwork()
+		addIsomer(network1)
+		K1 = calculateRateCoefficients(network1)
+		setStructures(network1)
+		kinetics1 = model.fitNetworkKinetics(K1, Tlist, Plist, parameters[-1])
+
+		network2 = createNetwork()
+		addIsomer(network2)
+		network2.isomers.reverse()
+		setStructures(network2)
+
+		directory = tempfile.mkdtemp()
+		try:
+			cache = NetworkCache(directory)
+			self.assertTrue(cache.load(network2, *parameters) is None)
+			cache.save(network1, *(parameters + (K1,)))
+			K2 = cache.load(network2, *parameters)
+		finally:
+			shutil.rmtree(directory)
+
+		n = len(network1.isomers)
+		for i in range(n):
+			for j in range(n):
+				self.assertTrue((K2[:,:,n-1-i,n-1-j] == K1[:,:,i,j]).all())
+
+		# The net reactions between every pair of isomers are fitted, although
+		# in the opposite direction for the reversed isomers
+		kinetics2 = model.fitNetworkKinetics(K2, Tlist, Plist, parameters[-1])
+		self.assertEqual(len(kinetics1), n * (n - 1) / 2)
+		self.assertEqual(sorted([(n-1-j, n-1-i) for i, j in kinetics1]), sorted(kinetics2.keys()))
+
+	def testBandedReservoirState(self):
+		"""
+		Check that the reservoir state method gives the same rate coefficients
+		using banded collision matrices as using the full matrices, and that
+		the prepared collision matrices are left unchanged so they can be
+		reused at other pressures.
+		"""
+		network = createNetwork()
+		Elist = network.determineEnergyGrains(0.0, 400, 2000.0)
+		network.calculateDensitiesOfStates(Elist)
+		T = 1000.0; P = 1.0e5
+		for isomer in network.isomers:
+			isomer.calculateEqDist(Elist, T)
+			isomer.collFreq = 1.0e9
+		for reaction in network.pathReactions:
+			reaction.kf = numpy.where(Elist > reaction.E0, 1.0e10, 0.0)
+			reaction.kb = numpy.zeros_like(Elist)
+			indices = reaction.product.densStates > 0
+			reaction.kb[indices] = reaction.kf[indices] * reaction.reactant.densStates[indices] / reaction.product.densStates[indices]
+
+		arrays = network.prepareApproximateMethod(T, Elist, 'reservoirstate')
+		Mcoll0 = arrays['Mcoll'].copy()
+		K0 = network.applyApproximateMethod(T, P, Elist, 'reservoirstate', arrays=arrays)
+		self.assertTrue((arrays['Mcoll'] == Mcoll0).all())
+		settings.bandedCollisionMatrix = True
+		try:
+			arrays = network.prepareApproximateMethod(T, Elist, 'reservoirstate')
+			Mcoll0 = arrays['Mcoll'].copy()
+			K = network.applyApproximateMethod(T, P, Elist, 'reservoirstate', arrays=arrays)
+		finally:
+			settings.bandedCollisionMatrix = False
+		self.assertTrue((arrays['Mcoll'] == Mcoll0).all())
+
+		# Only the band of each collision matrix is stored
+		halfbandwidth = banded.getHalfBandwidth(Elist, network.bathGas.expDownParam)
+		self.assertEqual(arrays['Mcoll'].shape, (2, 2 * halfbandwidth + 1, len(Elist)))
+		for i in range(K.shape[0]):
+			for j in range(K.shape[1]):
+				self.assertAlmostEqual(K[i,j] / K0[i,j], 1.0, 4)
+
+################################################################################
+
+if __name__ == '__main__':
+
+	from timeit import Timer
+	startup = """gc.enable() # enable garbage collection in timeit
+from unirxntest import createNetwork, clearCaches, calculateDensityOfStatesLoop, \
+	calculateEqDistLoop, calculateCollisionEfficiencyLoop, determineEnergyGrainsLoop
+network = createNetwork()
+Elist = network.determineEnergyGrains(0.0, 400, 2000.0)
+network.calculateDensitiesOfStates(Elist)
+isomer = network.isomers[0]
+"""
+	# The caches are cleared before each run so that every call does the
+	# full calculation
+	tests = [
+		('determineEnergyGrains',
+			"clearCaches(network); determineEnergyGrainsLoop(network, 0.0, 400, 2000.0)",
+			"clearCaches(network); network.determineEnergyGrains(0.0, 400, 2000.0)"),
+		('calculateDensitiesOfStates',
+			"clearCaches(network)\nfor i in network.isomers: calculateDensityOfStatesLoop(i, Elist)",
+			"clearCaches(network); network.calculateDensitiesOfStates(Elist)"),
+		('calculateEqDist',
+			"calculateEqDistLoop(isomer, Elist, 1000.0)",
+			"isomer.calculateEqDist(Elist, 1000.0)"),
+		('calculateCollisionEfficiency',
+			"calculateCollisionEfficiencyLoop(isomer, 1000.0, network.pathReactions, 4.86 * 4184, Elist)",
+			"isomer.calculateCollisionEfficiency(1000.0, network.pathReactions, 4.86 * 4184, Elist)"),
+	]
+	print "Timing isomer routines for a 400-grain network (loop -> vectorized):"
+	for label, test1, test2 in tests:
+		times1 = Timer(test1, startup).repeat(repeat=5, number=20)
+		times2 = Timer(test2, startup).repeat(repeat=5, number=20)
+		print " %s took %.3f -> %.3f milliseconds" % (label, min(times1) * 1000 / 20, min(times2) * 1000 / 20)
+
+	unittest.main( testRunner = unittest.TextTestRunner(verbosity=2) )